@@ -3,10 +3,18 @@ KPI Dashboard - 메인 앱
 신발원단섬유 (150명) KPI 성과 대시보드
 """
 
+import pandas as pd
 import streamlit as st
-from utils.data_loader import load_all_data
+from utils.refresher import Refresher
+from utils.shared_cache import get_shared_cache
+from utils.sources import get_source
+from utils import history, payload, profiling
 from pages import kpi_view, org_view, trend_view, data_view
 
+# pandas Copy-on-Write: 세션이 공유하는 읽기 전용 시트(freeze)에서 파생 조각을 만들 때
+# 복사를 실제로 쓸 때까지 미룸. 공유 시트를 다루기 전에 진입점에서 켬
+pd.set_option("mode.copy_on_write", True)
+
 # 페이지 설정
 st.set_page_config(
     page_title="KPI Dashboard",
@@ -14,6 +22,12 @@ st.set_page_config(
     layout="wide",
 )
 
+# 구간/재실행 시간을 key=value 로그로 출력 (재실행마다 불려도 핸들러는 하나)
+profiling.configure_logging()
+
+# 이번 재실행의 구간 시간 기록 시작 (?debug=1 이면 사이드바에 표시)
+profile = profiling.begin()
+
 # ──────────────────────────────────────────
 # 커스텀 CSS (짙은 파란색 테마)
 # ──────────────────────────────────────────
@@ -69,6 +83,34 @@ st.markdown("""
         display: none;
     }
 
+    /* ── 화면 선택 (segmented control, 탭과 같은 모양) ── */
+    [data-testid="stButtonGroup"] {
+        background-color: #E0E8F9;
+        padding: 8px 12px;
+        border-radius: 12px;
+        margin-bottom: 16px;
+    }
+    [data-testid="stButtonGroup"] button {
+        height: 48px;
+        border-radius: 10px !important;
+        border: none !important;
+        font-family: 'Noto Sans KR', sans-serif;
+        font-weight: 700;
+        font-size: 15px;
+        color: #1E3A8A;
+        background-color: transparent;
+        transition: all 0.3s ease;
+    }
+    [data-testid="stButtonGroup"] button:hover {
+        background-color: rgba(0, 71, 171, 0.12);
+        color: #0047AB;
+    }
+    [data-testid="stButtonGroup"] button[kind="segmented_controlActive"] {
+        background-color: #0047AB !important;
+        color: #FFFFFF !important;
+        box-shadow: 0 4px 14px rgba(0, 71, 171, 0.4);
+    }
+
     /* ── 카드 스타일 (info 박스) ── */
     .stAlert {
         background-color: #FFFFFF;
@@ -165,28 +207,130 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ──────────────────────────────────────────
-# 데이터 로드 (캐싱)
+# 데이터 로드
+# - 프로세스당 백그라운드 갱신 스레드 1개가 원본을 주기적으로 다시 읽고 검증 후 교체
+# - 재실행은 메모리의 현재 데이터만 읽음 (스냅샷이 없는 첫 실행만 로드를 기다림)
+# - 데이터 소스는 KPI_DATA_SOURCE 환경변수 또는 secrets.toml로 선택 (기본: Google Sheets)
+# - KPI_SHARED_CACHE_DIR를 지정하면 워커끼리 공유 디렉터리로 데이터·피벗·분석을 나눠 씀
 # ──────────────────────────────────────────
-@st.cache_data(ttl=300)
-def get_data():
-    return load_all_data()
+@st.cache_resource
+def get_refresher() -> Refresher:
+    return Refresher(get_source().load_all, shared=get_shared_cache()).start()
 
 with st.spinner("데이터 로딩 중..."):
-    data = get_data()
+    refresher = get_refresher()
+data = refresher.current()
+
+# 데이터 신선도 표시
+freshness = refresher.status()
+if freshness["fetched_at"] is not None:
+    age_min = int(freshness["age_seconds"] // 60)
+    age_text = "방금 전" if age_min < 1 else f"{age_min}분 전"
+    status = " · 최신 데이터 확인 중" if freshness["refreshing"] else ""
+    st.markdown(
+        f'<div style="text-align:right; font-size:12px; color:#6B7280;'
+        f' margin:-16px 0 12px 0; font-family:\'Noto Sans KR\',sans-serif;">'
+        f'데이터 기준 {freshness["fetched_at"]:%Y-%m-%d %H:%M} ({age_text}){status}</div>',
+        unsafe_allow_html=True,
+    )
+
+# ──────────────────────────────────────────
+# 연도 선택 (저장된 지난 연도가 있을 때만 사이드바에 표시)
+# - 기본은 올해 데이터만 메모리에 두고, 지난 연도는 선택했을 때 스냅샷에서 읽음
+# ──────────────────────────────────────────
+years = history.available_years(data)
+if len(years) > 1:
+    year = st.sidebar.selectbox("연도", years, key="year")
+    data = history.year_data(data, year) or data
 
 # ──────────────────────────────────────────
-# 3개 탭
+# 화면 선택 (선택한 화면만 렌더링)
+# - URL 쿼리 파라미터 ?view=kpi|trend|data|org 로 바로 이동 가능
+# - ?nav=tabs 이면 기존처럼 4개 탭을 모두 렌더링
 # ──────────────────────────────────────────
-tab1, tab2, tab3, tab4 = st.tabs(["📋 KPI 추진현황", "📈 월별 KPI 추이", "📊 KPI 데이터", "🏢 조직도"])
+VIEWS = {
+    "kpi": ("📋 KPI 추진현황", kpi_view),
+    "trend": ("📈 월별 KPI 추이", trend_view),
+    "data": ("📊 KPI 데이터", data_view),
+    "org": ("🏢 조직도", org_view),
+}
+
+def render_view(key: str):
+    """화면 렌더링 + 전송 페이로드(바이트/요소 수) 계측 결과를 세션에 보관"""
+    # 차트 스펙/표 바이트는 디버그 패널을 볼 때만 계산 (Figure/DataFrame 직렬화가 한 번 더 필요)
+    debug = st.query_params.get("debug") == "1"
+    with payload.measure(key, serialize=debug) as meter, profiling.span("render", view=key):
+        VIEWS[key][1].render(data)
+    st.session_state.setdefault("payload", {})[key] = meter.summary()
+
+
+if st.query_params.get("nav") == "tabs":
+    tabs = st.tabs([label for label, _ in VIEWS.values()])
+    for tab, key in zip(tabs, VIEWS):
+        with tab:
+            render_view(key)
+else:
+    current = st.query_params.get("view", "kpi")
+    if current not in VIEWS:
+        current = "kpi"
+    selected = st.segmented_control(
+        "화면 선택",
+        options=list(VIEWS),
+        format_func=lambda key: VIEWS[key][0],
+        default=current,
+        label_visibility="collapsed",
+        width="stretch",
+    )
+    # 선택된 버튼을 다시 누르면 선택이 해제되므로 직전 화면 유지
+    if selected is None:
+        selected = current
+    st.query_params["view"] = selected
+    render_view(selected)
+
+# ──────────────────────────────────────────
+# 디버그 패널 (?debug=1): 이번 재실행의 구간별 시간, 캐시 적중률, 전송 페이로드
+# ──────────────────────────────────────────
+def render_debug_panel(profile: profiling.Profile):
+    with st.sidebar:
+        st.markdown("### 🛠 성능 디버그")
+        st.caption(f"이번 재실행 {profile.total_ms:,.1f} ms")
+
+        breakdown = pd.DataFrame(profile.breakdown(), columns=["view", "name", "count", "ms"])
+        st.markdown("**구간별 시간**")
+        st.dataframe(breakdown.round({"ms": 1}), hide_index=True)
+
+        caches = pd.DataFrame([
+            {"cache": name.split(".", 1)[-1],  # "pages.kpi_view._prepare" → "kpi_view._prepare"
+             "size": f'{s["size"]}/{s["maxsize"]}',
+             "hit": s["rerun_hits"], "miss": s["rerun_misses"],
+             "hit_rate": f'{s["hit_rate"]:.0%}'}
+            for name, s in profile.cache.items()
+        ])
+        st.markdown("**캐시 (이번 재실행 적중/실패, 누적 적중률)**")
+        st.dataframe(caches, hide_index=True)
 
-with tab1:
-    kpi_view.render(data)
+        refresh = refresher.status()
+        st.markdown("**데이터 갱신**")
+        last_success = refresh["last_success"]
+        duration = refresh["last_duration"]
+        st.caption(
+            f'버전 {refresh["version"]}'
+            f' · 마지막 성공 {"-" if last_success is None else f"{last_success:%H:%M:%S}"}'
+            f' · 소요 {"-" if duration is None else f"{duration:.2f}s"}'
+            + (f' · 공유 캐시에서 가져옴 {refresh["adopted"]}회' if refresher.shared else "")
+        )
+        if refresh["last_error"]:
+            st.caption(f'마지막 오류: {refresh["last_error"]}')
 
-with tab2:
-    trend_view.render(data)
+        sent = st.session_state.get("payload", {})
+        if sent:
+            st.markdown("**전송 페이로드**")
+            st.dataframe(pd.DataFrame([
+                {"view": key, "KB": round(s["bytes"] / 1024, 1), "elements": s["elements"]}
+                for key, s in sent.items()
+            ]), hide_index=True)
 
-with tab3:
-    data_view.render(data)
 
-with tab4:
-    org_view.render(data)
+profile.finish()
+if st.query_params.get("debug") == "1":
+    render_debug_panel(profile)
@@ -0,0 +1,176 @@
+"""
+성능 벤치마크: 합성 데이터로 로드 후처리 → 변환 → 화면 준비 단계 시간 측정
+- 네트워크 없이 실행 (utils/synthetic.py로 시트 생성)
+- 결과를 benchmark_baseline.json과 비교하여 느려진 단계를 표시
+
+사용법:
+    python benchmark.py                          # current, medium 규모 측정 + 기준과 비교
+    python benchmark.py --scale large            # 대규모 (2,000 조직 / 50,000 KPI / 3개년)
+    python benchmark.py --update-baseline        # 측정 결과를 기준 파일로 저장
+    python benchmark.py --check                  # 기준보다 느려진 단계가 있으면 종료 코드 1
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+
+from pages import data_view, trend_view
+from pages.llm_briefing import analyze_all_orgs
+from utils import profiling
+from utils.data_loader import get_active_data, normalize_data
+from utils.dataset import KpiDataset
+from utils.org_tree import OrgHierarchy
+from utils.rollup import RollupEngine
+from utils.synthetic import SCALES, generate_scale
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+# 기준 대비 이 배수보다 느리면 회귀로 표시
+DEFAULT_TOLERANCE = 1.5
+
+# 이 시간(초)보다 짧은 단계는 측정 오차가 커서 회귀 판정에서 제외
+MIN_COMPARABLE_SECONDS = 0.005
+
+# 차트 생성은 앞쪽 조직/KPI 일부만 측정 (탭 1회 렌더링 분량)
+FIGURE_SAMPLE = 20
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    """repeat번 실행 중 가장 짧은 시간(초)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _stages(raw: dict[str, pd.DataFrame]) -> dict[str, Callable[[], object]]:
+    """단계 이름 → 측정할 함수 (앞 단계 결과를 미리 계산해 두고 각 단계만 측정)"""
+    data = normalize_data({key: df.copy() for key, df in raw.items()})
+    dataset = KpiDataset(data)
+    latest = dataset.month_rows()
+    pivot = data_view._pivot_monthly(dataset.monthly)
+    color_map = data_view._org_color_map(pivot)
+    page = pivot.iloc[:max(data_view.PAGE_SIZES)]  # HTML 표는 한 페이지 분량씩 생성됨
+    trend_rows = dataset.monthly.dropna(subset=["YTD달성률"])
+    y_min, y_max = 0.0, 150.0
+
+    org_ids = [oid for _, oid, _ in dataset.hierarchy.report_order()][:FIGURE_SAMPLE]
+    org_slices = [
+        [(kpi_id, dataset.org_kpi(oid, kpi_id)) for kpi_id in dataset.org_kpi_ids(oid)]
+        for oid in org_ids
+    ]
+    kpi_slices = [s for slices in org_slices for s in slices][:FIGURE_SAMPLE]
+
+    return {
+        "normalize": lambda: normalize_data({key: df.copy() for key, df in raw.items()}),
+        "active_filter": lambda: get_active_data.__wrapped__(data),
+        "dataset_index": lambda: KpiDataset(data),
+        "org_hierarchy": lambda: OrgHierarchy(dataset.org),
+        "pivot": lambda: data_view._pivot_monthly(dataset.monthly),
+        "html_table": lambda: data_view._build_html_table(page, color_map),
+        "analyze_org_kpis": lambda: analyze_all_orgs(latest),
+        "analyze_trend": lambda: trend_view._analyze_all_trends(trend_rows),
+        "rollup": lambda: RollupEngine(dataset.hierarchy, latest),
+        "org_figures": lambda: [trend_view._make_org_fig(s, y_min, y_max)
+                                for s in org_slices if s],
+        "kpi_figures": lambda: [trend_view._make_kpi_fig(name, df, "#0047AB", y_min, y_max)
+                                for name, df in kpi_slices],
+    }
+
+
+def run(scale: str, repeat: int) -> dict[str, float]:
+    """한 규모의 전체 단계 측정 결과 {단계: 초}"""
+    start = time.perf_counter()
+    raw = generate_scale(scale)
+    print(f"\n[{scale}] 데이터 생성 {time.perf_counter() - start:.2f}s "
+          f"(월별 {len(raw['monthly']):,}행, 조직 {len(raw['org']):,}, KPI {len(raw['kpi']):,})")
+
+    results = {}
+    for name, fn in _stages(raw).items():
+        results[name] = _best_of(fn, repeat)
+    return results
+
+
+def _load_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _report(scale: str, results: dict[str, float], baseline: dict[str, float],
+            tolerance: float) -> list[str]:
+    """결과 표 출력, 회귀 단계 이름 목록 반환"""
+    regressions = []
+    print(f"  {'단계':<18}{'측정(ms)':>12}{'기준(ms)':>12}{'배수':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name:<18}{seconds * 1000:>12.2f}{'-':>12}{'-':>8}")
+            continue
+        ratio = seconds / base if base > 0 else float("inf")
+        flag = ""
+        if ratio > tolerance and max(seconds, base) >= MIN_COMPARABLE_SECONDS:
+            flag = "  ← 느려짐"
+            regressions.append(f"{scale}/{name}")
+        print(f"  {name:<18}{seconds * 1000:>12.2f}{base * 1000:>12.2f}{ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KPI 대시보드 합성 데이터 벤치마크")
+    parser.add_argument("--scale", nargs="+", choices=list(SCALES),
+                        default=["current", "medium"])
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    # 측정 중에는 구간마다 로그를 쓰면 시간에 섞이므로 기본은 경고만
+    parser.add_argument("--log-level", default="WARNING",
+                        help="구간 로그 레벨 (INFO면 측정한 구간마다 한 줄 출력)")
+    args = parser.parse_args()
+    profiling.configure_logging(args.log_level)
+    # 앱과 같은 pandas 설정에서 측정 (Copy-on-Write는 조각 연산의 복사 비용을 바꿈)
+    pd.set_option("mode.copy_on_write", True)
+
+    baseline = _load_baseline(args.baseline)
+    measured = {}
+    regressions = []
+    for scale in args.scale:
+        measured[scale] = run(scale, args.repeat)
+        regressions += _report(scale, measured[scale],
+                               baseline.get("results", {}).get(scale, {}),
+                               args.tolerance)
+
+    if args.update_baseline:
+        results = {**baseline.get("results", {}), **measured}
+        baseline = {
+            "meta": {
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "updated": time.strftime("%Y-%m-%d"),
+            },
+            "results": results,
+        }
+        args.baseline.write_text(
+            json.dumps(baseline, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n기준 파일 저장: {args.baseline}")
+
+    if regressions:
+        print(f"\n기준 대비 {args.tolerance}배 이상 느려진 단계: {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
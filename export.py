@@ -0,0 +1,232 @@
+"""
+정적 스냅샷 내보내기: Streamlit 없이 데이터를 한 번 읽어 4개 화면을 정적 파일 묶음으로 저장
+- 화면 HTML/차트는 각 탭과 같은 생성 코드(pages/*)를 그대로 사용
+- 결과 폴더를 일반 웹 서버로 그대로 서비스하면 조회할 때 계산이 없음 (야간 배치용)
+
+출력 구조:
+    <out>/index.html, kpi.html, trend.html, data.html, org.html
+    <out>/plotly.min.js                     # 차트 라이브러리 (외부 CDN 없이 동작)
+    <out>/figures/trend-<조직ID>.json        # 조직별 추이 차트 Plotly Figure JSON
+    <out>/data/{org,kpi,monthly}.parquet    # 활성 조직/KPI 시트 (월별 실적은 올해)
+    <out>/data/kpi_data.parquet             # KPI 데이터 탭의 피벗 표
+
+사용법:
+    python export.py                          # ./export 에 생성 (데이터 소스 설정은 앱과 동일)
+    python export.py --out /srv/www/kpi       # 출력 위치 지정
+    python export.py --from-snapshot          # 원본 대신 마지막 스냅샷(.snapshots/)에서 생성
+    python export.py --rollup achieved --yoy  # 하위 조직 집계 방식, 전년 YTD 비교선
+"""
+
+import argparse
+import html
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from pages import data_view, kpi_view, org_view, trend_view
+from utils import profiling
+from utils.cache import data_version, freeze
+from utils.data_loader import normalize_data, validate_data
+from utils.dataset import get_dataset
+from utils.rollup import ROLLUP_MODES, get_rollup
+from utils.snapshot import latest_year_only, load_snapshot
+from utils.sources import get_source
+
+DEFAULT_OUT = Path("export")
+
+# 페이지 파일 이름 → 제목 (앱의 화면 선택과 같은 순서·이름)
+PAGES = {
+    "kpi": "📋 KPI 추진현황",
+    "trend": "📈 월별 KPI 추이",
+    "data": "📊 KPI 데이터",
+    "org": "🏢 조직도",
+}
+
+
+# ──────────────────────────────────────────
+# 데이터 로드
+# ──────────────────────────────────────────
+
+def load_data(from_snapshot: bool = False, source: str | None = None
+              ) -> tuple[dict[str, pd.DataFrame], datetime]:
+    """(정규화·검증한 시트 딕셔너리, 원본 조회 시각). 앱의 갱신 스레드와 같은 처리"""
+    if from_snapshot:
+        snapshot = load_snapshot()
+        if snapshot is None:
+            sys.exit("저장된 스냅샷이 없습니다 (--from-snapshot 없이 원본에서 읽으세요)")
+        raw, meta = snapshot
+        fetched_at = datetime.fromisoformat(meta["fetched_at"])
+    else:
+        raw = get_source(source).load_all()
+        fetched_at = datetime.now()
+
+    data = normalize_data(latest_year_only(raw))
+    validate_data(data)
+    data_version(data)
+    return freeze(data), fetched_at
+
+
+# ──────────────────────────────────────────
+# 페이지 생성 (각 탭과 같은 공개 함수로 같은 순서·HTML)
+# ──────────────────────────────────────────
+
+def kpi_page(data: dict[str, pd.DataFrame], rollup_mode: str) -> str:
+    """KPI 추진현황: block 모드 HTML 조각을 탭과 같은 순서로 연결"""
+    return "\n".join(kpi_view.block_parts(data, rollup_mode))
+
+
+def trend_page(data: dict[str, pd.DataFrame], fig_dir: Path, yoy: bool) -> str:
+    """월별 KPI 추이: 조직별 헤더 + 통합 차트 + AI 분석. Figure JSON은 fig_dir에 저장"""
+    prior_data = trend_view.prior_year_data(data) if yoy else None
+    parts = []
+    for section in trend_view.org_sections(data, prior_data):
+        org_id = section["org_id"]
+        (fig,) = trend_view.section_figures(section, "grid")
+        (fig_dir / f"trend-{org_id}.json").write_text(
+            pio.to_json(fig, validate=False), encoding="utf-8")
+        parts.append(section["header_html"])
+        parts.append(pio.to_html(fig, full_html=False, include_plotlyjs=False,
+                                 div_id=f"trend-{org_id}", config={"responsive": True}))
+        parts.append(section["ai_html"])
+    return "\n".join(parts)
+
+
+def data_page(data: dict[str, pd.DataFrame]) -> str:
+    """KPI 데이터: 요약 줄 + 전체 행 HTML 표 (페이지 나눔 없음)"""
+    return data_view.info_html(data) + data_view.table_html(data)
+
+
+def org_page(data: dict[str, pd.DataFrame], rollup_mode: str) -> str:
+    """조직도: 트리 HTML + 범례"""
+    return org_view.page_html(data, rollup_mode)
+
+
+def _shell(title: str, body: str, fetched_at: datetime, version: str,
+           scripts: str = "") -> str:
+    """공통 페이지 틀 (상단 제목, 화면 이동 링크, 데이터 기준 시각)"""
+    nav = " · ".join(f'<a href="{key}.html">{label}</a>' for key, label in PAGES.items())
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)} · KPI Dashboard</title>
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;700;900&display=swap">
+{scripts}
+<style>
+body {{ background:#F0F4FF; font-family:'Noto Sans KR',sans-serif; margin:0 auto;
+        max-width:1400px; padding:24px 32px; color:#1F2937; }}
+.export-nav {{ font-size:14px; font-weight:700; margin-bottom:8px; }}
+.export-nav a {{ color:#0047AB; text-decoration:none; }}
+.export-stamp {{ text-align:right; font-size:12px; color:#6B7280; margin-bottom:16px; }}
+</style>
+</head>
+<body>
+<h1 style="color:#0047AB; font-weight:900; margin:0 0 8px 0;">KPI Dashboard</h1>
+<div class="export-nav"><a href="index.html">🏠 처음</a> · {nav}</div>
+<div class="export-stamp">데이터 기준 {fetched_at:%Y-%m-%d %H:%M} · 버전 {version}</div>
+{body}
+</body>
+</html>
+"""
+
+
+def _index_body(data: dict[str, pd.DataFrame], sheets: list[str]) -> str:
+    dataset = get_dataset(data)
+    period = f"{dataset.latest_month}월"
+    if dataset.year is not None:
+        period = f"{dataset.year}년 {period}"
+    pages = "".join(f'<li><a href="{key}.html">{label}</a></li>' for key, label in PAGES.items())
+    files = "".join(f'<li><a href="data/{name}.parquet">{name}.parquet</a></li>'
+                    for name in sheets)
+    return (f'<p>{len(dataset.hierarchy)}개 조직 · {period} 기준</p>'
+            f'<h3>화면</h3><ul>{pages}</ul>'
+            f'<h3>데이터 (Parquet)</h3><ul>{files}</ul>')
+
+
+# ──────────────────────────────────────────
+# 내보내기
+# ──────────────────────────────────────────
+
+def export(data: dict[str, pd.DataFrame], fetched_at: datetime, out: Path,
+           rollup_mode: str = "mean", yoy: bool = False) -> dict[str, int]:
+    """out 폴더에 정적 묶음 생성. {파일 경로: 바이트 수} 반환
+
+    임시 폴더에 만든 뒤 기존 폴더와 교체하므로, 생성 중에도 웹 서버는 이전 묶음을 제공한다.
+    """
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    (tmp / "figures").mkdir(parents=True)
+    (tmp / "data").mkdir()
+
+    version = data_version(data)
+    dataset = get_dataset(data)
+    if rollup_mode not in get_rollup(data).modes():
+        print(f"  [WARN] 가중치 컬럼이 없어 '{ROLLUP_MODES[rollup_mode]}' 대신 평균 달성률로 집계")
+        rollup_mode = "mean"
+    extracts = {"org": dataset.org, "kpi": dataset.kpi, "monthly": dataset.monthly,
+                "kpi_data": data_view._prepare(data)[0]}
+    for name, df in extracts.items():
+        df.to_parquet(tmp / "data" / f"{name}.parquet", index=False)
+
+    plotly_js = '<script src="plotly.min.js"></script>'
+    pages = {
+        "index": ("KPI Dashboard", _index_body(data, list(extracts)), ""),
+        "kpi": (PAGES["kpi"], kpi_page(data, rollup_mode), ""),
+        "trend": (PAGES["trend"], trend_page(data, tmp / "figures", yoy), plotly_js),
+        "data": (PAGES["data"], data_page(data), ""),
+        "org": (PAGES["org"], org_page(data, rollup_mode), ""),
+    }
+    for key, (title, body, scripts) in pages.items():
+        (tmp / f"{key}.html").write_text(
+            _shell(title, body, fetched_at, version, scripts), encoding="utf-8")
+    (tmp / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+
+    # 이전 묶음과 교체
+    old = out.with_name(f".{out.name}.{os.getpid()}.old")
+    if out.exists():
+        out.rename(old)
+    tmp.rename(out)
+    shutil.rmtree(old, ignore_errors=True)
+
+    return {str(path.relative_to(out)): path.stat().st_size
+            for path in sorted(out.rglob("*")) if path.is_file()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KPI 대시보드 정적 스냅샷 내보내기")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="출력 폴더")
+    parser.add_argument("--source", help="데이터 소스 (예: gviz, local:/data/kpi). 기본: 앱과 같은 설정")
+    parser.add_argument("--from-snapshot", action="store_true", help="마지막 스냅샷에서 생성")
+    parser.add_argument("--rollup", choices=list(ROLLUP_MODES), default="mean",
+                        help="하위 조직 집계 방식")
+    parser.add_argument("--yoy", action="store_true",
+                        help="전년 데이터가 저장돼 있으면 추이 차트에 전년 YTD 표시")
+    args = parser.parse_args()
+    profiling.configure_logging()
+    # 읽기 전용 시트(freeze)에서 파생 조각을 복사 없이 만들도록 Copy-on-Write 사용 (앱과 같은 설정)
+    pd.set_option("mode.copy_on_write", True)
+
+    start = time.perf_counter()
+    data, fetched_at = load_data(args.from_snapshot, args.source)
+    loaded = time.perf_counter()
+    files = export(data, fetched_at, args.out, args.rollup, args.yoy)
+    done = time.perf_counter()
+
+    print(f"로드 {loaded - start:.2f}s · 생성 {done - loaded:.2f}s → {args.out}")
+    for name, size in files.items():
+        if not name.startswith("figures/"):
+            print(f"  {name:<28}{size / 1024:10.1f} KB")
+    n_figs = sum(name.startswith("figures/") for name in files)
+    print(f"  figures/ (Figure JSON {n_figs}개)")
+
+
+if __name__ == "__main__":
+    main()
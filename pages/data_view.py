@@ -2,15 +2,44 @@
 KPI 데이터 탭
 - Google Sheets에서 읽어온 KPI 월별 데이터를 피벗 테이블로 표시
 - 조직별 KPI의 월별 목표/실적/달성률을 한 행에 나열
+- 행 순서는 조직 계층 순서 (상위 조직 바로 아래에 하위 조직)
 """
 
+import math
+
 import streamlit as st
 import pandas as pd
-from utils.data_loader import filter_active_orgs, get_active_org_ids, get_active_kpi_ids
+from utils.cache import cached_by_version
+from utils.shared_cache import shared_by_version
+from utils.dataset import get_dataset
+from utils.org_tree import OrgHierarchy
+from utils.formatting import format_rate, format_value
+from utils import payload, profiling
+
+
+# 조직별 행 배경색 (조직 순서대로 순환)
+_ORG_COLORS = [
+    "#F0F4FF", "#FFF8EE", "#F0FFF4", "#FFF0F6",
+    "#F5F0FF", "#FEFCE8", "#F0FDFA", "#FFF1F2",
+    "#EFF6FF", "#FDF4FF", "#ECFDF5",
+]
+
+# 페이지 표 모드의 페이지당 행 수 선택지
+PAGE_SIZES = [50, 100, 200, 500]
+
+
+def _org_color_map(df: pd.DataFrame) -> dict[int, str]:
+    """조직ID → 행 배경색 (전체 표 기준으로 계산해야 페이지가 바뀌어도 색이 유지됨)"""
+    org_ids = list(dict.fromkeys(df["단위조직ID"]))  # 순서 유지 중복 제거
+    return {oid: _ORG_COLORS[i % len(_ORG_COLORS)] for i, oid in enumerate(org_ids)}
 
 
-def _build_html_table(df: pd.DataFrame) -> str:
-    """DataFrame을 스타일링된 HTML 테이블로 변환"""
+def _build_html_table(df: pd.DataFrame,
+                      org_color_map: dict[int, str] | None = None) -> str:
+    """DataFrame을 스타일링된 HTML 테이블로 변환
+
+    org_color_map을 넘기면 그 색을 쓰고, 없으면 df 안의 조직 순서로 색을 정한다.
+    """
 
     css = """
 <style>
@@ -73,15 +102,13 @@ def _build_html_table(df: pd.DataFrame) -> str:
     parts.append("</tr></thead>")
 
     # ── 조직별 배경색 ──
-    org_colors = [
-        "#F0F4FF", "#FFF8EE", "#F0FFF4", "#FFF0F6",
-        "#F5F0FF", "#FEFCE8", "#F0FDFA", "#FFF1F2",
-        "#EFF6FF", "#FDF4FF", "#ECFDF5",
-    ]
-    org_ids = list(dict.fromkeys(df["단위조직ID"]))  # 순서 유지 중복 제거
-    org_color_map = {oid: org_colors[i % len(org_colors)] for i, oid in enumerate(org_ids)}
+    if org_color_map is None:
+        org_color_map = _org_color_map(df)
 
     # ── 본문 ──
+    # 달성률 컬럼은 '110.72%', 목표/실적 컬럼은 천 단위 구분 숫자로 표시
+    rate_cols = {col for col in df.columns if col.endswith("달성률")}
+    value_cols = {col for col in df.columns if col.endswith(("목표", "실적"))}
     parts.append("<tbody>")
     for _, row in df.iterrows():
         bg = org_color_map.get(row["단위조직ID"], "#FFFFFF")
@@ -90,6 +117,10 @@ def _build_html_table(df: pd.DataFrame) -> str:
             val = row[col]
             if pd.isna(val):
                 parts.append("<td>-</td>")
+            elif col in rate_cols:
+                parts.append(f"<td>{format_rate(val)}</td>")
+            elif col in value_cols:
+                parts.append(f"<td>{format_value(val)}</td>")
             else:
                 parts.append(f"<td>{val}</td>")
         parts.append("</tr>")
@@ -98,64 +129,173 @@ def _build_html_table(df: pd.DataFrame) -> str:
     return "\n".join(parts)
 
 
-def render(data: dict[str, pd.DataFrame]):
-    """KPI 데이터 탭 렌더링"""
-    org_df = filter_active_orgs(data["org"])
-    active_ids = get_active_org_ids(data["org"])
-    active_kpis = get_active_kpi_ids(data["kpi"])
-    monthly_df = data["monthly"][
-        data["monthly"]["조직ID"].isin(active_ids)
-        & data["monthly"]["KPI_ID"].isin(active_kpis)
-    ].copy()
+# 피벗 대상 컬럼: (원본 컬럼, 결과 컬럼 접미사) — 결과 컬럼명은 "{월}월{접미사}"
+_MONTHLY_FIELDS = [("월목표", "목표"), ("월실적", "실적"), ("월 달성률", "달성률")]
+_YTD_FIELDS = [("YTD목표", "YTD목표"), ("YTD실적", "YTD실적"), ("YTD달성률", "YTD달성률")]
+_INFO_COLUMNS = {"조직명": "단위조직명", "조직ID": "단위조직ID", "KPI명": "KPI명"}
 
-    latest_month = int(monthly_df["월"].max())
 
-    # 조직·KPI별로 12개월 데이터를 한 행으로 피벗
-    rows = []
-    for (org_name, org_id, kpi_name), grp in monthly_df.groupby(
-        ["조직명", "조직ID", "KPI명"], sort=False,
-    ):
-        row: dict = {
-            "단위조직명": org_name,
-            "단위조직ID": int(org_id),
-            "KPI명": kpi_name,
-        }
-
-        for _, r in grp.iterrows():
-            m = int(r["월"])
-            row[f"{m}월목표"] = r["월목표"]
-            row[f"{m}월실적"] = r["월실적"]
-            row[f"{m}월달성률"] = r["월 달성률"]
-            row[f"{m}월YTD목표"] = r["YTD목표"]
-            row[f"{m}월YTD실적"] = r["YTD실적"]
-            row[f"{m}월YTD달성률"] = r["YTD달성률"]
-
-            if m == latest_month:
-                row["YTD평가결과"] = r["YTD평가결과"]
-
-        rows.append(row)
-
-    # 컬럼 순서 지정
-    cols = ["단위조직명", "단위조직ID", "KPI명"]
-    for m in range(1, 13):
-        cols.extend([f"{m}월목표", f"{m}월실적", f"{m}월달성률"])
-    for m in range(1, 13):
-        cols.extend([f"{m}월YTD목표", f"{m}월YTD실적", f"{m}월YTD달성률"])
+def _table_columns() -> list[str]:
+    """피벗 결과 컬럼 순서 (정보 3개 + 월별 36개 + YTD 36개 + 평가결과)"""
+    cols = list(_INFO_COLUMNS.values())
+    for fields in (_MONTHLY_FIELDS, _YTD_FIELDS):
+        for m in range(1, 13):
+            cols.extend(f"{m}월{suffix}" for _, suffix in fields)
     cols.append("YTD평가결과")
+    return cols
 
-    result_df = pd.DataFrame(rows, columns=cols)
-    result_df.sort_values(["단위조직ID", "KPI명"], inplace=True)
-    result_df.reset_index(drop=True, inplace=True)
 
-    # 정보 표시
-    kpi_count = len(result_df)
-    org_count = result_df["단위조직ID"].nunique()
-    st.markdown(
+def _pivot_monthly(monthly_df: pd.DataFrame, year: int | None = None) -> pd.DataFrame:
+    """조직·KPI별로 12개월 데이터를 한 행으로 피벗 (set_index + unstack 1회)
+
+    연도 컬럼이 있으면 한 해(기본: 가장 최근 연도)만 피벗한다.
+    YTD평가결과는 해당 연도의 가장 최근 월 값만 사용한다.
+    """
+    if "연도" in monthly_df.columns and not monthly_df.empty:
+        year = int(monthly_df["연도"].max()) if year is None else year
+        monthly_df = monthly_df[monthly_df["연도"] == year]
+    if monthly_df.empty:
+        return pd.DataFrame(columns=_table_columns())
+
+    keys = list(_INFO_COLUMNS)
+    fields = [src for src, _ in _MONTHLY_FIELDS + _YTD_FIELDS]
+    latest_month = int(monthly_df["월"].max())
+
+    # 같은 조직·KPI·월이 중복되면 마지막 행 사용
+    rows = monthly_df.drop_duplicates(keys + ["월"], keep="last")
+    wide = rows.set_index(keys + ["월"])[fields].unstack("월")
+
+    suffix_of = dict(_MONTHLY_FIELDS + _YTD_FIELDS)
+    wide.columns = [f"{int(m)}월{suffix_of[src]}" for src, m in wide.columns]
+
+    grade = rows.loc[rows["월"] == latest_month].set_index(keys)["YTD평가결과"]
+    wide["YTD평가결과"] = grade.astype(object).reindex(wide.index)
+
+    result = wide.reset_index().rename(columns=_INFO_COLUMNS)
+    for col in ["단위조직명", "KPI명"]:
+        result[col] = result[col].astype(object)
+    result["단위조직ID"] = result["단위조직ID"].astype(int)
+    result = result.reindex(columns=_table_columns())
+    result.sort_values(["단위조직ID", "KPI명"], inplace=True)
+    result.reset_index(drop=True, inplace=True)
+    return result
+
+
+def _order_by_hierarchy(df: pd.DataFrame, hierarchy: OrgHierarchy) -> pd.DataFrame:
+    """행을 조직 계층 순서(전위 순회, 상위 조직 바로 아래에 하위 조직)로 정렬
+
+    계층에 없는 조직은 맨 뒤에 조직ID 순으로 둔다. 같은 조직 안에서는 KPI명 순.
+    """
+    rank = df["단위조직ID"].map(hierarchy.tin).fillna(len(hierarchy))
+    ordered = df.assign(_rank=rank).sort_values(
+        ["_rank", "단위조직ID", "KPI명"], kind="stable")
+    return ordered.drop(columns="_rank").reset_index(drop=True)
+
+
+@shared_by_version("data_view.pivot")
+@profiling.timed("pivot")
+def _pivot_table(data: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """조직 계층 순서로 정렬한 피벗 테이블 (공유 캐시를 쓰면 워커 간에 1회 계산)"""
+    dataset = get_dataset(data)
+    return _order_by_hierarchy(_pivot_monthly(dataset.monthly), dataset.hierarchy)
+
+
+@cached_by_version()
+def _prepare(data: dict[str, pd.DataFrame]) -> tuple[pd.DataFrame, dict[int, str]]:
+    """피벗 테이블과 조직별 행 색 (데이터 버전별 1회 계산, 탭을 다시 열 때 재사용)"""
+    result_df = _pivot_table(data)
+    return result_df, _org_color_map(result_df)
+
+
+@cached_by_version(maxsize=32)
+@profiling.timed("html")
+def _page_html(data: dict[str, pd.DataFrame], page: int, page_size: int) -> str:
+    """페이지 1개 분량의 HTML 표 (페이지별 캐시)"""
+    result_df, color_map = _prepare(data)
+    start = (page - 1) * page_size
+    return _build_html_table(result_df.iloc[start:start + page_size], color_map)
+
+
+def table_html(data: dict[str, pd.DataFrame], page: int | None = None,
+               page_size: int = PAGE_SIZES[1]) -> str:
+    """KPI 데이터 HTML 표 (page를 주면 그 페이지만, 없으면 전체 행. 탭과 export.py가 함께 사용)"""
+    if page is not None:
+        return _page_html(data, page, page_size)
+    result_df, color_map = _prepare(data)
+    return _build_html_table(result_df, color_map)
+
+
+def _column_config(df: pd.DataFrame) -> dict:
+    """데이터프레임 모드의 컬럼 표시 설정 (정보 컬럼 고정, 달성률 % 표시)
+
+    숫자가 아닌 값이 있어 문자열로 남은 목표/실적 컬럼(normalize_monthly의 keep_text)은
+    숫자 형식을 붙이지 않고 문자열 그대로 표시한다.
+    """
+    config = {
+        "단위조직명": st.column_config.TextColumn(pinned=True),
+        "단위조직ID": st.column_config.NumberColumn(format="%d", pinned=True),
+        "KPI명": st.column_config.TextColumn(pinned=True),
+    }
+    for col in df.columns:
+        if not col.endswith(("달성률", "목표", "실적")):
+            continue
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            config[col] = st.column_config.TextColumn()
+        elif col.endswith("달성률"):
+            config[col] = st.column_config.NumberColumn(format="%.2f%%")
+        else:
+            config[col] = st.column_config.NumberColumn(format="localized")
+    return config
+
+
+def info_html(data: dict[str, pd.DataFrame]) -> str:
+    """표 위의 요약 줄 (조직 수 · KPI 수 · 기준 연월)"""
+    dataset = get_dataset(data)
+    result_df, _ = _prepare(data)
+    period = f"{dataset.latest_month}월"
+    if dataset.year is not None:
+        period = f"{dataset.year}년 {period}"
+    return (
         f'<div style="font-size:14px; color:#1E3A8A; font-weight:700; '
         f'margin-bottom:12px; font-family:\'Noto Sans KR\',sans-serif;">'
-        f'총 {org_count}개 조직 · {kpi_count}개 KPI · {latest_month}월 기준</div>',
-        unsafe_allow_html=True,
+        f'총 {result_df["단위조직ID"].nunique()}개 조직 · {len(result_df)}개 KPI · {period} 기준</div>'
     )
 
+
+def render(data: dict[str, pd.DataFrame]):
+    """KPI 데이터 탭 렌더링"""
+    result_df, _ = _prepare(data)
+    kpi_count = len(result_df)
+
+    # 정보 표시
+    payload.markdown(info_html(data))
+
+    # 표시 방식: 페이지 단위 HTML 표 (조직별 색상·고정 헤더) / 데이터프레임 (화면에 보이는 부분만 그림)
+    mode_col, size_col, page_col = st.columns([2, 1, 1])
+    with mode_col:
+        mode = st.radio(
+            "표시 방식", ["페이지 표", "데이터프레임"],
+            horizontal=True, key="data_view_mode",
+        )
+
+    if mode == "데이터프레임":
+        payload.dataframe(
+            result_df, hide_index=True, height=660,
+            column_config=_column_config(result_df),
+        )
+        return
+
+    with size_col:
+        page_size = st.selectbox(
+            "페이지당 행 수", PAGE_SIZES, index=1, key="data_view_page_size",
+        )
+    n_pages = max(1, math.ceil(kpi_count / page_size))
+    with page_col:
+        page = st.number_input(
+            f"페이지 (총 {n_pages})", min_value=1, max_value=n_pages,
+            value=1, step=1, key="data_view_page",
+        )
+    page = min(int(page), n_pages)
+
     # HTML 테이블 렌더링 (st.markdown으로 메인 페이지에 삽입해야 sticky 헤더 동작)
-    st.markdown(_build_html_table(result_df), unsafe_allow_html=True)
+    payload.markdown(table_html(data, page, page_size))
@@ -2,13 +2,21 @@
 Phase 3: KPI 추진현황 탭
 - 드롭다운 없이 전체 조직을 계층별로 나열
 - 각 조직마다: 조직명 헤더 + KPI 카드 + AI 해석
-- Level 1 → Level 2 → Level 3 순서
+- 전사 → 본부 → 본부별 하위 조직 → CEO 직보 순서 (utils.org_tree, 깊이 제한 없음)
 """
 
+from collections.abc import Iterator
+
 import streamlit as st
 import pandas as pd
-from pages.llm_briefing import analyze_org_kpis
-from utils.data_loader import filter_active_orgs, get_active_org_ids, get_active_kpi_ids
+from pages.llm_briefing import analyze_all_orgs
+from utils.cache import cached_by_version
+from utils.shared_cache import shared_by_version
+from utils.dataset import KpiDataset, get_dataset
+from utils.formatting import format_rate, format_value
+from utils.org_tree import OrgHierarchy
+from utils import payload, profiling
+from utils.rollup import ROLLUP_MODES, RollupEngine, get_rollup
 
 
 # 평가등급별 색상
@@ -19,23 +27,128 @@ GRADE_COLORS = {
     "C": {"bg": "#F59E0B", "text": "#FFFFFF"},
     "D": {"bg": "#EF4444", "text": "#FFFFFF"},
 }
+_DEFAULT_GRADE_COLOR = {"bg": "#9CA3AF", "text": "#FFFFFF"}
+
+# 조직 섹션 표시 방식
+RENDER_MODES = {
+    "block": "조직별 한 블록",  # 헤더+카드+AI 해석을 HTML 1개로 전송 (공용 CSS 클래스)
+    "cards": "카드별 개별 출력",  # 카드마다 st.markdown 1개 (기존 방식)
+}
+
+# 레벨별 헤더 배경/글자 크기/아이콘
+_LEVEL_STYLES = {
+    1: ("linear-gradient(90deg,#0047AB,#1E3A8A)", "18px", "🏢"),
+    2: ("linear-gradient(90deg,#1E3A8A,#3B82F6)", "16px", "🏛️"),
+    3: ("linear-gradient(90deg,#3B82F6,#60A5FA)", "15px", "👥"),
+}
+
+
+def _grade_class(grade: str) -> str:
+    return f"g-{grade}" if grade in GRADE_COLORS else "g-none"
+
+
+def _section_css() -> str:
+    """block 모드 공용 스타일시트 (카드/헤더/AI 박스 클래스 + 등급·레벨별 색상)"""
+    grade_rules = "\n".join(
+        f".kpi-card.{_grade_class(grade)} .kpi-card-head{{background:{c['bg']};color:{c['text']};}}"
+        f" .kpi-card.{_grade_class(grade)} .kpi-accent{{color:{c['bg']};}}"
+        for grade, c in [*GRADE_COLORS.items(), ("none", _DEFAULT_GRADE_COLOR)]
+    )
+    level_rules = "\n".join(
+        f".kpi-org-head.lv{level}{{background:{bg};font-size:{size};}}"
+        for level, (bg, size, _) in _LEVEL_STYLES.items()
+    )
+    return f"""<style>
+.kpi-org-head{{margin-top:28px;margin-bottom:12px;padding:12px 20px;border-radius:10px;color:white;font-weight:900;display:flex;justify-content:space-between;align-items:center;font-family:'Noto Sans KR',sans-serif;}}
+.kpi-org-meta{{font-size:13px;opacity:0.8;font-weight:700;}}
+{level_rules}
+.kpi-grid{{display:grid;grid-template-columns:repeat(3,minmax(0,1fr));gap:16px;margin-bottom:12px;}}
+.kpi-card{{background:#FFFFFF;border-radius:14px;box-shadow:0 2px 12px rgba(30,58,138,0.10);overflow:hidden;border:1px solid #E0E8F9;}}
+.kpi-card-head{{padding:14px 18px;display:flex;justify-content:space-between;align-items:center;}}
+.kpi-card-name{{font-weight:900;font-size:15px;font-family:'Noto Sans KR',sans-serif;}}
+.kpi-card-grade{{background:rgba(255,255,255,0.25);font-weight:900;font-size:14px;padding:3px 12px;border-radius:20px;}}
+.kpi-card-body{{padding:18px;}}
+.kpi-card-ytd{{text-align:center;margin-bottom:16px;}}
+.kpi-card-label{{font-size:13px;color:#6B7280;font-weight:700;margin-bottom:4px;}}
+.kpi-card-rate{{font-size:36px;font-weight:900;line-height:1.1;}}
+.kpi-card hr{{border:none;height:1px;background:#E5E7EB;margin:0 0 14px 0;}}
+.kpi-card-pair{{display:flex;justify-content:space-between;margin-bottom:8px;}}
+.kpi-card-pair>div{{text-align:center;flex:1;}}
+.kpi-card-pair>.sep{{flex:none;width:1px;background:#E5E7EB;margin:0 12px;}}
+.kpi-card-small{{font-size:11px;color:#9CA3AF;font-weight:700;}}
+.kpi-card-num{{font-size:20px;font-weight:900;color:#1E3A8A;}}
+.kpi-card-type{{text-align:center;margin-top:12px;font-size:11px;color:#9CA3AF;background:#F8FAFC;padding:4px 8px;border-radius:6px;}}
+{grade_rules}
+.kpi-ai{{background:linear-gradient(135deg,#EEF2FF,#F0F4FF);border:1px solid #C7D2F0;border-radius:14px;padding:20px;margin:12px 0 24px 0;}}
+.kpi-ai-head{{display:flex;align-items:center;margin-bottom:14px;}}
+.kpi-ai-title{{font-weight:900;font-size:16px;color:#1E3A8A;font-family:'Noto Sans KR',sans-serif;}}
+.kpi-ai-avg{{margin-left:auto;background:#0047AB;color:white;padding:3px 12px;border-radius:20px;font-size:12px;font-weight:700;}}
+.kpi-ai-summary{{font-size:14px;color:#1E3A8A;font-weight:700;margin-bottom:14px;padding:10px 14px;background:white;border-radius:10px;border-left:4px solid #0047AB;}}
+.kpi-ai-cols{{display:flex;gap:16px;margin-bottom:14px;flex-wrap:wrap;}}
+.kpi-ai-cols>div{{flex:1;min-width:200px;}}
+.kpi-ai-label{{font-size:12px;font-weight:900;margin-bottom:6px;}}
+.kpi-ai-tag{{display:inline-block;color:white;padding:2px 10px;border-radius:12px;font-size:13px;font-weight:700;margin:2px 4px;}}
+.kpi-ai-action{{padding:4px 0;font-size:13px;color:#374151;}}
+.kpi-ai-note{{text-align:right;margin-top:12px;font-size:10px;color:#999999;font-style:italic;}}
+</style>"""
+
+
+def _kpi_card_html(row) -> str:
+    """block 모드 KPI 카드 HTML (스타일은 _section_css의 클래스 사용)"""
+    grade = str(row.YTD평가결과).strip()
+    return (
+        f'<div class="kpi-card {_grade_class(grade)}">'
+        f'<div class="kpi-card-head"><span class="kpi-card-name">{row.KPI명}</span>'
+        f'<span class="kpi-card-grade">{grade}등급</span></div>'
+        f'<div class="kpi-card-body">'
+        f'<div class="kpi-card-ytd"><div class="kpi-card-label">YTD 달성률</div>'
+        f'<div class="kpi-card-rate kpi-accent">{format_rate(row.YTD달성률)}</div></div>'
+        f'<hr><div class="kpi-card-pair">'
+        f'<div><div class="kpi-card-small">이번 달 목표</div>'
+        f'<div class="kpi-card-num">{format_value(row.월목표)}</div></div>'
+        f'<div class="sep"></div>'
+        f'<div><div class="kpi-card-small">이번 달 실적</div>'
+        f'<div class="kpi-card-num kpi-accent">{format_value(row.월실적)}</div></div>'
+        f'</div><div class="kpi-card-type">{row.KPI유형}</div></div></div>'
+    )
 
 
-def _get_latest_month(monthly_df: pd.DataFrame) -> int:
-    """데이터에서 가장 최근 월 반환"""
-    return int(monthly_df["월"].max())
+def _ai_box_html(analysis: dict) -> str:
+    """block 모드 AI 해석 박스 HTML"""
+    strong = "".join(
+        f'<span class="kpi-ai-tag" style="background:#059669;">▲ {s["name"]} {s["rate"]:.1f}%</span>'
+        for s in analysis["strong"]
+    )
+    risk = "".join(
+        f'<span class="kpi-ai-tag" style="background:#EF4444;">▼ {r["name"]} {r["rate"]:.1f}%</span>'
+        for r in analysis["risk"]
+    )
+    actions = "".join(f'<div class="kpi-ai-action">→ {a}</div>' for a in analysis["actions"])
+    return (
+        f'<div class="kpi-ai"><div class="kpi-ai-head">'
+        f'<span style="font-size:22px;margin-right:8px;">💡</span>'
+        f'<span class="kpi-ai-title">AI 성과 해석</span>'
+        f'<span class="kpi-ai-avg">평균 {analysis["avg_rate"]}%</span></div>'
+        f'<div class="kpi-ai-summary">{analysis["summary"]}</div>'
+        f'<div class="kpi-ai-cols">'
+        f'<div><div class="kpi-ai-label" style="color:#059669;">✅ 강점 KPI</div>{strong}</div>'
+        f'<div><div class="kpi-ai-label" style="color:#EF4444;">⚠️ 리스크 KPI</div>{risk}</div>'
+        f'</div><div><div class="kpi-ai-label" style="color:#0047AB;">📋 다음 활동 제안</div>'
+        f'{actions}</div>'
+        f'<div class="kpi-ai-note">* 규칙 기반 자동 생성 (LLM API 미사용)</div></div>'
+    )
 
 
-def _render_kpi_card(row: pd.Series):
-    """KPI 카드 1개를 HTML로 렌더링"""
-    kpi_name = row["KPI명"]
-    grade = str(row["YTD평가결과"]).strip()
-    ytd_rate = str(row["YTD달성률"]).strip()
-    target = row["월목표"]
-    actual = row["월실적"]
-    kpi_type = row["KPI유형"]
+def _render_kpi_card(row):
+    """KPI 카드 1개를 HTML로 렌더링 (row: itertuples()의 행)"""
+    kpi_name = row.KPI명
+    grade = str(row.YTD평가결과).strip()
+    ytd_rate = format_rate(row.YTD달성률)
+    target = format_value(row.월목표)
+    actual = format_value(row.월실적)
+    kpi_type = row.KPI유형
 
-    color = GRADE_COLORS.get(grade, {"bg": "#9CA3AF", "text": "#FFFFFF"})
+    color = GRADE_COLORS.get(grade, _DEFAULT_GRADE_COLOR)
 
     card_html = f"""<div style="background:#FFFFFF; border-radius:14px; box-shadow:0 2px 12px rgba(30,58,138,0.10); overflow:hidden; border:1px solid #E0E8F9; height:100%;">
 <div style="background:{color['bg']}; padding:14px 18px; display:flex; justify-content:space-between; align-items:center;">
@@ -62,7 +175,7 @@ def _render_kpi_card(row: pd.Series):
 <div style="text-align:center; margin-top:12px; font-size:11px; color:#9CA3AF; background:#F8FAFC; padding:4px 8px; border-radius:6px;">{kpi_type}</div>
 </div>
 </div>"""
-    st.markdown(card_html, unsafe_allow_html=True)
+    payload.markdown(card_html)
 
 
 def _render_ai_box(analysis: dict):
@@ -111,118 +224,195 @@ def _render_ai_box(analysis: dict):
 </div>
 <div style="text-align:right; margin-top:12px; font-size:10px; color:#999999; font-style:italic;">* 규칙 기반 자동 생성 (LLM API 미사용)</div>
 </div>"""
-    st.markdown(box_html, unsafe_allow_html=True)
+    payload.markdown(box_html)
+
+
+@cached_by_version()
+@shared_by_version("kpi_view.analysis")
+@profiling.timed("analysis")
+def _prepare(data: dict[str, pd.DataFrame]) -> dict[int, dict]:
+    """조직별 AI 해석 결과 (데이터 버전별 1회 계산, 탭을 다시 열 때 재사용)"""
+    return analyze_all_orgs(get_dataset(data).month_rows())
+
+
+def _rollup_text(rollup: RollupEngine, org_id: int, rollup_mode: str) -> str:
+    """하위 조직이 있는 조직의 헤더에 붙일 집계 문구 (없으면 빈 문자열)"""
+    summary = rollup.summary(org_id, rollup_mode)
+    if summary is None or summary["org_count"] <= 1:
+        return ""
+    return (f' | 하위 포함 {ROLLUP_MODES[rollup_mode]} {summary["value"]:.1f}%'
+            f' (달성 {summary["achieved"]}/{summary["total"]})')
+
+
+def _org_block_html(org_name: str, level: int, latest_month: int,
+                    kpi_data: pd.DataFrame, analysis: dict,
+                    rollup_text: str = "") -> str:
+    """block 모드 조직 섹션 HTML (헤더 + 카드 그리드 + AI 해석)"""
+    level = min(level, 3)
+    cards = "".join(_kpi_card_html(row) for row in kpi_data.itertuples(index=False))
+    return (
+        f'<div class="kpi-org-head lv{level}"><span>{_LEVEL_STYLES[level][2]} {org_name}</span>'
+        f'<span class="kpi-org-meta">{latest_month}월 기준 | KPI {len(kpi_data)}개{rollup_text}</span></div>'
+        f'<div class="kpi-grid">{cards}</div>'
+        f'{_ai_box_html(analysis)}'
+    )
+
+
+@cached_by_version()
+@profiling.timed("html")
+def _section_html(data: dict[str, pd.DataFrame], rollup_mode: str) -> dict[int, str]:
+    """block 모드 조직별 섹션 HTML (최신 월 데이터가 있는 조직만, 데이터 버전·집계 방식별 1회 생성)"""
+    dataset = get_dataset(data)
+    analyses = _prepare(data)
+    rollup = get_rollup(data)
+    sections = {}
+    for org_name, org_id, level in dataset.hierarchy.entries(dataset.hierarchy.order):
+        kpi_data = dataset.org_month(org_id)
+        if not kpi_data.empty:
+            sections[org_id] = _org_block_html(
+                org_name, level, dataset.latest_month, kpi_data, analyses[org_id],
+                _rollup_text(rollup, org_id, rollup_mode))
+    return sections
+
+
+def block_parts(data: dict[str, pd.DataFrame], rollup_mode: str) -> list[str]:
+    """block 모드 화면의 HTML 조각을 표시 순서대로 (스타일, 그룹 제목·구분선, 조직 섹션)
+
+    탭과 정적 내보내기(export.py)가 같은 조각을 쓴다.
+    """
+    sections = _section_html(data, rollup_mode)
+    parts = [_section_css()]
+    for item in _layout(get_dataset(data).hierarchy):
+        if isinstance(item, str):
+            parts.append(item)
+        elif item[1] in sections:
+            parts.append(sections[item[1]])
+    return parts
 
 
 def _render_org_section(org_name: str, org_id: int, level: int,
-                        monthly_df: pd.DataFrame, latest_month: int):
-    """하나의 조직 섹션 렌더링 (헤더 + KPI 카드 + AI 해석)"""
+                        dataset: KpiDataset, analyses: dict[int, dict],
+                        rollup_text: str = ""):
+    """하나의 조직 섹션 렌더링 (헤더 + KPI 카드 + AI 해석, 카드별 개별 출력)"""
     # 해당 조직의 최신 월 KPI 데이터
-    kpi_data = monthly_df[
-        (monthly_df["조직ID"] == org_id) & (monthly_df["월"] == latest_month)
-    ].copy()
+    latest_month = dataset.latest_month
+    kpi_data = dataset.org_month(org_id, latest_month)
 
     if kpi_data.empty:
         return
 
     # 레벨별 헤더 스타일 (margin-left 통일: 0)
-    if level == 1:
-        bg = "linear-gradient(90deg,#0047AB,#1E3A8A)"
-        font_size = "18px"
-        icon = "🏢"
-    elif level == 2:
-        bg = "linear-gradient(90deg,#1E3A8A,#3B82F6)"
-        font_size = "16px"
-        icon = "🏛️"
-    else:
-        bg = "linear-gradient(90deg,#3B82F6,#60A5FA)"
-        font_size = "15px"
-        icon = "👥"
+    bg, font_size, icon = _LEVEL_STYLES[min(level, 3)]
 
     # 조직 헤더
     header_html = f"""<div style="margin-top:28px; margin-bottom:12px; padding:12px 20px; background:{bg}; border-radius:10px; color:white; font-weight:900; font-size:{font_size}; display:flex; justify-content:space-between; align-items:center; font-family:'Noto Sans KR',sans-serif;">
 <span>{icon} {org_name}</span>
-<span style="font-size:13px; opacity:0.8; font-weight:700;">{latest_month}월 기준 | KPI {len(kpi_data)}개</span>
+<span style="font-size:13px; opacity:0.8; font-weight:700;">{latest_month}월 기준 | KPI {len(kpi_data)}개{rollup_text}</span>
 </div>"""
-    st.markdown(header_html, unsafe_allow_html=True)
+    payload.markdown(header_html)
 
-    # KPI 카드 (3열 배치)
-    kpi_list = kpi_data.reset_index(drop=True)
-    for i in range(0, len(kpi_list), 3):
+    # KPI 카드 (3열 배치, 행마다 Series를 만들지 않고 튜플로 순회)
+    rows = list(kpi_data.itertuples(index=False))
+    for i in range(0, len(rows), 3):
         cols = st.columns(3)
-        for j, col in enumerate(cols):
-            if i + j < len(kpi_list):
-                with col:
-                    _render_kpi_card(kpi_list.iloc[i + j])
-        st.markdown("<div style='height:12px;'></div>", unsafe_allow_html=True)
+        for col, row in zip(cols, rows[i:i + 3]):
+            with col:
+                _render_kpi_card(row)
+        payload.markdown("<div style='height:12px;'></div>")
 
     # AI 해석 박스
-    analysis = analyze_org_kpis(kpi_data)
-    _render_ai_box(analysis)
+    _render_ai_box(analyses[org_id])
 
 
-def render(data: dict[str, pd.DataFrame]):
-    """KPI 추진현황 탭 전체 렌더링"""
-    org_df = filter_active_orgs(data["org"])
-    active_ids = get_active_org_ids(data["org"])
-    active_kpis = get_active_kpi_ids(data["kpi"])
-    monthly_df = data["monthly"][
-        data["monthly"]["조직ID"].isin(active_ids)
-        & data["monthly"]["KPI_ID"].isin(active_kpis)
-    ].copy()
-    latest_month = _get_latest_month(monthly_df)
-
-    # 1) Level 1: 전사 (조직ID 순)
-    level1 = org_df[org_df["Level"] == 1].sort_values("조직ID")
-    for _, org in level1.iterrows():
-        org_id = int(org["조직ID"])
-        _render_org_section(org["조직명"], org_id, 1, monthly_df, latest_month)
-
-    # Level 2 분류: "본부" 포함 vs "팀" 포함 (CEO 직보)
-    level2_all = org_df[org_df["Level"] == 2].sort_values("조직ID")
-    bonbu = level2_all[level2_all["조직명"].str.contains("본부")]
-    jikbo = level2_all[level2_all["조직명"].str.contains("팀")]
+_DIVIDER = ('<hr style="border:none; height:2px; background:linear-gradient'
+            '(90deg,#3B82F6,#60A5FA); margin:32px 0 8px 0;">')
+
+
+def _group_title_html(title: str, spaced: bool = True) -> str:
+    """본부 소속 팀 / CEO 직보 그룹 제목"""
+    top = "margin-top:28px; " if spaced else ""
+    return (
+        f'<div style="{top}margin-bottom:4px; padding:8px 16px;'
+        f' background:#E0E8F9; border-radius:8px; font-size:14px;'
+        f' font-weight:900; color:#1E3A8A; font-family:\'Noto Sans KR\',sans-serif;">'
+        f'{title}</div>'
+    )
+
+
+def _layout(hierarchy: OrgHierarchy) -> Iterator[tuple[str, int, int] | str]:
+    """탭의 표시 순서: 조직 항목 (조직명, 조직ID, 레벨) 또는 구분선·그룹 제목 HTML"""
+    # 1) 전사 (루트 조직)
+    yield from hierarchy.entries(hierarchy.roots)
 
     # 2) 본부들만 먼저 전부 표시 (소속 팀 없이)
-    for _, l2 in bonbu.iterrows():
-        _render_org_section(l2["조직명"], int(l2["조직ID"]), 2, monthly_df, latest_month)
+    divisions = hierarchy.divisions()
+    yield from hierarchy.entries(divisions)
 
     # 3) 구분선
-    st.markdown(
-        '<hr style="border:none; height:2px; background:linear-gradient'
-        '(90deg,#3B82F6,#60A5FA); margin:32px 0 8px 0;">',
-        unsafe_allow_html=True,
-    )
+    yield _DIVIDER
 
-    # 4) 각 본부별 소속 팀 그룹
-    for _, l2 in bonbu.iterrows():
-        l2_id = int(l2["조직ID"])
-        level3 = org_df[org_df["ParentID"] == l2_id].sort_values("조직ID")
-        if level3.empty:
+    # 4) 각 본부별 소속 조직 그룹 (하위 전체, 깊이 제한 없음)
+    for division in divisions:
+        descendants = hierarchy.descendants(division)
+        if not descendants:
             continue
-        st.markdown(
-            f'<div style="margin-top:28px; margin-bottom:4px; padding:8px 16px;'
-            f' background:#E0E8F9; border-radius:8px; font-size:14px;'
-            f' font-weight:900; color:#1E3A8A; font-family:\'Noto Sans KR\',sans-serif;">'
-            f'📂 {l2["조직명"]} 소속 팀</div>',
-            unsafe_allow_html=True,
-        )
-        for _, l3 in level3.iterrows():
-            _render_org_section(l3["조직명"], int(l3["조직ID"]), 3, monthly_df, latest_month)
-
-    # 5) CEO 직보 팀 (Level 2 중 "팀" 포함, 조직ID 순)
-    if not jikbo.empty:
-        st.markdown(
-            '<hr style="border:none; height:2px; background:linear-gradient'
-            '(90deg,#3B82F6,#60A5FA); margin:32px 0 8px 0;">',
-            unsafe_allow_html=True,
-        )
-        st.markdown(
-            '<div style="margin-bottom:4px; padding:8px 16px;'
-            ' background:#E0E8F9; border-radius:8px; font-size:14px;'
-            ' font-weight:900; color:#1E3A8A; font-family:\'Noto Sans KR\',sans-serif;">'
-            '⭐ CEO 직보</div>',
-            unsafe_allow_html=True,
+        yield _group_title_html(f"📂 {hierarchy.names[division]} 소속 팀")
+        yield from hierarchy.entries(descendants)
+
+    # 5) CEO 직보 팀 (루트 바로 아래의 팀, 조직ID 순)
+    direct_reports = hierarchy.direct_reports()
+    if direct_reports:
+        yield _DIVIDER
+        yield _group_title_html("⭐ CEO 직보", spaced=False)
+        yield from hierarchy.entries(direct_reports)
+
+
+# 하위 조직 집계 선택을 보관하는 세션 키 (위젯 키가 아니라서 화면을 옮겨 위젯이
+# 사라져도 유지되고, KPI 추진현황·조직도 탭이 같은 선택을 공유)
+ROLLUP_CHOICE_KEY = "rollup_choice"
+
+
+def rollup_mode_radio(key: str, modes: list[str]) -> str:
+    """하위 조직 집계 방식 선택 라디오 (탭마다 다른 위젯 key, 선택은 ROLLUP_CHOICE_KEY에 보관)
+
+    modes는 RollupEngine.modes() (가중치 컬럼이 없으면 가중 평균은 빠짐).
+    """
+    def remember():
+        st.session_state[ROLLUP_CHOICE_KEY] = st.session_state[key]
+
+    # 다른 탭에서 바꾼 선택을 위젯을 만들기 전에 반영 (지금 없는 방식이면 평균)
+    choice = st.session_state.get(ROLLUP_CHOICE_KEY, "mean")
+    st.session_state[key] = choice if choice in modes else "mean"
+    return st.radio(
+        "하위 조직 집계", modes, format_func=ROLLUP_MODES.get,
+        horizontal=True, key=key, on_change=remember,
+    )
+
+
+def render(data: dict[str, pd.DataFrame]):
+    """KPI 추진현황 탭 전체 렌더링"""
+    dataset = get_dataset(data)
+    analyses = _prepare(data)
+
+    rollup = get_rollup(data)
+
+    mode_col, rollup_col = st.columns(2)
+    with mode_col:
+        mode = st.radio(
+            "표시 방식", list(RENDER_MODES), format_func=RENDER_MODES.get,
+            horizontal=True, key="kpi_render_mode",
         )
-        for _, l2 in jikbo.iterrows():
-            _render_org_section(l2["조직명"], int(l2["조직ID"]), 2, monthly_df, latest_month)
+    with rollup_col:
+        rollup_mode = rollup_mode_radio("rollup_mode", rollup.modes())
+    if mode == "block":
+        for part in block_parts(data, rollup_mode):
+            payload.markdown(part)
+        return
+
+    for item in _layout(dataset.hierarchy):
+        if isinstance(item, str):
+            payload.markdown(item)
+        else:
+            org_name, org_id, level = item
+            _render_org_section(org_name, org_id, level, dataset, analyses,
+                                _rollup_text(rollup, org_id, rollup_mode))
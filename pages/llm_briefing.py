@@ -4,20 +4,120 @@
 - 추후 Anthropic API로 교체 가능
 """
 
+import numpy as np
 import pandas as pd
 
+from utils.data_loader import parse_rate
 
-def _parse_rate(rate_str: str) -> float:
-    """'110.72%' → 110.72 숫자로 변환"""
-    try:
-        return float(str(rate_str).replace("%", "").strip())
-    except (ValueError, TypeError):
-        return 0.0
+
+# 종합평가 문구 (목표 달성 KPI 비율 기준)
+_TONE_BINS = [(80, "우수한 성과를 보이고 있습니다."),
+              (50, "보통 수준이며 일부 개선이 필요합니다."),
+              (-np.inf, "목표 달성이 부진하여 집중 관리가 필요합니다.")]
+
+# 하위 KPI 활동 제안 문구 (달성률 기준, 100% 이상이면 제안 없음)
+_ACTION_BINS = [(80, "긴급 원인 분석 및 대응 필요"),
+                (90, "목표 재점검 및 실행력 강화 필요"),
+                (100, "목표 달성까지 집중 관리 필요")]
+
+
+def _empty_analysis() -> dict:
+    return {
+        "summary": "데이터가 없습니다.",
+        "avg_rate": 0, "achieved_count": 0, "total_count": 0,
+        "strong": [], "risk": [], "actions": [],
+    }
+
+
+def _kpi_items(rows: pd.DataFrame) -> dict[int, list[dict]]:
+    """조직ID → [{"name", "rate", "grade"}, ...] (rows의 순서 유지)"""
+    items: dict[int, list[dict]] = {}
+    for org_id, name, rate, grade in zip(rows["조직ID"], rows["KPI명"],
+                                         rows["달성률_num"], rows["YTD평가결과"]):
+        items.setdefault(org_id, []).append({"name": name, "rate": rate, "grade": grade})
+    return items
+
+
+def analyze_all_orgs(latest_df: pd.DataFrame) -> dict[int, dict]:
+    """
+    전체 조직의 최신 월 KPI 데이터를 한 번에 분석
+
+    조직ID별로 groupby 1회 + 정렬 1회로 집계하고, 등급/제안 문구는
+    임계값 구간으로 벡터 분류한다. 결과는 analyze_org_kpis와 같은 형태이며
+    데이터가 있는 조직만 포함된다.
+
+    Returns:
+        {조직ID: analyze_org_kpis 결과 dict, ...}
+    """
+    if latest_df.empty:
+        return {}
+
+    df = pd.DataFrame({
+        "조직ID": latest_df["조직ID"].to_numpy(),
+        "KPI명": latest_df["KPI명"].to_numpy(),
+        "YTD평가결과": latest_df["YTD평가결과"].to_numpy(),
+        # 빈 달성률은 결측 그대로: 평균에서 빠지고 정렬 맨 뒤, 활동 제안 없음 (기존 조직별 분석과 동일)
+        "달성률_num": parse_rate(latest_df["YTD달성률"]).to_numpy(),
+    })
+    rate = df["달성률_num"]
+
+    grouped = rate.groupby(df["조직ID"], sort=False)
+    stats = pd.DataFrame({
+        "total": grouped.size(),
+        "avg": grouped.mean(),
+        "achieved": (rate >= 100).groupby(df["조직ID"], sort=False).sum(),
+    })
+    stats["pct"] = stats["achieved"] / stats["total"] * 100
+    stats["tone"] = np.select([stats["pct"] >= bound for bound, _ in _TONE_BINS],
+                              [tone for _, tone in _TONE_BINS], default="")
+
+    # 조직별 상위/하위 2개 = 달성률 내림차순 안정 정렬 후 그룹별 head/tail
+    # (조직별 nlargest/nsmallest와 같은 결과를 정렬 1회로 계산)
+    ordered = df.sort_values("달성률_num", ascending=False, kind="stable")
+    by_org = ordered.groupby("조직ID", sort=False)
+    top = _kpi_items(by_org.head(2))
+    bottom_rows = by_org.tail(2)
+    bottom = _kpi_items(bottom_rows)
+
+    # 하위 KPI 활동 제안 (100% 미만만)
+    bottom_rate = bottom_rows["달성률_num"]
+    suffix = np.select([bottom_rate < bound for bound, _ in _ACTION_BINS],
+                       [text for _, text in _ACTION_BINS], default="")
+    needs_action = suffix != ""
+    risk_actions: dict[int, list[str]] = {}
+    for org_id, name, r, text in zip(bottom_rows["조직ID"][needs_action],
+                                     bottom_rows["KPI명"][needs_action],
+                                     bottom_rate[needs_action], suffix[needs_action]):
+        risk_actions.setdefault(org_id, []).append(f"'{name}' ({r:.1f}%) {text}")
+
+    results = {}
+    for org_id, total, avg, achieved, pct, tone in zip(
+            stats.index, stats["total"], stats["avg"], stats["achieved"],
+            stats["pct"], stats["tone"]):
+        strong = top[org_id]
+        actions = list(risk_actions.get(org_id, []))
+        # 강점 기반 제안
+        if strong[0]["rate"] >= 110:
+            actions.append(f"'{strong[0]['name']}' 우수 사례를 타 KPI에 벤치마킹 권장")
+        if not actions:
+            actions.append("전반적으로 양호하나 지속적인 모니터링 필요")
+
+        results[int(org_id)] = {
+            "summary": f"{total}개 KPI 중 {achieved}개 목표 달성 ({pct:.0f}%). {tone}",
+            "avg_rate": round(avg, 1),
+            "achieved_count": int(achieved),
+            "total_count": int(total),
+            "strong": strong,
+            "risk": bottom[org_id],
+            "actions": actions,
+        }
+    return results
 
 
 def analyze_org_kpis(kpi_data: pd.DataFrame) -> dict:
     """
     조직의 KPI 데이터를 분석하여 해석 결과 반환
+    (여러 조직을 분석할 때는 analyze_all_orgs 사용)
 
     Returns:
         {
@@ -31,72 +131,7 @@ def analyze_org_kpis(kpi_data: pd.DataFrame) -> dict:
         }
     """
     if kpi_data.empty:
-        return {
-            "summary": "데이터가 없습니다.",
-            "avg_rate": 0, "achieved_count": 0, "total_count": 0,
-            "strong": [], "risk": [], "actions": [],
-        }
-
-    df = kpi_data.copy()
-    df["달성률_num"] = df["YTD달성률"].apply(_parse_rate)
-
-    total = len(df)
-    avg_rate = df["달성률_num"].mean()
-    achieved = df[df["달성률_num"] >= 100]
-    achieved_count = len(achieved)
-
-    # 달성률 기준 정렬
-    sorted_df = df.sort_values("달성률_num", ascending=False)
-
-    # 강점 KPI (상위 2개)
-    top = sorted_df.head(2)
-    strong = [
-        {"name": r["KPI명"], "rate": r["달성률_num"], "grade": r["YTD평가결과"]}
-        for _, r in top.iterrows()
-    ]
-
-    # 리스크 KPI (하위 2개)
-    bottom = sorted_df.tail(2)
-    risk = [
-        {"name": r["KPI명"], "rate": r["달성률_num"], "grade": r["YTD평가결과"]}
-        for _, r in bottom.iterrows()
-    ]
-
-    # 종합평가 문장
-    pct = (achieved_count / total * 100) if total > 0 else 0
-    if pct >= 80:
-        tone = "우수한 성과를 보이고 있습니다."
-    elif pct >= 50:
-        tone = "보통 수준이며 일부 개선이 필요합니다."
-    else:
-        tone = "목표 달성이 부진하여 집중 관리가 필요합니다."
-    summary = f"{total}개 KPI 중 {achieved_count}개 목표 달성 ({pct:.0f}%). {tone}"
-
-    # 활동 제안
-    actions = []
-    for _, r in bottom.iterrows():
-        rate = r["달성률_num"]
-        name = r["KPI명"]
-        if rate < 80:
-            actions.append(f"'{name}' ({rate:.1f}%) 긴급 원인 분석 및 대응 필요")
-        elif rate < 90:
-            actions.append(f"'{name}' ({rate:.1f}%) 목표 재점검 및 실행력 강화 필요")
-        elif rate < 100:
-            actions.append(f"'{name}' ({rate:.1f}%) 목표 달성까지 집중 관리 필요")
-
-    # 강점 기반 제안
-    if strong and strong[0]["rate"] >= 110:
-        actions.append(f"'{strong[0]['name']}' 우수 사례를 타 KPI에 벤치마킹 권장")
-
-    if not actions:
-        actions.append("전반적으로 양호하나 지속적인 모니터링 필요")
-
-    return {
-        "summary": summary,
-        "avg_rate": round(avg_rate, 1),
-        "achieved_count": achieved_count,
-        "total_count": total,
-        "strong": strong,
-        "risk": risk,
-        "actions": actions,
-    }
+        return _empty_analysis()
+    # 한 조직으로 묶어서 일괄 분석
+    (result,) = analyze_all_orgs(kpi_data.assign(조직ID=0)).values()
+    return result
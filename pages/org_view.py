@@ -1,12 +1,17 @@
 """
 조직도 탭 - 트리 구조 시각화
-- Org_Master 데이터를 기반으로 전사→본부→팀 트리 표시
+- 조직 계층 인덱스(utils.org_tree)를 기반으로 전사→본부→팀 트리 표시 (깊이 제한 없음)
 - Level별 색상 구분
 """
 
 import pandas as pd
 import streamlit as st
-from utils.data_loader import filter_active_orgs
+from pages.kpi_view import rollup_mode_radio
+from utils.cache import cached_by_version
+from utils.dataset import get_dataset
+from utils.org_tree import OrgHierarchy
+from utils.rollup import RollupEngine, format_grades, get_rollup
+from utils import payload, profiling
 
 # Level별 색상 정의
 LEVEL_COLORS = {
@@ -15,71 +20,72 @@ LEVEL_COLORS = {
     3: {"bg": "#93C5FD", "text": "#1E3A8A", "border": "#60A5FA"},  # 연한 파란색
 }
 
-# Level 2 표시 순서 (조직ID 기준)
-LEVEL2_ORDER = [2002, 2003, 3101, 2004, 2005]
-
-
-def _build_tree(org_df: pd.DataFrame) -> dict:
-    """Org_Master DataFrame을 트리 딕셔너리로 변환"""
-    root = org_df[org_df["Level"] == 1].iloc[0]
-    root_id = int(root["조직ID"])
-
-    # Level 2 자식 조직 (지정 순서대로)
-    level2 = org_df[org_df["ParentID"] == root_id]
-    level2_ordered = []
-    for oid in LEVEL2_ORDER:
-        match = level2[level2["조직ID"] == oid]
-        if not match.empty:
-            level2_ordered.append(match.iloc[0])
-
-    children = []
-    for l2 in level2_ordered:
-        l2_id = int(l2["조직ID"])
-        # Level 3 자식 조직
-        level3 = org_df[org_df["ParentID"] == l2_id]
-        grandchildren = [
-            {"name": row["조직명"], "level": 3}
-            for _, row in level3.iterrows()
-        ]
-        children.append({
-            "name": l2["조직명"],
-            "level": 2,
-            "children": grandchildren,
-        })
-
-    return {"name": root["조직명"], "level": 1, "children": children}
-
-
-def _render_tree_html(tree: dict) -> str:
-    """트리 딕셔너리를 HTML로 변환 (ul/li 기반 표준 트리 패턴)"""
-    root = tree
-    c1 = LEVEL_COLORS[1]
-    c2 = LEVEL_COLORS[2]
-    c3 = LEVEL_COLORS[3]
+
+def _card_html(name: str, depth: int, summary: dict | None = None) -> str:
+    """조직 카드 1개 (4단계 이하는 3단계 색상 사용)
+
+    summary(하위 포함 집계)가 있으면 카드 아래쪽에 달성률을, 툴팁에 등급 분포를 표시한다.
+    """
+    level = min(depth, 3)
+    c = LEVEL_COLORS[level]
+    title = rollup_line = ""
+    if summary is not None:
+        title = f' title="등급 분포: {format_grades(summary["grades"])}"'
+        rollup_line = (f'<div class="rollup">{summary["value"]:.1f}%'
+                       f' · 달성 {summary["achieved"]}/{summary["total"]}</div>')
+    return (f'<div class="card l{level}" style="background:{c["bg"]};'
+            f'color:{c["text"]};border-color:{c["border"]};"{title}>{name}{rollup_line}</div>')
+
+
+def _ordered_children(hierarchy: OrgHierarchy, org_id: int) -> list[int]:
+    """자식 조직 목록 (전사 바로 아래는 report_order와 같이 본부 → CEO 직보 팀, 각각 조직ID 순)"""
+    children = hierarchy.children[org_id]
+    if org_id not in hierarchy.roots:
+        return children
+    return ([oid for oid in children if hierarchy.is_division(oid)]
+            + [oid for oid in children if not hierarchy.is_division(oid)])
+
+
+def _subtree_html(hierarchy: OrgHierarchy, root_id: int,
+                  rollup: RollupEngine, rollup_mode: str) -> str:
+    """루트 아래 전체 조직을 중첩 ul/li HTML로 변환 (깊이 제한 없음)
+
+    재귀 대신 명시적 스택으로 순회하므로 조직 수에 선형이다.
+    """
+    children = _ordered_children(hierarchy, root_id)
+    if not children:
+        return ""
+    parts = ["<ul>"]
+    # 스택 항목: 조직ID 또는 닫는 태그 문자열
+    stack: list[int | str] = ["</ul>", *reversed(children)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        parts.append("<li>" + _card_html(hierarchy.names[item], hierarchy.depth[item],
+                                         rollup.summary(item, rollup_mode)))
+        children = _ordered_children(hierarchy, item)
+        stack.append("</li>")
+        if children:
+            parts.append("<ul>")
+            stack.append("</ul>")
+            stack.extend(reversed(children))
+    return "".join(parts)
+
+
+def _render_tree_html(hierarchy: OrgHierarchy, rollup: RollupEngine,
+                      rollup_mode: str = "mean") -> str:
+    """조직 계층을 HTML로 변환 (ul/li 기반 표준 트리 패턴, 노드별 하위 포함 집계 표시)"""
     line_color = "#3B82F6"
     line_w = "2px"
     gap_h = "28px"  # 수직 연결선 높이
 
-    # Level 2 → Level 3 서브트리 생성
-    level2_items = []
-    for child in root["children"]:
-        l3_html = ""
-        if child["children"]:
-            l3_nodes = "".join(
-                f'<li><div class="card l3" style="background:{c3["bg"]};'
-                f'color:{c3["text"]};border-color:{c3["border"]};">'
-                f'{gc["name"]}</div></li>'
-                for gc in child["children"]
-            )
-            l3_html = f"<ul>{l3_nodes}</ul>"
-
-        level2_items.append(
-            f'<li><div class="card l2" style="background:{c2["bg"]};'
-            f'color:{c2["text"]};border-color:{c2["border"]};">'
-            f'{child["name"]}</div>{l3_html}</li>'
-        )
-
-    level2_html = "".join(level2_items)
+    trees = "".join(
+        _card_html(f"🏢 {hierarchy.names[root]}", 1, rollup.summary(root, rollup_mode))
+        + _subtree_html(hierarchy, root, rollup, rollup_mode)
+        for root in hierarchy.roots
+    )
 
     html = f"""
     <style>
@@ -103,6 +109,8 @@ def _render_tree_html(tree: dict) -> str:
                            letter-spacing:2px; }}
         .otree .card.l2 {{ padding:11px 22px; font-size:15px; }}
         .otree .card.l3 {{ padding:9px 18px;  font-size:13px; font-weight:600; }}
+        .otree .card .rollup {{ font-size:11px; font-weight:600; letter-spacing:0;
+                                opacity:.85; margin-top:3px; }}
 
         /* ── 트리 구조 (ul/li) ── */
         .otree ul {{
@@ -153,23 +161,20 @@ def _render_tree_html(tree: dict) -> str:
         .otree > .card {{ display:block; width:fit-content; margin:0 auto; }}
     </style>
 
-    <div class="otree">
-        <div class="card l1" style="background:{c1['bg']};color:{c1['text']};
-             border-color:{c1['border']};">🏢 {root['name']}</div>
-        <ul>{level2_html}</ul>
-    </div>
+    <div class="otree">{trees}</div>
     """
     return html
 
 
-def render(data: dict[str, pd.DataFrame]):
-    """조직도 탭 렌더링"""
-    org_df = filter_active_orgs(data["org"])
-    tree = _build_tree(org_df)
-    html = _render_tree_html(tree)
+@cached_by_version()
+@profiling.timed("html")
+def _prepare(data: dict[str, pd.DataFrame], rollup_mode: str = "mean") -> str:
+    """조직도 트리 HTML (데이터 버전·집계 방식별 1회 계산)"""
+    return _render_tree_html(get_dataset(data).hierarchy, get_rollup(data), rollup_mode)
 
-    # 범례를 트리 HTML에 합쳐서 st.html()로 한 번에 렌더링
-    legend = """
+
+# 레벨 색상 범례 (트리 HTML 뒤에 붙여 한 번에 렌더링)
+_LEGEND_HTML = """
     <div style="display:flex; justify-content:center; gap:24px; margin-top:8px; padding:12px 0;">
         <div style="display:flex; align-items:center; gap:6px;">
             <div style="width:16px; height:16px; background:#0047AB; border-radius:4px;"></div>
@@ -185,4 +190,17 @@ def render(data: dict[str, pd.DataFrame]):
         </div>
     </div>
     """
-    st.html(html + legend)
+
+
+def page_html(data: dict[str, pd.DataFrame], rollup_mode: str = "mean") -> str:
+    """조직도 트리 + 범례 HTML (탭과 export.py가 함께 사용)"""
+    return _prepare(data, rollup_mode) + _LEGEND_HTML
+
+
+def render(data: dict[str, pd.DataFrame]):
+    """조직도 탭 렌더링"""
+    # 집계 방식 선택은 KPI 추진현황 탭과 공유 (한쪽에서 바꾸면 다른 쪽도 따라감)
+    rollup_mode = rollup_mode_radio("org_rollup_mode", get_rollup(data).modes())
+    html = page_html(data, rollup_mode)
+    st.html(html)
+    payload.record(len(html.encode("utf-8")))
@@ -2,12 +2,47 @@
 월별 KPI 추이 탭
 - 조직별 YTD 달성률 꺾은선 그래프 + AI 추이 분석
 - 조직 표시 순서: kpi_view.py와 동일 (전사→본부→본부별 팀→CEO 직보)
+- 전년 데이터가 저장돼 있으면 전년 같은 KPI의 YTD 달성률을 겹쳐 볼 수 있음
 """
 
+import math
+from collections.abc import Iterator
+
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
-from utils.data_loader import filter_active_orgs, get_active_org_ids, get_active_kpi_ids
+from plotly.subplots import make_subplots
+from utils.cache import LRUCache, cached_by_version, content_key, register_cache
+from utils.shared_cache import shared_by_version
+from utils.dataset import KpiDataset, get_dataset
+from utils import history, payload, profiling
+
+# 차트 보기 방식
+CHART_MODES = {
+    "grid": "조직별 통합 차트",   # 조직당 Figure 1개 (make_subplots 그리드)
+    "single": "KPI별 개별 차트",  # KPI당 Figure 1개 (기존 방식)
+}
+
+# 통합 차트에서 점 개수가 이 값 이상이면 WebGL(Scattergl) 사용
+# 브라우저는 페이지당 WebGL 컨텍스트 수가 제한적(보통 16개)이라 작은 차트는 SVG 유지
+_WEBGL_MIN_POINTS = 2000
+
+# 통합 차트 한 행(KPI 3개)의 높이(px)와 행 사이 간격(px)
+_GRID_ROW_HEIGHT = 280
+_GRID_ROW_GAP = 70
+
+# 차트 Figure 캐시: 조각 내용 해시 → Figure (모든 세션/재실행 공유)
+# 데이터가 갱신돼도 값이 그대로인 KPI/조직의 차트는 다시 만들지 않는다.
+# Streamlit은 dict를 받으면 Figure로 재검증하므로 직렬화 결과 대신 Figure를 보관한다.
+# (값: (Figure, 직렬화한 스펙의 바이트 수) — 페이로드 계측용)
+FIGURE_CACHE = register_cache("pages.trend_view.FIGURE_CACHE", LRUCache(maxsize=1024))
+
+# 차트에 그려지는 컬럼 (캐시 키 계산 대상)
+_FIG_COLUMNS = ["월", "YTD달성률", "월 달성률"]
+_PRIOR_COLUMNS = ["월", "YTD달성률"]
+
+# 전년 YTD 달성률 선 색상
+_PRIOR_COLOR = "#9CA3AF"
 
 # KPI별 색상 팔레트
 _PALETTE = [
@@ -16,92 +51,133 @@ _PALETTE = [
 ]
 
 
-def _parse_rate(val) -> float | None:
-    """'110.72%' 같은 문자열을 float(110.72)로 변환"""
-    try:
-        return float(str(val).replace("%", "").strip())
-    except (ValueError, TypeError):
-        return None
-
-
 # ──────────────────────────────────────────
 # 추이 분석 (규칙 기반)
 # ──────────────────────────────────────────
 
-def _analyze_trend(org_data: pd.DataFrame) -> dict:
-    """조직의 월별 KPI 추이를 분석하여 결과 반환"""
-    kpi_names = org_data["KPI명"].unique()
-    latest_month = int(org_data["월"].max())
-
-    improving = []   # 개선 추세 KPI
-    worsening = []   # 악화 추세 KPI
-    alerts = []      # 주의 KPI
-
-    for kpi in kpi_names:
-        kd = org_data[org_data["KPI명"] == kpi].sort_values("월")
-        rates = kd["달성률"].tolist()
-        if len(rates) < 2:
-            continue
-
-        latest = rates[-1]
-        prev = rates[-2]
-        diff = latest - prev
-        first = rates[0]
-        overall_diff = latest - first
-
-        if diff > 0 and overall_diff > 0:
-            improving.append({"name": kpi, "latest": latest, "diff": diff})
-        elif diff < 0 and overall_diff < 0:
-            worsening.append({"name": kpi, "latest": latest, "diff": diff})
-
-        if latest < 90:
-            alerts.append({"name": kpi, "latest": latest})
-
-    # 정렬
-    improving.sort(key=lambda x: x["diff"], reverse=True)
-    worsening.sort(key=lambda x: x["diff"])
-
-    # 종합 요약
-    avg_latest = org_data[org_data["월"] == latest_month]["달성률"].mean()
-    if len(org_data["월"].unique()) >= 2:
-        prev_month = sorted(org_data["월"].unique())[-2]
-        avg_prev = org_data[org_data["월"] == prev_month]["달성률"].mean()
-        avg_diff = avg_latest - avg_prev
-        if avg_diff > 0:
-            trend_text = f"전월 대비 평균 +{avg_diff:.1f}%p 개선 추세입니다."
+def _kpi_trend_table(monthly: pd.DataFrame) -> pd.DataFrame:
+    """(조직, KPI)별 최신/전월/최초 YTD 달성률과 추세 플래그를 한 번에 계산
+
+    월 데이터가 2개 이상인 (조직, KPI)만 포함하며, 행 순서는 조직 안에서
+    KPI가 처음 나온 순서다.
+    """
+    df = monthly[["조직ID", "KPI명", "월", "YTD달성률"]]
+    # (조직, KPI) 그룹 번호 = 처음 나온 순서 → 그룹 번호, 월 순으로 정렬
+    gid = df.groupby(["조직ID", "KPI명"], sort=False, observed=True).ngroup()
+    df = df.assign(_gid=gid).sort_values(["_gid", "월"], kind="stable")
+
+    by_kpi = df.groupby("_gid", sort=False)["YTD달성률"]
+    df["prev"] = by_kpi.shift()
+    df["first"] = by_kpi.transform("first")
+    df["count"] = by_kpi.transform("size")
+
+    # 그룹의 마지막 행(최신 월)만 남김
+    is_last = df["_gid"].ne(df["_gid"].shift(-1))
+    table = df[is_last & (df["count"] >= 2)].rename(columns={"YTD달성률": "latest"})
+    table["diff"] = table["latest"] - table["prev"]
+    table["overall_diff"] = table["latest"] - table["first"]
+    table["improving"] = (table["diff"] > 0) & (table["overall_diff"] > 0)
+    table["worsening"] = (table["diff"] < 0) & (table["overall_diff"] < 0)
+    table["alert"] = table["latest"] < 90
+    return table.drop(columns=["월", "count"])
+
+
+def _org_trend_table(monthly: pd.DataFrame) -> pd.DataFrame:
+    """조직별 최신 월/직전 월 평균 YTD 달성률 (직전 월이 없으면 NaN)
+
+    최신 월은 조직마다 데이터가 있는 마지막 월이다.
+    """
+    month_avg = (monthly.groupby(["조직ID", "월"], observed=True)["YTD달성률"]
+                 .mean().sort_index(ascending=[True, False]))
+    rank = month_avg.groupby(level="조직ID").cumcount()
+    latest = month_avg[rank == 0].droplevel("월")
+    prev = month_avg[rank == 1].droplevel("월")
+    return pd.DataFrame({"avg_latest": latest, "avg_prev": prev})
+
+
+def _top_items(rows: pd.DataFrame, fields: list[str], n: int = 3
+               ) -> dict[int, list[dict]]:
+    """조직ID → rows 순서대로 앞에서 n개의 {"name", 필드...} 목록"""
+    rows = rows.groupby("조직ID", sort=False).head(n)
+    items: dict[int, list[dict]] = {}
+    for org_id, name, *values in zip(rows["조직ID"], rows["KPI명"],
+                                     *(rows[f] for f in fields)):
+        items.setdefault(org_id, []).append(
+            {"name": name, **dict(zip(fields, values))})
+    return items
+
+
+def _analyze_all_trends(monthly: pd.DataFrame) -> dict[int, dict]:
+    """전체 조직의 월별 KPI 추이를 한 번에 분석하여 {조직ID: 결과} 반환
+
+    YTD달성률이 있는 행만 넘겨야 한다. 결과 형태는 _analyze_trend와 같다.
+    """
+    if monthly.empty:
+        return {}
+    kpis = _kpi_trend_table(monthly)
+    orgs = _org_trend_table(monthly)
+
+    # 개선은 상승폭 큰 순, 악화는 하락폭 큰 순 (같으면 KPI가 나온 순서)
+    improving = _top_items(
+        kpis[kpis["improving"]].sort_values("diff", ascending=False, kind="stable"),
+        ["latest", "diff"])
+    worsening = _top_items(
+        kpis[kpis["worsening"]].sort_values("diff", kind="stable"),
+        ["latest", "diff"])
+    alerts = _top_items(kpis[kpis["alert"]], ["latest"])
+
+    results = {}
+    for org_id, avg_latest, avg_prev in zip(orgs.index, orgs["avg_latest"],
+                                            orgs["avg_prev"]):
+        org_improving = improving.get(org_id, [])
+        org_worsening = worsening.get(org_id, [])
+        org_alerts = alerts.get(org_id, [])
+
+        # 종합 요약
+        if pd.notna(avg_prev):
+            avg_diff = avg_latest - avg_prev
+            if avg_diff > 0:
+                trend_text = f"전월 대비 평균 +{avg_diff:.1f}%p 개선 추세입니다."
+            else:
+                trend_text = f"전월 대비 평균 {avg_diff:.1f}%p 하락 추세입니다."
         else:
-            trend_text = f"전월 대비 평균 {avg_diff:.1f}%p 하락 추세입니다."
-    else:
-        trend_text = "추이 비교를 위한 데이터가 부족합니다."
+            trend_text = "추이 비교를 위한 데이터가 부족합니다."
 
-    # 활동 제안
-    actions = []
-    for w in worsening[:2]:
-        actions.append(
-            f"'{w['name']}' 연속 하락 중 ({w['diff']:+.1f}%p) — 원인 분석 필요"
-        )
-    for a in alerts[:2]:
-        if not any(a["name"] in act for act in actions):
+        # 활동 제안
+        actions = []
+        for w in org_worsening[:2]:
             actions.append(
-                f"'{a['name']}' {a['latest']:.1f}% — 목표 대비 크게 미달"
+                f"'{w['name']}' 연속 하락 중 ({w['diff']:+.1f}%p) — 원인 분석 필요"
             )
-    if improving and not actions:
-        actions.append("전반적으로 개선 추세이나 지속 모니터링 필요")
-    if not actions:
-        actions.append("안정적 추세 유지 중 — 현행 유지 권장")
-
-    return {
-        "summary": trend_text,
-        "avg_rate": round(avg_latest, 1),
-        "improving": improving[:3],
-        "worsening": worsening[:3],
-        "alerts": alerts[:3],
-        "actions": actions,
-    }
-
-
-def _render_trend_ai_box(analysis: dict):
-    """추이 분석 AI 박스 렌더링 (kpi_view 스타일 동일)"""
+        for a in org_alerts[:2]:
+            if not any(a["name"] in act for act in actions):
+                actions.append(
+                    f"'{a['name']}' {a['latest']:.1f}% — 목표 대비 크게 미달"
+                )
+        if org_improving and not actions:
+            actions.append("전반적으로 개선 추세이나 지속 모니터링 필요")
+        if not actions:
+            actions.append("안정적 추세 유지 중 — 현행 유지 권장")
+
+        results[int(org_id)] = {
+            "summary": trend_text,
+            "avg_rate": round(avg_latest, 1),
+            "improving": org_improving,
+            "worsening": org_worsening,
+            "alerts": org_alerts,
+            "actions": actions,
+        }
+    return results
+
+
+def _analyze_trend(org_data: pd.DataFrame) -> dict:
+    """조직의 월별 KPI 추이를 분석하여 결과 반환 (여러 조직은 _analyze_all_trends 사용)"""
+    (result,) = _analyze_all_trends(org_data.assign(조직ID=0)).values()
+    return result
+
+
+def _trend_ai_box_html(analysis: dict) -> str:
+    """추이 분석 AI 박스 HTML (kpi_view 스타일 동일)"""
     summary = analysis["summary"]
     avg_rate = analysis["avg_rate"]
     improving = analysis["improving"]
@@ -171,16 +247,33 @@ def _render_trend_ai_box(analysis: dict):
 </div>
 <div style="margin-top:12px; font-size:10px; color:#999999; font-style:italic;">* 규칙 기반 자동 생성 (LLM API 미사용)</div>
 </div>"""
-    st.markdown(box_html, unsafe_allow_html=True)
+    return box_html
 
 
 # ──────────────────────────────────────────
 # 조직별 섹션 렌더링
 # ──────────────────────────────────────────
 
+def _prior_trace(prior: pd.DataFrame, scatter=go.Scatter, showlegend: bool = True,
+                 **refs) -> go.Scatter:
+    """전년 같은 KPI의 YTD 달성률 꺾은선 (회색 점선, 값 표시 없음)"""
+    return scatter(
+        x=prior["월"],
+        y=prior["YTD달성률"],
+        mode="lines",
+        line=dict(color=_PRIOR_COLOR, width=2, dash="dash"),
+        name="전년 YTD", legendgroup="prior", showlegend=showlegend,
+        hovertemplate="전년 %{x}월: %{y:.1f}%<extra></extra>",
+        **refs,
+    )
+
+
 def _make_kpi_fig(kpi_name: str, kpi_data: pd.DataFrame, color: str,
-                  y_min: float, y_max: float):
-    """KPI 1개의 소형 꺾은선 그래프 생성 (Y축 범위 통일, 영역 색상)"""
+                  y_min: float, y_max: float, prior: pd.DataFrame | None = None):
+    """KPI 1개의 소형 꺾은선 그래프 생성 (Y축 범위 통일, 영역 색상)
+
+    prior(전년 같은 KPI의 월별 행)를 주면 전년 YTD 달성률을 점선으로 함께 그린다.
+    """
     fig = go.Figure()
 
     # 배경 영역: 100% 이상 → 아쿠아블루 (연한 청록)
@@ -194,15 +287,18 @@ def _make_kpi_fig(kpi_name: str, kpi_data: pd.DataFrame, color: str,
         fillcolor="rgba(239,68,68,0.08)", line_width=0,
     )
 
+    if prior is not None:
+        fig.add_trace(_prior_trace(prior))
+
     # 꺾은선 1: YTD 달성률 (진한 파랑)
     ytd_color = "#0047AB"
     fig.add_trace(go.Scatter(
         x=kpi_data["월"],
-        y=kpi_data["달성률"],
+        y=kpi_data["YTD달성률"],
         mode="lines+markers+text",
         line=dict(color=ytd_color, width=2.5),
         marker=dict(size=6, color=ytd_color),
-        text=[f"{v:.1f}" for v in kpi_data["달성률"]],
+        text=[f"{v:.1f}" for v in kpi_data["YTD달성률"]],
         textposition="top center",
         textfont=dict(size=9, color=ytd_color),
         name="YTD 달성률",
@@ -211,7 +307,7 @@ def _make_kpi_fig(kpi_name: str, kpi_data: pd.DataFrame, color: str,
 
     # 꺾은선 2: 월 달성률 (주황색)
     monthly_color = "#F5A623"
-    monthly_rates = kpi_data["월달성률"].dropna()
+    monthly_rates = kpi_data["월 달성률"].dropna()
     if not monthly_rates.empty:
         fig.add_trace(go.Scatter(
             x=kpi_data.loc[monthly_rates.index, "월"],
@@ -261,22 +357,173 @@ def _make_kpi_fig(kpi_name: str, kpi_data: pd.DataFrame, color: str,
     return fig
 
 
-def _render_org_chart(org_name: str, org_id: int, level: int,
-                      monthly_df: pd.DataFrame, y_min: float, y_max: float):
-    """한 조직의 KPI별 개별 차트 + AI 분석"""
-    org_data = monthly_df[monthly_df["조직ID"] == org_id].copy()
-    if org_data.empty:
-        return
+def _make_org_fig(kpi_slices: list[tuple[str, pd.DataFrame]],
+                  y_min: float, y_max: float,
+                  priors: list[pd.DataFrame | None] | None = None) -> go.Figure:
+    """한 조직의 모든 KPI를 3열 subplot 그리드 Figure 1개로 생성
+
+    KPI별 개별 차트와 같은 Y축 범위, 100% 기준 배경 영역, 두 꺾은선을 그린다.
+    범례는 첫 번째 subplot 기준으로 한 번만 표시한다.
+    priors(kpi_slices와 같은 순서의 전년 행, 없으면 None)를 주면 전년 선을 함께 그린다.
+    """
+    n_rows = math.ceil(len(kpi_slices) / 3)
+    height = _GRID_ROW_HEIGHT * n_rows
+    fig = make_subplots(
+        rows=n_rows, cols=3,
+        subplot_titles=[name for name, _ in kpi_slices],
+        horizontal_spacing=0.05,
+        vertical_spacing=_GRID_ROW_GAP / height if n_rows > 1 else 0,
+    )
 
-    org_data["달성률"] = org_data["YTD달성률"].apply(_parse_rate)
-    org_data["월달성률"] = org_data["월 달성률"].apply(_parse_rate)
-    org_data = org_data.dropna(subset=["달성률"])
-    if org_data.empty:
-        return
+    n_points = sum(len(kpi_data) * 2 for _, kpi_data in kpi_slices)
+    scatter = go.Scattergl if n_points >= _WEBGL_MIN_POINTS else go.Scatter
 
-    kpi_list = org_data["KPI명"].unique()
+    # trace/shape를 subplot마다 add_trace/add_hrect로 넣으면 매번 전체 레이아웃을
+    # 다시 검사해서 조직당 1초 가까이 걸리므로, 축 참조를 직접 지정해 한 번에 넣는다.
+    ytd_color = "#0047AB"
+    monthly_color = "#F5A623"
+    traces = []
+    shapes = []
+    shown_prior = False
+    for idx, (_, kpi_data) in enumerate(kpi_slices):
+        axis = "" if idx == 0 else str(idx + 1)
+        refs = dict(xaxis=f"x{axis}", yaxis=f"y{axis}")
+        first = idx == 0
+        prior = priors[idx] if priors else None
+        if prior is not None:
+            traces.append(_prior_trace(prior, scatter, not shown_prior, **refs))
+            shown_prior = True
+        traces.append(scatter(
+            x=kpi_data["월"],
+            y=kpi_data["YTD달성률"],
+            mode="lines+markers+text",
+            line=dict(color=ytd_color, width=2.5),
+            marker=dict(size=6, color=ytd_color),
+            text=[f"{v:.1f}" for v in kpi_data["YTD달성률"]],
+            textposition="top center",
+            textfont=dict(size=9, color=ytd_color),
+            name="YTD 달성률", legendgroup="ytd", showlegend=first,
+            hovertemplate="%{x}월: %{y:.1f}%<extra></extra>",
+            **refs,
+        ))
 
-    # 레벨별 헤더 스타일
+        monthly_rates = kpi_data["월 달성률"].dropna()
+        if not monthly_rates.empty:
+            traces.append(scatter(
+                x=kpi_data.loc[monthly_rates.index, "월"],
+                y=monthly_rates,
+                mode="lines+markers+text",
+                line=dict(color=monthly_color, width=2),
+                marker=dict(size=5, color=monthly_color),
+                text=[f"{v:.1f}" for v in monthly_rates],
+                textposition="bottom center",
+                textfont=dict(size=8, color=monthly_color),
+                name="월 달성률", legendgroup="monthly", showlegend=first,
+                hovertemplate="%{x}월: %{y:.1f}%<extra></extra>",
+                **refs,
+            ))
+
+        # 배경 영역 (100% 이상 아쿠아블루 / 미만 연한 붉은색) + 100% 기준선
+        span = dict(type="rect", xref=f"x{axis} domain", yref=f"y{axis}",
+                    x0=0, x1=1, line_width=0)
+        shapes += [
+            dict(span, y0=100, y1=y_max, fillcolor="rgba(0,188,212,0.10)"),
+            dict(span, y0=y_min, y1=100, fillcolor="rgba(239,68,68,0.08)"),
+            dict(type="line", xref=f"x{axis} domain", yref=f"y{axis}",
+                 x0=0, x1=1, y0=100, y1=100,
+                 line=dict(dash="dot", color="#D1D5DB", width=1)),
+        ]
+
+    fig.add_traces(traces)
+    fig.update_layout(shapes=shapes)
+
+    fig.update_xaxes(
+        tickmode="array",
+        tickvals=list(range(1, 13)),
+        ticktext=[f"{m}" for m in range(1, 13)],
+        gridcolor="#E0E8F9",
+        range=[0.5, 12.5],
+        tickfont=dict(size=10),
+    )
+    fig.update_yaxes(gridcolor="#E0E8F9", tickfont=dict(size=10), range=[y_min, y_max])
+    fig.update_annotations(
+        font=dict(size=13, color="#1E3A8A", family="Noto Sans KR, sans-serif"),
+    )
+    fig.update_layout(
+        height=height + 40,
+        margin=dict(l=10, r=10, t=56, b=24),
+        plot_bgcolor="#FAFBFF",
+        paper_bgcolor="rgba(0,0,0,0)",
+        showlegend=True,
+        legend=dict(
+            orientation="h", yanchor="bottom", y=1.0, yref="container",
+            xanchor="right", x=1,
+            font=dict(size=9), bgcolor="rgba(0,0,0,0)",
+        ),
+        font=dict(family="Noto Sans KR, sans-serif"),
+    )
+    return fig
+
+
+def _cached_fig(key: tuple, build) -> go.Figure:
+    """FIGURE_CACHE에서 key로 Figure 조회, 없으면 build()로 만들어 저장
+
+    반환된 Figure는 공유 객체이므로 수정하면 안 된다.
+    """
+    fig = FIGURE_CACHE.get(key)
+    if fig is None:
+        with profiling.span("figure"):
+            fig = build()
+        FIGURE_CACHE.put(key, fig)
+    return fig
+
+
+def _prior_key(priors: list[pd.DataFrame | None]) -> tuple:
+    """전년 조각들의 캐시 키 부분 (없는 조각은 None)"""
+    return tuple(None if prior is None else content_key(prior[_PRIOR_COLUMNS])
+                 for prior in priors)
+
+
+def _kpi_fig(kpi_name: str, kpi_data: pd.DataFrame, color: str,
+             y_min: float, y_max: float,
+             prior: pd.DataFrame | None = None) -> go.Figure:
+    """캐시를 거치는 _make_kpi_fig"""
+    key = ("kpi", kpi_name, content_key(kpi_data[_FIG_COLUMNS]), color, y_min, y_max,
+           _prior_key([prior]))
+    return _cached_fig(
+        key, lambda: _make_kpi_fig(kpi_name, kpi_data, color, y_min, y_max, prior))
+
+
+def _org_fig(kpi_slices: list[tuple[str, pd.DataFrame]],
+             y_min: float, y_max: float,
+             priors: list[pd.DataFrame | None] | None = None) -> go.Figure:
+    """캐시를 거치는 _make_org_fig"""
+    key = ("org", tuple(name for name, _ in kpi_slices),
+           content_key(*(kpi_data[_FIG_COLUMNS] for _, kpi_data in kpi_slices)),
+           y_min, y_max, _prior_key(priors or []))
+    return _cached_fig(key, lambda: _make_org_fig(kpi_slices, y_min, y_max, priors))
+
+
+def _org_kpi_slices(dataset: KpiDataset, org_id: int, prior: KpiDataset | None = None
+                    ) -> tuple[list[tuple[str, pd.DataFrame]], list[pd.DataFrame | None] | None]:
+    """조직의 KPI별 월별 조각 (KPI명, 행)과 같은 순서의 전년 조각 (prior가 없으면 None)
+
+    (조직ID, KPI_ID) 인덱스로 조회하고, YTD 달성률이 있는 KPI만 남긴다.
+    """
+    kpi_slices = []
+    priors = [] if prior is not None else None
+    for kpi_id in dataset.org_kpi_ids(org_id):
+        kpi_data = dataset.org_kpi(org_id, kpi_id).dropna(subset=["YTD달성률"])
+        if not kpi_data.empty:
+            kpi_slices.append((kpi_data["KPI명"].iloc[0], kpi_data))
+            if prior is not None:
+                past = prior.org_kpi(org_id, kpi_id).dropna(subset=["YTD달성률"])
+                priors.append(past if not past.empty else None)
+    return kpi_slices, priors
+
+
+def _org_header_html(org_name: str, level: int) -> str:
+    """조직 차트 섹션 헤더 (레벨별 색·글자 크기·아이콘)"""
     if level == 1:
         bg = "linear-gradient(90deg,#0047AB,#1E3A8A)"
         font_size = "18px"
@@ -290,89 +537,135 @@ def _render_org_chart(org_name: str, org_id: int, level: int,
         font_size = "15px"
         icon = "👥"
 
-    # 헤더
-    st.markdown(
+    return (
         f'<div style="margin-top:28px; margin-bottom:12px; padding:12px 20px;'
         f' background:{bg}; border-radius:10px; color:white; font-weight:900;'
         f' font-size:{font_size}; display:flex; align-items:baseline;'
         f' font-family:\'Noto Sans KR\',sans-serif;">'
-        f'{icon} {org_name}</div>',
-        unsafe_allow_html=True,
+        f'{icon} {org_name}</div>'
     )
 
-    # 그래프 3열 그리드
-    for i in range(0, len(kpi_list), 3):
-        cols = st.columns(3)
-        for j, col in enumerate(cols):
-            idx = i + j
-            if idx < len(kpi_list):
-                kpi_name = kpi_list[idx]
-                kpi_data = org_data[org_data["KPI명"] == kpi_name].sort_values("월")
-                color = _PALETTE[idx % len(_PALETTE)]
+
+def section_figures(section: dict, mode: str = "grid") -> list[go.Figure]:
+    """조직 섹션의 Figure 목록 (mode: grid=통합 차트 1개, single=KPI별 개별 차트)
+
+    Figure는 캐시에 공유되는 객체이므로 수정하면 안 된다.
+    """
+    kpi_slices, priors = section["kpi_slices"], section["priors"]
+    y_min, y_max = section["y_min"], section["y_max"]
+    if mode == "grid":
+        return [_org_fig(kpi_slices, y_min, y_max, priors)]
+    return [
+        _kpi_fig(kpi_name, kpi_data, _PALETTE[idx % len(_PALETTE)], y_min, y_max,
+                 priors[idx] if priors else None)
+        for idx, (kpi_name, kpi_data) in enumerate(kpi_slices)
+    ]
+
+
+def _render_section(section: dict, mode: str = "grid"):
+    """한 조직의 헤더 + KPI 차트 + AI 분석 (single이면 KPI별 차트를 st.columns 3열로 배치)"""
+    payload.markdown(section["header_html"])
+    figures = section_figures(section, mode)
+    if mode == "grid":
+        payload.plotly_chart(figures[0], width="stretch")
+    else:
+        for i in range(0, len(figures), 3):
+            for col, fig in zip(st.columns(3), figures[i:i + 3]):
                 with col:
-                    st.plotly_chart(
-                        _make_kpi_fig(kpi_name, kpi_data, color, y_min, y_max),
-                        width="stretch",
-                    )
+                    payload.plotly_chart(fig, width="stretch")
 
     # AI 성과해석 박스 (그래프 아래)
-    analysis = _analyze_trend(org_data)
-    _render_trend_ai_box(analysis)
+    payload.markdown(section["ai_html"])
 
 
 # ──────────────────────────────────────────
-# 조직 순서
+# 탭 렌더링 (조직 순서는 dataset.hierarchy.report_order)
 # ──────────────────────────────────────────
 
-def _ordered_orgs(org_df: pd.DataFrame) -> list[tuple[str, int, int]]:
-    """kpi_view.py와 동일한 순서로 (조직명, 조직ID, level) 리스트 반환"""
-    result: list[tuple[str, int, int]] = []
+@cached_by_version()
+@shared_by_version("trend_view.analysis")
+@profiling.timed("analysis")
+def _prepare(data: dict[str, pd.DataFrame]) -> tuple[float, float, dict[int, dict]]:
+    """공통 Y축 범위와 조직별 추이 분석 (데이터 버전별 1회 계산)"""
+    dataset = get_dataset(data)
+    monthly_df = dataset.monthly
+
+    # 전체 데이터에서 Y축 범위 계산 (YTD + 월 달성률 모두 포함)
+    all_ytd = monthly_df["YTD달성률"].dropna()
+    all_monthly = monthly_df["월 달성률"].dropna()
+    all_rates = pd.concat([all_ytd, all_monthly])
+    rate_min = all_rates.min()
+    rate_max = all_rates.max()
+    margin = (rate_max - rate_min) * 0.08
+    y_min = rate_min - margin
+    y_max = rate_max + margin
+
+    analyses = _analyze_all_trends(monthly_df.dropna(subset=["YTD달성률"]))
+    return y_min, y_max, analyses
 
-    # Level 1
-    for _, r in org_df[org_df["Level"] == 1].sort_values("조직ID").iterrows():
-        result.append((r["조직명"], int(r["조직ID"]), 1))
 
-    # Level 2 분류
-    l2 = org_df[org_df["Level"] == 2].sort_values("조직ID")
-    bonbu = l2[l2["조직명"].str.contains("본부")]
-    jikbo = l2[l2["조직명"].str.contains("팀")]
+def has_prior_year(data: dict[str, pd.DataFrame]) -> bool:
+    """전년 데이터가 스냅샷에 저장돼 있는지 (읽지는 않음)"""
+    year = get_dataset(data).year
+    return year is not None and year - 1 in history.available_years(data)
 
-    # 본부들
-    for _, r in bonbu.iterrows():
-        result.append((r["조직명"], int(r["조직ID"]), 2))
 
-    # 본부별 소속 팀
-    for _, r in bonbu.iterrows():
-        l3 = org_df[org_df["ParentID"] == int(r["조직ID"])].sort_values("조직ID")
-        for _, t in l3.iterrows():
-            result.append((t["조직명"], int(t["조직ID"]), 3))
+def prior_year_data(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame] | None:
+    """전년 시트 딕셔너리 (저장된 적 없으면 None)"""
+    year = get_dataset(data).year
+    return history.year_data(data, year - 1) if year is not None else None
 
-    # CEO 직보
-    for _, r in jikbo.iterrows():
-        result.append((r["조직명"], int(r["조직ID"]), 2))
 
-    return result
+def org_sections(data: dict[str, pd.DataFrame],
+                 prior_data: dict[str, pd.DataFrame] | None = None) -> Iterator[dict]:
+    """차트를 그릴 조직 섹션을 화면 순서(report_order)대로 (탭과 export.py가 함께 사용)
+
+    prior_data(전년 시트)를 주면 같은 조직·KPI_ID의 전년 조각을 붙이고, Y축 범위도 전년까지 포함한다.
+
+    Yields:
+        {"org_id", "header_html", "ai_html", "kpi_slices", "priors", "y_min", "y_max"}
+    """
+    dataset = get_dataset(data)
+    y_min, y_max, analyses = _prepare(data)
+    prior = None
+    if prior_data is not None:
+        prior = get_dataset(prior_data)
+        prior_min, prior_max, _ = _prepare(prior_data)
+        y_min, y_max = min(y_min, prior_min), max(y_max, prior_max)
+
+    for org_name, org_id, level in dataset.hierarchy.report_order():
+        kpi_slices, priors = _org_kpi_slices(dataset, org_id, prior)
+        if not kpi_slices:
+            continue
+        yield {
+            "org_id": org_id,
+            "header_html": _org_header_html(org_name, level),
+            "ai_html": _trend_ai_box_html(analyses[org_id]),
+            "kpi_slices": kpi_slices,
+            "priors": priors,
+            "y_min": y_min,
+            "y_max": y_max,
+        }
 
 
 def render(data: dict[str, pd.DataFrame]):
     """월별 KPI 추이 탭 렌더링"""
-    org_df = filter_active_orgs(data["org"])
-    active_ids = get_active_org_ids(data["org"])
-    active_kpis = get_active_kpi_ids(data["kpi"])
-    monthly_df = data["monthly"][
-        data["monthly"]["조직ID"].isin(active_ids)
-        & data["monthly"]["KPI_ID"].isin(active_kpis)
-    ].copy()
+    dataset = get_dataset(data)
 
-    # 전체 데이터에서 Y축 범위 계산 (YTD + 월 달성률 모두 포함)
-    all_ytd = monthly_df["YTD달성률"].apply(_parse_rate).dropna()
-    all_monthly = monthly_df["월 달성률"].apply(_parse_rate).dropna()
-    all_rates = pd.concat([all_ytd, all_monthly])
-    rate_min = all_rates.min()
-    rate_max = all_rates.max()
-    margin = (rate_max - rate_min) * 0.08
-    y_min = rate_min - margin
-    y_max = rate_max + margin
+    mode_col, yoy_col = st.columns([2, 1])
+    with mode_col:
+        mode = st.radio(
+            "차트 보기", list(CHART_MODES), format_func=CHART_MODES.get,
+            horizontal=True, key="trend_chart_mode",
+        )
+
+    # 전년 비교: 전년 데이터가 저장돼 있을 때만 표시하고, 켰을 때만 전년 파일을 읽음
+    prior_data = None
+    if has_prior_year(data):
+        with yoy_col:
+            yoy = st.toggle(f"{dataset.year - 1}년 YTD 함께 보기", key="trend_yoy")
+        if yoy:
+            prior_data = prior_year_data(data)
 
-    for org_name, org_id, level in _ordered_orgs(org_df):
-        _render_org_chart(org_name, org_id, level, monthly_df, y_min, y_max)
+    for section in org_sections(data, prior_data):
+        _render_section(section, mode)
@@ -0,0 +1,106 @@
+"""
+활성 필터 테스트: get_active_data가 해지일 기준으로 조직/KPI/월별 실적을 거르고, 데이터 버전·날짜별로 1번만 계산하는지 확인
+- 해지일이 비었거나 읽을 수 없으면 활성, 오늘 해지는 활성, 어제 해지는 폐지
+- python test_active_filter.py 또는 pytest로 실행
+"""
+
+from datetime import date, timedelta
+
+import pandas as pd
+
+from utils import cache, data_loader
+from utils.data_loader import get_active_data, get_active_org_ids
+
+TODAY = date.today()
+YESTERDAY = (TODAY - timedelta(days=1)).isoformat()
+
+
+def _sheets() -> dict[str, pd.DataFrame]:
+    org = pd.DataFrame({
+        "조직ID": [1, 2, 3, 4],
+        "조직명": ["전사", "영업팀", "폐지팀", "생산팀"],
+        "해지일": [None, "", YESTERDAY, "미정"],
+    })
+    kpi = pd.DataFrame({
+        "KPI_ID": ["K1", "K2", "K3", "K4"],
+        "조직ID": [2, 2, 3, 4],
+        "해지일": [None, YESTERDAY, None, TODAY.isoformat()],
+    })
+    monthly = pd.DataFrame({
+        "조직ID": [2, 2, 3, 4, 4],
+        "KPI_ID": ["K1", "K2", "K3", "K4", "K4"],
+        "월": [1, 1, 1, 1, 2],
+        "월실적": [10.0, 20.0, 30.0, 40.0, 50.0],
+    })
+    return {"org": org, "kpi": kpi, "monthly": monthly, "kpi_type": pd.DataFrame({"유형": ["A"]})}
+
+
+def _fixed_today(day: date):
+    """utils.cache/utils.data_loader의 date.today()를 day로 고정 (원래 값은 _restore_today())"""
+    class _Date(date):
+        @classmethod
+        def today(cls):
+            return day
+
+    cache.date = data_loader.date = _Date
+
+
+def _restore_today():
+    cache.date = data_loader.date = date
+
+
+def test_inactive_rows_are_dropped():
+    data = _sheets()
+    active = get_active_data(data)
+    assert active["org"]["조직ID"].tolist() == [1, 2, 4]
+    assert set(active["org"]["조직ID"]) == get_active_org_ids(data["org"])
+    assert active["kpi"]["KPI_ID"].tolist() == ["K1", "K3", "K4"]
+    # 월별 실적은 활성 조직이면서 활성 KPI인 행만 (K2는 KPI 폐지, K3은 조직 폐지)
+    assert active["monthly"]["KPI_ID"].tolist() == ["K1", "K4", "K4"]
+    assert active["kpi_type"] is data["kpi_type"]
+
+
+def test_computed_once_per_version():
+    get_active_data.cache.clear()
+    data = _sheets()
+    first = get_active_data(data)
+    assert get_active_data(data) is first
+
+    # 내용이 같은 새 딕셔너리(재로드)도 같은 버전이라 다시 계산하지 않음
+    assert get_active_data(_sheets()) is first
+    assert get_active_data.cache.stats()["hits"] == 2
+    assert get_active_data.cache.stats()["misses"] == 1
+
+    # 내용이 바뀌면 새 버전으로 다시 계산
+    changed = _sheets()
+    changed["org"] = changed["org"].assign(해지일=None)
+    second = get_active_data(changed)
+    assert second is not first and 3 in second["org"]["조직ID"].tolist()
+    assert get_active_data.cache.stats()["misses"] == 2
+
+
+def test_recomputed_when_the_day_changes():
+    get_active_data.cache.clear()
+    data = _sheets()
+    today = get_active_data(data)
+    assert "K4" in today["kpi"]["KPI_ID"].tolist()
+    _fixed_today(TODAY + timedelta(days=1))
+    try:
+        tomorrow = get_active_data(data)
+    finally:
+        _restore_today()
+    # 오늘 해지되는 K4는 내일부터 폐지 (같은 데이터 버전이어도 날짜가 바뀌면 다시 계산)
+    assert tomorrow is not today
+    assert tomorrow["kpi"]["KPI_ID"].tolist() == ["K1", "K3"]
+    assert get_active_data(data) is today
+
+
+def main():
+    test_inactive_rows_are_dropped()
+    test_computed_once_per_version()
+    test_recomputed_when_the_day_changes()
+    print("\n통과: 활성 필터 (해지일 기준, 데이터 버전·날짜별 1회 계산)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+동시 로드 테스트: load_all_data가 4개 시트를 동시에 받고, 한 시트라도 실패하면 예외를 그대로 전달하는지 확인
+- 로컬 HTTP 스텁 서버가 시트별로 정상/오류(500)/지연 응답 (gviz CSV export 흉내)
+- 직접 만든 세션은 실패해도 닫고, 넘겨받은 세션은 닫지 않음
+- python test_concurrent_load.py 또는 pytest로 실행
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from utils import data_loader
+from utils.data_loader import SHEET_NAMES, load_all_data
+
+RESPONSE_DELAY = 0.3  # 초
+
+_CSV = "조직ID,조직명,Level,ParentID\n1001,전사,1,\n2001,본부A,2,1001\n"
+
+_NEW_SESSION = data_loader.new_session
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """시트 이름별로 server.behavior에 따라 응답 ("ok" | "error" | "slow")"""
+
+    def do_GET(self):
+        sheet = parse_qs(urlparse(self.path).query)["sheet"][0]
+        behavior = self.server.behavior.get(sheet, "ok")
+        with self.server.lock:
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        try:
+            time.sleep(RESPONSE_DELAY * (4 if behavior == "slow" else 1))
+            if behavior == "error":
+                self.send_error(500)
+                return
+            body = _CSV.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub(behavior: dict[str, str] | None = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.behavior = behavior or {}
+    server.lock = threading.Lock()
+    server.active = server.max_active = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _TrackedSession(requests.Session):
+    """close() 호출 여부를 기록하는 세션"""
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def _track_new_session() -> list[_TrackedSession]:
+    """data_loader.new_session이 만든 세션 목록 (원래 함수는 _restore()로 되돌림)"""
+    created = []
+
+    def tracked(pool_size: int = len(SHEET_NAMES)) -> _TrackedSession:
+        session = _TrackedSession()
+        created.append(session)
+        return session
+
+    data_loader.new_session = tracked
+    return created
+
+
+def _restore():
+    data_loader.new_session = _NEW_SESSION
+
+
+def test_sheets_are_fetched_concurrently():
+    server = _start_stub()
+    created = _track_new_session()
+    try:
+        data = load_all_data(base_url=f"http://127.0.0.1:{server.server_port}")
+    finally:
+        _restore()
+        server.shutdown()
+    assert set(data) == set(SHEET_NAMES)
+    # 응답을 늦춰도 4개 요청이 한꺼번에 서버에 도착 (순차면 최대 1개)
+    assert server.max_active == len(SHEET_NAMES), f"동시 요청 최대 {server.max_active}개"
+    assert len(created) == 1 and created[0].closed
+
+
+def test_failed_sheet_raises_and_closes_own_session():
+    server = _start_stub({"KPI_Master": "error"})
+    created = _track_new_session()
+    try:
+        load_all_data(base_url=f"http://127.0.0.1:{server.server_port}")
+    except requests.HTTPError as e:
+        assert e.response.status_code == 500 and "KPI_Master" in e.response.url
+    else:
+        raise AssertionError("실패한 시트가 있는데 예외 없이 반환됨")
+    finally:
+        _restore()
+        server.shutdown()
+    assert len(created) == 1 and created[0].closed
+
+
+def test_timeout_is_per_sheet_and_caller_session_stays_open():
+    server = _start_stub({"KPI_Monthly_Data": "slow"})
+    session = _TrackedSession()
+    try:
+        load_all_data(session=session, timeout=RESPONSE_DELAY * 2,
+                      base_url=f"http://127.0.0.1:{server.server_port}")
+    except requests.Timeout:
+        pass
+    else:
+        raise AssertionError("시트 타임아웃이 전달되지 않음")
+    finally:
+        server.shutdown()
+    assert not session.closed
+    session.close()
+
+
+def main():
+    test_sheets_are_fetched_concurrently()
+    test_failed_sheet_raises_and_closes_own_session()
+    test_timeout_is_per_sheet_and_caller_session_stays_open()
+    print("\n통과: 동시 로드 (4개 시트 동시 요청, 실패·타임아웃은 예외 전달, 세션 정리)")
+
+
+if __name__ == "__main__":
+    main()
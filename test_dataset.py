@@ -0,0 +1,82 @@
+"""
+데이터셋 테스트: KpiDataset의 인덱스 조회가 활성 시트를 직접 마스킹한 결과와 같고, 데이터 버전별로 1번만 만드는지 확인
+- 합성 데이터 2개년 (폐지 조직/KPI 포함) → 마지막 연도만 사용
+- python test_dataset.py 또는 pytest로 실행
+"""
+
+import pandas as pd
+
+from utils.data_loader import get_active_data, normalize_data
+from utils.dataset import get_dataset
+from utils.synthetic import generate
+
+# 앱과 같은 pandas 설정 (KpiDataset이 시트를 freeze()하므로 Copy-on-Write 필요)
+pd.set_option("mode.copy_on_write", True)
+
+
+def _data() -> dict[str, pd.DataFrame]:
+    return normalize_data(generate(n_orgs=15, kpis_per_org=4, years=2, latest_month=5,
+                                   inactive_ratio=0.2, seed=3))
+
+
+def _same_rows(got: pd.DataFrame, expected: pd.DataFrame):
+    pd.testing.assert_frame_equal(got.sort_index(), expected.sort_index())
+
+
+def test_lookups_match_masks():
+    data = _data()
+    dataset = get_dataset(data)
+    active = get_active_data(data)["monthly"]
+    year = int(active["연도"].max())
+    monthly = active[active["연도"] == year]
+
+    assert dataset.year == year and dataset.latest_month == 5
+    _same_rows(dataset.monthly, monthly)
+    assert set(dataset.org["조직ID"]) == set(dataset.hierarchy.order) | set(dataset.hierarchy.orphans)
+
+    _same_rows(dataset.month_rows(), monthly[monthly["월"] == 5])
+    _same_rows(dataset.month_rows(2), monthly[monthly["월"] == 2])
+    for org_id in dataset.hierarchy.order:
+        org = monthly[monthly["조직ID"] == org_id]
+        _same_rows(dataset.org_rows(org_id), org)
+        _same_rows(dataset.org_month(org_id), org[org["월"] == 5])
+        assert dataset.org_kpi_ids(org_id) == list(dict.fromkeys(org["KPI_ID"]))
+        for kpi_id in dataset.org_kpi_ids(org_id):
+            rows = dataset.org_kpi(org_id, kpi_id)
+            assert rows["월"].is_monotonic_increasing
+            _same_rows(rows, org[org["KPI_ID"] == kpi_id])
+
+
+def test_missing_keys_give_empty_slices():
+    dataset = get_dataset(_data())
+    assert dataset.org_rows(-1).empty and dataset.org_month(-1).empty
+    assert dataset.month_rows(12).empty and dataset.org_kpi_ids(-1) == []
+    assert list(dataset.org_rows(-1).columns) == list(dataset.monthly.columns)
+
+
+def test_built_once_per_version_and_read_only():
+    get_dataset.cache.clear()
+    dataset = get_dataset(_data())
+    assert get_dataset(_data()) is dataset  # 같은 내용을 다시 읽어도 재사용
+    assert get_dataset.cache.stats()["misses"] == 1
+
+    try:
+        dataset.monthly.loc[dataset.monthly.index[0], "월실적"] = 0.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("공유 데이터셋이 제자리 수정됨")
+    # 조각은 새 DataFrame이라 자유롭게 바꿀 수 있음
+    rows = dataset.org_rows(dataset.hierarchy.order[0])
+    rows.loc[rows.index[0], "월실적"] = 0.0
+
+
+def main():
+    test_lookups_match_masks()
+    test_missing_keys_give_empty_slices()
+    test_built_once_per_version_and_read_only()
+    print("\n통과: 데이터셋 (인덱스 조회 = 마스킹 결과, 데이터 버전별 1회 생성)")
+
+
+if __name__ == "__main__":
+    main()
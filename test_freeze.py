@@ -0,0 +1,77 @@
+"""
+freeze 테스트: 공유 시트의 제자리 수정이 ValueError로 드러나고, 값은 복사되지 않는지 확인
+- python test_freeze.py 또는 pytest로 실행
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import VERSION_ATTR, data_version, freeze
+from utils.data_loader import normalize_data
+from utils.synthetic import generate
+
+# freeze()는 Copy-on-Write를 전제로 하므로 진입점(앱/내보내기)처럼 테스트에서도 직접 켬
+pd.set_option("mode.copy_on_write", True)
+
+
+def _frozen() -> tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame]]:
+    data = normalize_data(generate(n_orgs=11, kpis_per_org=3, latest_month=3))
+    data_version(data)
+    return data, freeze(data)
+
+
+def test_freeze_requires_copy_on_write():
+    data = normalize_data(generate(n_orgs=3, kpis_per_org=2, latest_month=1))
+    with pd.option_context("mode.copy_on_write", False):
+        try:
+            freeze(data)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Copy-on-Write 없이 freeze()됨")
+    assert pd.get_option("mode.copy_on_write") is True
+
+
+def test_in_place_writes_raise():
+    _, frozen = _frozen()
+    monthly = frozen["monthly"]
+    for i, column in enumerate(monthly.columns):
+        value = monthly[column].iloc[-1]
+        try:
+            monthly.iloc[0, i] = value
+        except ValueError:
+            continue
+        raise AssertionError(f"{column} ({monthly[column].dtype}) 제자리 수정됨")
+    try:
+        monthly.loc[monthly["월"] == 1, "월실적"] = 0.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("조건부 대입으로 제자리 수정됨")
+
+
+def test_values_shared_and_attrs_kept():
+    data, frozen = _frozen()
+    for key, df in data.items():
+        assert frozen[key].attrs[VERSION_ATTR] == df.attrs[VERSION_ATTR]
+        pd.testing.assert_frame_equal(frozen[key], df)
+        for column in df.columns:
+            if isinstance(df[column].dtype, np.dtype):
+                assert np.shares_memory(frozen[key][column].to_numpy(), df[column].to_numpy())
+
+    # 파생 결과는 평소처럼 새 DataFrame으로 만들 수 있음
+    before = frozen["monthly"].loc[0, "월실적"]
+    derived = frozen["monthly"].assign(x=1.0)
+    derived.loc[0, "월실적"] = before + 1
+    assert frozen["monthly"].loc[0, "월실적"] == before
+
+
+def main():
+    test_freeze_requires_copy_on_write()
+    test_in_place_writes_raise()
+    test_values_shared_and_attrs_kept()
+    print("\n통과: freeze (읽기 전용, 복사 없음)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+연도별 이력 테스트: 1월 증분 갱신 뒤에도 연도 선택의 지난 연도 화면이 12개월 전체를 보여주는지 확인
+- 원본은 SQLite 소스(합성 데이터 2개년), 스냅샷은 임시 디렉터리
+- python test_history.py 또는 pytest로 실행
+"""
+
+import math
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import VERSION_ATTR
+from utils.history import available_years, current_year, year_data
+from utils.refresher import Refresher
+from utils.sources import SqliteSource
+from utils.synthetic import generate
+
+
+# 앱과 같은 pandas 설정 (Refresher/year_data가 공유 시트를 freeze()하므로 Copy-on-Write 필요)
+pd.set_option("mode.copy_on_write", True)
+
+
+def test_previous_year_view_after_january_refresh():
+    full = generate(years=2, latest_month=1, seed=5)
+    monthly = full["monthly"]
+    this_year = int(monthly["연도"].max())
+    last_year = this_year - 1
+
+    source = SqliteSource(Path(tempfile.mkdtemp()) / "kpi.db")
+    source.save(full)
+    snapshot_dir = Path(tempfile.mkdtemp())
+    refresher = Refresher(source.load_all, snapshot_dir=snapshot_dir).start()
+    refresher.stop()
+
+    # 전년 12월 수정 → 증분 갱신 (재조회 구간이 전년 12월에 걸침)
+    corrected = monthly.copy()
+    december = (corrected["연도"] == last_year) & (corrected["월"] == 12)
+    corrected.loc[december, "월실적"] += 1
+    source.save({**full, "monthly": corrected})
+    assert refresher.refresh()
+
+    data = refresher.current()
+    assert current_year(data) == this_year
+    assert available_years(data, snapshot_dir) == [this_year, last_year]
+
+    past = year_data(data, last_year, snapshot_dir)
+    assert past is not None and past["monthly"].attrs[VERSION_ATTR] != data["monthly"].attrs[VERSION_ATTR]
+    past_monthly = past["monthly"]
+    expected = corrected[corrected["연도"] == last_year]
+    assert sorted(past_monthly["월"].unique()) == list(range(1, 13))
+    assert len(past_monthly) == len(expected)
+    assert math.isclose(past_monthly["월실적"].sum(), expected["월실적"].sum())
+    assert year_data(data, this_year, snapshot_dir) is data
+
+
+def main():
+    test_previous_year_view_after_january_refresh()
+    print("\n통과: 연도별 이력 (1월 증분 갱신 뒤 지난 연도 12개월 유지)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+증분 로드 테스트: 캐시에 최근 구간만 다시 받아 병합한 결과가 전체 로드와 같은지 확인
+- 원본은 메모리의 DataFrame, 증분 쿼리는 기준점 이후 행 필터로 흉내
+- python test_incremental.py 또는 pytest로 실행
+"""
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from utils.data_loader import (
+    INCREMENTAL_WINDOW,
+    before_high_water,
+    high_water_mark,
+    merge_incremental,
+)
+from utils.refresher import Refresher
+from utils.sources import DataSource, SqliteSource
+from utils.synthetic import generate
+
+# 앱과 같은 pandas 설정 (Refresher가 공유 시트를 freeze()하므로 Copy-on-Write 필요)
+pd.set_option("mode.copy_on_write", True)
+
+SHEET = "KPI_Monthly_Data"
+
+
+def _monthly(months, year=None, value=100.0) -> pd.DataFrame:
+    """조직 2개 x KPI 1개의 월별 실적"""
+    rows = [{"조직ID": org, "KPI_ID": 1, "월": month, "월실적": value + month}
+            for month in months for org in (2001, 2002)]
+    df = pd.DataFrame(rows)
+    if year is not None:
+        df.insert(0, "연도", year)
+    return df
+
+
+class _Source:
+    """fetch_since/fetch_all 호출 수를 세는 메모리 원본"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.since_calls = []
+        self.all_calls = 0
+
+    def fetch_since(self, mark):
+        self.since_calls.append(mark)
+        return self.df[~before_high_water(self.df, mark)].reset_index(drop=True)
+
+    def fetch_all(self):
+        self.all_calls += 1
+        return self.df.copy()
+
+    def merge(self, cached):
+        return merge_incremental(SHEET, cached, self.fetch_since, self.fetch_all)
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    keys = [col for col in ("연도", "월", "조직ID") if col in df.columns]
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+# ──────────────────────────────────────────
+# 기준점
+# ──────────────────────────────────────────
+
+def test_high_water_mark_window():
+    assert INCREMENTAL_WINDOW >= 2
+    back = INCREMENTAL_WINDOW - 1
+    assert high_water_mark(_monthly([1, 2, 3, 4]), "월") == {"월": 4 - back}
+    assert high_water_mark(_monthly([1]), "월") == {"월": 1}
+    assert high_water_mark(_monthly([1, 2, 3, 4]), "월", window=1) == {"월": 4}
+
+
+def test_high_water_mark_crosses_year():
+    cached = pd.concat([_monthly([11, 12], year=2025), _monthly([1], year=2026)])
+    assert high_water_mark(cached, "월", window=2) == {"연도": 2025, "월": 12}
+    assert high_water_mark(cached, "월", window=3) == {"연도": 2025, "월": 11}
+
+
+# ──────────────────────────────────────────
+# 병합 / 전체 로드 대체
+# ──────────────────────────────────────────
+
+def test_merge_appends_new_month():
+    source = _Source(_monthly([1, 2, 3, 4]))
+    merged = source.merge(_monthly([1, 2, 3]))
+    assert source.all_calls == 0 and len(source.since_calls) == 1
+    pd.testing.assert_frame_equal(_sorted(merged), _sorted(source.df))
+
+
+def test_merge_picks_up_corrected_previous_month():
+    # 마지막 월(3월)뿐 아니라 직전 월(2월) 마감 후 수정도 반영
+    cached = _monthly([1, 2, 3])
+    corrected = cached.copy()
+    corrected.loc[corrected["월"] == 2, "월실적"] = -1.0
+    source = _Source(corrected)
+    merged = source.merge(cached)
+    assert source.all_calls == 0
+    assert (merged.loc[merged["월"] == 2, "월실적"] == -1.0).all()
+    pd.testing.assert_frame_equal(_sorted(merged), _sorted(corrected))
+
+
+def test_merge_drops_rows_deleted_in_window():
+    cached = _monthly([1, 2, 3])
+    source = _Source(cached[~((cached["월"] == 3) & (cached["조직ID"] == 2002))])
+    merged = source.merge(cached)
+    assert len(merged) == len(cached) - 1
+
+
+def test_empty_delta_falls_back_to_full_load():
+    # 캐시에 있던 구간이 원본에서 사라짐 (시트 초기화) → 캐시를 버리고 전체 로드
+    source = _Source(_monthly([1]))
+    merged = source.merge(_monthly([1, 2, 3]))
+    assert source.all_calls == 1
+    pd.testing.assert_frame_equal(merged, source.df)
+
+
+def test_column_mismatch_falls_back_to_full_load():
+    changed = _monthly([1, 2, 3, 4]).assign(비고="")
+    source = _Source(changed)
+    merged = source.merge(_monthly([1, 2, 3]))
+    assert source.all_calls == 1
+    assert list(merged.columns) == list(changed.columns)
+
+
+def test_empty_or_keyless_cache_loads_all():
+    source = _Source(_monthly([1, 2]))
+    source.merge(_monthly([]))
+    source.merge(_monthly([1, 2]).drop(columns="월"))
+    assert source.all_calls == 2 and source.since_calls == []
+
+
+def test_merge_across_year_boundary():
+    cached = pd.concat([_monthly([11, 12], year=2025), _monthly([1], year=2026)],
+                       ignore_index=True)
+    full = pd.concat([cached, _monthly([2], year=2026)], ignore_index=True)
+    full.loc[(full["연도"] == 2025) & (full["월"] == 12), "월실적"] = 0.0
+    source = _Source(full)
+    merged = source.merge(cached)
+    assert source.all_calls == 0
+    pd.testing.assert_frame_equal(_sorted(merged), _sorted(full))
+
+
+# ──────────────────────────────────────────
+# SQLite 소스 (같은 병합/대체 규칙)
+# ──────────────────────────────────────────
+
+def _sqlite(data) -> SqliteSource:
+    source = SqliteSource(Path(tempfile.mkdtemp()) / "kpi.db")
+    source.save(data)
+    return source
+
+
+def test_sqlite_incremental_matches_full_load():
+    full = generate(latest_month=4, seed=1)
+    cached = {**full, "monthly": full["monthly"][full["monthly"]["월"] <= 3]}
+    corrected = full["monthly"].copy()
+    corrected.loc[corrected["월"] == 3, "월실적"] += 1
+    source = _sqlite({**full, "monthly": corrected})
+
+    cached_source = _sqlite(cached)
+    previous = cached_source.load_all()
+    merged = source.load_all(previous=previous)
+    pd.testing.assert_frame_equal(_sorted(merged["monthly"]),
+                                  _sorted(source.load_sheet("KPI_Monthly_Data")))
+
+
+def test_sqlite_empty_delta_keeps_all_months():
+    # 원본이 1월만 남도록 초기화됐으면 캐시의 이전 월을 남기지 않고 전체 로드
+    full = generate(latest_month=3, seed=2)
+    previous = _sqlite(full).load_all()
+    reset = {**full, "monthly": full["monthly"][full["monthly"]["월"] == 1]}
+    merged = _sqlite(reset).load_all(previous=previous)
+    assert sorted(merged["monthly"]["월"].unique()) == [1]
+
+
+def test_data_source_requires_load_sheet():
+    try:
+        DataSource()
+    except TypeError:
+        return
+    raise AssertionError("load_sheet 없이 DataSource 생성됨")
+
+
+# ──────────────────────────────────────────
+# 갱신 스레드: 증분 구간보다 오래된 수정은 전체 로드가 반영
+# ──────────────────────────────────────────
+
+def _month_total(refresher: Refresher, month: int) -> float:
+    monthly = refresher.current()["monthly"]
+    return float(monthly.loc[monthly["월"] == month, "월실적"].sum())
+
+
+def test_refresher_full_reload_picks_up_old_correction():
+    full = generate(latest_month=4, seed=3)
+    source = _sqlite(full)
+    snapshot_dir = Path(tempfile.mkdtemp())
+    refresher = Refresher(source.load_all, snapshot_dir=snapshot_dir).start()
+    refresher.stop()
+    before = _month_total(refresher, 1)
+
+    corrected = full["monthly"].copy()
+    corrected.loc[corrected["월"] == 1, "월실적"] += 1
+    source.save({**full, "monthly": corrected})
+    after = before + (corrected["월"] == 1).sum()
+
+    # 1월은 증분 구간 밖이라 증분 갱신으로는 그대로
+    assert refresher.refresh()
+    assert _month_total(refresher, 1) == before
+
+    # 전체 로드 주기가 지나면 반영
+    refresher.full_interval = 0
+    assert refresher.refresh()
+    assert _month_total(refresher, 1) == after
+
+    # 스냅샷으로 시작한 프로세스도 첫 갱신은 전체 로드
+    corrected.loc[corrected["월"] == 1, "월실적"] += 1
+    source.save({**full, "monthly": corrected})
+    restarted = Refresher(source.load_all, snapshot_dir=snapshot_dir).start()
+    restarted.stop()
+    assert _month_total(restarted, 1) == after
+    assert restarted.refresh()
+    assert _month_total(restarted, 1) == after + (corrected["월"] == 1).sum()
+
+
+def test_refresher_january_keeps_previous_year_partition():
+    # 1월 증분 갱신의 재조회 구간은 전년 12월까지: 전년 파일은 12월만 바꾸고 나머지 월은 유지
+    full = generate(years=2, latest_month=1, seed=4)
+    monthly = full["monthly"]
+    last_year = int(monthly["연도"].min())
+    source = _sqlite(full)
+    snapshot_dir = Path(tempfile.mkdtemp())
+    refresher = Refresher(source.load_all, snapshot_dir=snapshot_dir).start()
+    refresher.stop()
+    partition = snapshot_dir / "monthly" / f"{last_year}.parquet"
+    before = pd.read_parquet(partition)
+    assert sorted(before["월"].unique()) == list(range(1, 13))
+
+    corrected = monthly.copy()
+    december = (corrected["연도"] == last_year) & (corrected["월"] == 12)
+    corrected.loc[december, "월실적"] += 1
+    source.save({**full, "monthly": corrected})
+    assert refresher.refresh() and refresher.last_full < refresher.fetched_at
+
+    after = pd.read_parquet(partition)
+    assert len(after) == len(before)
+    pd.testing.assert_frame_equal(_sorted(after), _sorted(corrected[corrected["연도"] == last_year]),
+                                  check_dtype=False)
+
+
+def main():
+    test_high_water_mark_window()
+    test_high_water_mark_crosses_year()
+    test_merge_appends_new_month()
+    test_merge_picks_up_corrected_previous_month()
+    test_merge_drops_rows_deleted_in_window()
+    test_empty_delta_falls_back_to_full_load()
+    test_column_mismatch_falls_back_to_full_load()
+    test_empty_or_keyless_cache_loads_all()
+    test_merge_across_year_boundary()
+    test_sqlite_incremental_matches_full_load()
+    test_sqlite_empty_delta_keeps_all_months()
+    test_data_source_requires_load_sheet()
+    test_refresher_full_reload_picks_up_old_correction()
+    test_refresher_january_keeps_previous_year_partition()
+    print(f"\n통과: 증분 병합 (최근 {INCREMENTAL_WINDOW}개월 재조회, 전체 로드 대체)")
+
+
+if __name__ == "__main__":
+    main()
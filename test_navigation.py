@@ -0,0 +1,85 @@
+"""
+화면 선택 테스트: 선택한 화면만 렌더링하고, 다시 열 때는 화면별 준비 결과를 캐시에서 재사용하는지 확인
+- Streamlit AppTest로 app.py 실행 (합성 데이터 SQLite 소스, 임시 스냅샷 폴더)
+- 스냅샷 위치 등은 모듈을 불러올 때 정해지므로 AppTest는 새 환경변수를 준 별도 프로세스에서 실행
+- AppTest는 segmented_control을 재실행하지 못하므로 경우마다 새 세션으로 1회씩 실행
+- python test_navigation.py 또는 pytest로 실행
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from utils.sources import SqliteSource
+from utils.synthetic import generate
+
+ROOT = Path(__file__).resolve().parent
+
+# 별도 프로세스에서 실행: 세션마다 렌더링된 화면(payload 키)과 pages.* 캐시 실패 수를 JSON으로 출력
+_RUNNER = """
+import json
+from streamlit.testing.v1 import AppTest
+from utils.cache import cache_stats
+
+def run(**params):
+    at = AppTest.from_file("app.py", default_timeout=120)
+    for key, value in params.items():
+        at.query_params[key] = value
+    at.run()
+    return {
+        "errors": [e.message for e in at.exception],
+        "rendered": sorted(at.session_state["payload"]),
+        "view": at.query_params.get("view", [None])[0],  # AppTest는 값 목록으로 보관
+        "misses": {k: s["misses"] for k, s in cache_stats().items() if k.startswith("pages.")},
+    }
+
+print(json.dumps([run(view="bogus"), run(view="data"), run(view="data"), run(nav="tabs")]))
+"""
+
+
+def _run_app() -> list[dict]:
+    tmp = Path(tempfile.mkdtemp())
+    SqliteSource(tmp / "kpi.db").save(generate(latest_month=4, seed=2))
+    env = {
+        **os.environ,
+        "KPI_DATA_SOURCE": f"sqlite:{tmp / 'kpi.db'}",
+        "KPI_SNAPSHOT_DIR": str(tmp / "snapshots"),
+        "KPI_PROFILE_LOG": "WARNING",
+    }
+    env.pop("KPI_SHARED_CACHE_DIR", None)
+    done = subprocess.run([sys.executable, "-c", _RUNNER], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr[-2000:]
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def test_only_selected_view_renders_and_reuses_cache():
+    bogus, data, data_again, tabs = _run_app()
+    for run in (bogus, data, data_again, tabs):
+        assert run["errors"] == []
+
+    # 알 수 없는 화면은 KPI 추진현황으로, URL의 view도 함께 고침
+    assert bogus["rendered"] == ["kpi"] and bogus["view"] == "kpi"
+
+    # 선택한 화면 하나만 렌더링
+    assert data["rendered"] == ["data"] and data["view"] == "data"
+    assert data["misses"]["pages.data_view._prepare"] == 1
+
+    # 같은 화면을 다시 열면(새 세션이어도) 화면별 캐시가 모두 적중
+    assert data_again["rendered"] == ["data"]
+    assert data_again["misses"] == data["misses"]
+
+    # ?nav=tabs 는 기존처럼 4개 탭 모두
+    assert tabs["rendered"] == ["data", "kpi", "org", "trend"]
+
+
+def main():
+    test_only_selected_view_renders_and_reuses_cache()
+    print("\n통과: 화면 선택 (선택한 화면만 렌더링, 다시 열면 캐시 재사용)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+정규화 테스트: 숫자로 읽을 수 없는 목표/실적은 원래 문자열로 표시하고, 달성률은 결측으로 두는지 확인
+- 문자열로 남은 컬럼은 데이터프레임 모드에서도 숫자 형식 없이 문자열로 표시
+- python test_normalize.py 또는 pytest로 실행
+"""
+
+import math
+
+import pandas as pd
+
+from pages.data_view import _column_config, _pivot_monthly
+from utils.data_loader import normalize_monthly
+from utils.formatting import format_value
+
+
+def _monthly(targets, rates) -> pd.DataFrame:
+    return pd.DataFrame({
+        "조직ID": [2001] * len(targets), "월": range(1, len(targets) + 1),
+        "월목표": targets, "월실적": ["1,000"] * len(targets), "월 달성률": rates,
+    })
+
+
+def test_numeric_strings_become_float():
+    df = normalize_monthly(_monthly(["1,200", " 50 ", None], ["110.72%", "", "90%"]), 2026)
+    assert df["월목표"].dtype == "float64" and df["월실적"].dtype == "float64"
+    assert df["월목표"].tolist()[:2] == [1200.0, 50.0] and math.isnan(df["월목표"][2])
+    assert df["월 달성률"][0] == 110.72 and math.isnan(df["월 달성률"][1])
+
+
+def test_non_numeric_value_keeps_text():
+    df = normalize_monthly(_monthly(["1,200", "N/A", "1,200건", None], ["100%"] * 4), 2026)
+    assert [format_value(v) for v in df["월목표"]] == ["1,200", "N/A", "1,200건", "-"]
+    # 같은 시트의 다른 값 컬럼은 그대로 숫자
+    assert df["월실적"].dtype == "float64"
+    # 다시 정규화해도 같음
+    pd.testing.assert_frame_equal(normalize_monthly(df), df)
+
+
+def test_text_values_get_text_column():
+    monthly = normalize_monthly(_monthly(["1,200", "N/A"], ["100%", "95%"]), 2026).assign(
+        조직명="영업팀", KPI명="매출", YTD목표=1.0, YTD실적=1.0, YTD달성률=100.0, YTD평가결과="A")
+    config = _column_config(_pivot_monthly(monthly))
+    assert config["1월목표"]["type_config"]["type"] == "text"
+    assert config["1월실적"]["type_config"] == config["1월YTD목표"]["type_config"]
+    assert config["1월실적"]["type_config"]["format"] == "localized"
+    assert config["1월달성률"]["type_config"]["format"] == "%.2f%%"
+
+
+def test_unparsable_rate_becomes_nan():
+    df = normalize_monthly(_monthly(["1", "2"], ["101%", "집계중"]), 2026)
+    assert df["월 달성률"].dtype == "float64"
+    assert df["월 달성률"][0] == 101.0 and math.isnan(df["월 달성률"][1])
+
+
+def main():
+    test_numeric_strings_become_float()
+    test_non_numeric_value_keeps_text()
+    test_text_values_get_text_column()
+    test_unparsable_rate_becomes_nan()
+    print("\n통과: 정규화 (숫자가 아닌 목표/실적은 원래 문자열로 표시)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+조직 계층 테스트: OrgHierarchy의 전위 순회·서브트리 구간과 탭별 조직 나열 순서(report_order/divisions) 확인
+- 4단계 깊이, 조직ID 순이 아닌 입력, 부모가 없는 조직, 순환 참조를 섞은 작은 계층
+- 탭(KPI 추진현황, 추이, 데이터, 조직도)이 같은 순서 규칙을 쓰는지 함께 확인
+- python test_org_tree.py 또는 pytest로 실행
+"""
+
+import pandas as pd
+
+from pages.data_view import _order_by_hierarchy
+from pages.kpi_view import _layout
+from pages.org_view import _ordered_children
+from utils.org_tree import OrgHierarchy
+
+# (조직ID, 조직명, ParentID) — 시트 순서는 일부러 섞음
+ROWS = [
+    (40, "기획팀", 1), (12, "해외영업팀", 10), (1, "전사", None), (311, "라인A팀", 31),
+    (20, "품질보증팀", 1), (10, "영업본부", 1), (31, "생산1팀", 30), (11, "국내영업팀", 10),
+    (5, "감사팀", 1), (30, "생산본부", 1), (41, "기획1팀", 40),
+    (99, "해지본부 소속팀", 98),          # 부모가 목록에 없음
+    (70, "순환A", 71), (71, "순환B", 70),  # 서로를 부모로 가리킴 (루트에서 닿지 않음)
+]
+
+# 본부 → 본부별 하위(전위 순회) → CEO 직보 팀 (본부/팀 각각 조직ID 순)
+REPORT_ORDER = [1, 10, 30, 40, 11, 12, 31, 311, 41, 5, 20]
+
+
+def _hierarchy() -> OrgHierarchy:
+    return OrgHierarchy(pd.DataFrame(ROWS, columns=["조직ID", "조직명", "ParentID"]))
+
+
+def test_preorder_and_subtree_ranges():
+    h = _hierarchy()
+    assert h.order == [1, 5, 10, 11, 12, 20, 30, 31, 311, 40, 41]
+    assert len(h) == 11 and h.orphans == [99]
+    assert 70 not in h and 71 not in h and 99 not in h
+    assert h.depth[311] == 4
+    assert h.subtree(30) == [30, 31, 311] and h.descendants(10) == [11, 12]
+    assert h.is_ancestor(1, 311) and h.is_ancestor(311, 311) and not h.is_ancestor(10, 311)
+    assert h.ancestors(311) == [31, 30, 1]
+
+
+def test_divisions_and_report_order():
+    h = _hierarchy()
+    # 하위 조직이 있으면 이름이 "팀"이어도 본부형, 하위가 없는 팀은 CEO 직보
+    assert h.divisions() == [10, 30, 40]
+    assert h.direct_reports() == [5, 20]
+    entries = h.report_order()
+    assert [oid for _, oid, _ in entries] == REPORT_ORDER
+    assert [depth for _, _, depth in entries] == [1, 2, 2, 2, 3, 3, 3, 4, 3, 2, 2]
+    assert entries[0] == ("전사", 1, 1)
+
+
+def test_tabs_share_the_order():
+    h = _hierarchy()
+    # KPI 추진현황 탭: 구분선·그룹 제목을 빼면 report_order와 같음
+    assert [item for item in _layout(h) if not isinstance(item, str)] == h.report_order()
+
+    # 조직도: 전사 바로 아래는 본부 → CEO 직보 팀, 그 아래는 조직ID 순
+    assert _ordered_children(h, 1) == [10, 30, 40, 5, 20]
+    assert _ordered_children(h, 10) == [11, 12]
+
+    # 데이터 탭: 전위 순회 순서, 같은 조직은 KPI명 순, 계층에 없는 조직은 맨 뒤에 조직ID 순
+    table = pd.DataFrame({
+        "단위조직ID": [99, 311, 12, 1, 5, 12, 70],
+        "KPI명": ["가", "가", "나", "가", "가", "가", "가"],
+    })
+    ordered = _order_by_hierarchy(table, h)
+    assert ordered["단위조직ID"].tolist() == [1, 5, 12, 12, 311, 70, 99]
+    assert ordered["KPI명"].tolist()[2:4] == ["가", "나"]
+
+
+def main():
+    test_preorder_and_subtree_ranges()
+    test_divisions_and_report_order()
+    test_tabs_share_the_order()
+    print("\n통과: 조직 계층 (전위 순회, 본부 → 하위 조직 → CEO 직보 순서)")
+
+
+if __name__ == "__main__":
+    main()
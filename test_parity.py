@@ -0,0 +1,268 @@
+"""
+일괄 분석 동등성 테스트: 한 번에 계산하는 분석/피벗이 기존 조직별 구현과 같은 결과인지 확인
+- 비교 대상: analyze_all_orgs(KPI 해석), _analyze_all_trends(추이 분석), _pivot_monthly(데이터 표)
+- 기존 구현은 아래에 원래 코드 그대로 두고, 원본 형식(달성률 문자열) 시트를 조직별로 넘겨 계산
+  (단, 기존 정렬의 기본 quicksort는 동률 순서가 numpy 빌드/CPU에 따라 달라지므로
+  kind="stable"로 고정: 동률이면 시트에 나온 순서)
+- 합성 데이터에 동률 달성률, 결측 달성률, 빠진 월을 섞어 비교
+- python test_parity.py 또는 pytest로 실행
+"""
+
+import numpy as np
+import pandas as pd
+
+from pages.data_view import _pivot_monthly
+from pages.llm_briefing import analyze_all_orgs
+from pages.trend_view import _analyze_all_trends
+from utils.data_loader import normalize_monthly
+from utils.synthetic import generate
+
+
+# ──────────────────────────────────────────
+# 기존 조직별 구현 (일괄 계산 도입 전 코드 그대로)
+# ──────────────────────────────────────────
+
+def _old_parse_rate_kpi(rate_str) -> float:
+    """'110.72%' → 110.72 숫자로 변환 (pages/llm_briefing.py)"""
+    try:
+        return float(str(rate_str).replace("%", "").strip())
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _old_analyze_org_kpis(kpi_data: pd.DataFrame) -> dict:
+    df = kpi_data.copy()
+    df["달성률_num"] = df["YTD달성률"].apply(_old_parse_rate_kpi)
+
+    total = len(df)
+    avg_rate = df["달성률_num"].mean()
+    achieved_count = len(df[df["달성률_num"] >= 100])
+    sorted_df = df.sort_values("달성률_num", ascending=False, kind="stable")
+
+    top = sorted_df.head(2)
+    strong = [{"name": r["KPI명"], "rate": r["달성률_num"], "grade": r["YTD평가결과"]}
+              for _, r in top.iterrows()]
+    bottom = sorted_df.tail(2)
+    risk = [{"name": r["KPI명"], "rate": r["달성률_num"], "grade": r["YTD평가결과"]}
+            for _, r in bottom.iterrows()]
+
+    pct = (achieved_count / total * 100) if total > 0 else 0
+    if pct >= 80:
+        tone = "우수한 성과를 보이고 있습니다."
+    elif pct >= 50:
+        tone = "보통 수준이며 일부 개선이 필요합니다."
+    else:
+        tone = "목표 달성이 부진하여 집중 관리가 필요합니다."
+    summary = f"{total}개 KPI 중 {achieved_count}개 목표 달성 ({pct:.0f}%). {tone}"
+
+    actions = []
+    for _, r in bottom.iterrows():
+        rate = r["달성률_num"]
+        name = r["KPI명"]
+        if rate < 80:
+            actions.append(f"'{name}' ({rate:.1f}%) 긴급 원인 분석 및 대응 필요")
+        elif rate < 90:
+            actions.append(f"'{name}' ({rate:.1f}%) 목표 재점검 및 실행력 강화 필요")
+        elif rate < 100:
+            actions.append(f"'{name}' ({rate:.1f}%) 목표 달성까지 집중 관리 필요")
+    if strong and strong[0]["rate"] >= 110:
+        actions.append(f"'{strong[0]['name']}' 우수 사례를 타 KPI에 벤치마킹 권장")
+    if not actions:
+        actions.append("전반적으로 양호하나 지속적인 모니터링 필요")
+
+    return {
+        "summary": summary, "avg_rate": round(avg_rate, 1),
+        "achieved_count": achieved_count, "total_count": total,
+        "strong": strong, "risk": risk, "actions": actions,
+    }
+
+
+def _old_parse_rate_trend(val) -> float | None:
+    """'110.72%' 같은 문자열을 float(110.72)로 변환 (pages/trend_view.py)"""
+    try:
+        return float(str(val).replace("%", "").strip())
+    except (ValueError, TypeError):
+        return None
+
+
+def _old_analyze_trend(org_data: pd.DataFrame) -> dict:
+    kpi_names = org_data["KPI명"].unique()
+    latest_month = int(org_data["월"].max())
+    improving, worsening, alerts = [], [], []
+
+    for kpi in kpi_names:
+        kd = org_data[org_data["KPI명"] == kpi].sort_values("월", kind="stable")
+        rates = kd["달성률"].tolist()
+        if len(rates) < 2:
+            continue
+        latest, prev, first = rates[-1], rates[-2], rates[0]
+        diff = latest - prev
+        overall_diff = latest - first
+        if diff > 0 and overall_diff > 0:
+            improving.append({"name": kpi, "latest": latest, "diff": diff})
+        elif diff < 0 and overall_diff < 0:
+            worsening.append({"name": kpi, "latest": latest, "diff": diff})
+        if latest < 90:
+            alerts.append({"name": kpi, "latest": latest})
+
+    improving.sort(key=lambda x: x["diff"], reverse=True)
+    worsening.sort(key=lambda x: x["diff"])
+
+    avg_latest = org_data[org_data["월"] == latest_month]["달성률"].mean()
+    if len(org_data["월"].unique()) >= 2:
+        prev_month = sorted(org_data["월"].unique())[-2]
+        avg_prev = org_data[org_data["월"] == prev_month]["달성률"].mean()
+        avg_diff = avg_latest - avg_prev
+        if avg_diff > 0:
+            trend_text = f"전월 대비 평균 +{avg_diff:.1f}%p 개선 추세입니다."
+        else:
+            trend_text = f"전월 대비 평균 {avg_diff:.1f}%p 하락 추세입니다."
+    else:
+        trend_text = "추이 비교를 위한 데이터가 부족합니다."
+
+    actions = []
+    for w in worsening[:2]:
+        actions.append(f"'{w['name']}' 연속 하락 중 ({w['diff']:+.1f}%p) — 원인 분석 필요")
+    for a in alerts[:2]:
+        if not any(a["name"] in act for act in actions):
+            actions.append(f"'{a['name']}' {a['latest']:.1f}% — 목표 대비 크게 미달")
+    if improving and not actions:
+        actions.append("전반적으로 개선 추세이나 지속 모니터링 필요")
+    if not actions:
+        actions.append("안정적 추세 유지 중 — 현행 유지 권장")
+
+    return {
+        "summary": trend_text, "avg_rate": round(avg_latest, 1),
+        "improving": improving[:3], "worsening": worsening[:3], "alerts": alerts[:3],
+        "actions": actions,
+    }
+
+
+def _old_pivot(monthly_df: pd.DataFrame) -> pd.DataFrame:
+    latest_month = int(monthly_df["월"].max())
+    rows = []
+    for (org_name, org_id, kpi_name), grp in monthly_df.groupby(
+        ["조직명", "조직ID", "KPI명"], sort=False,
+    ):
+        row: dict = {"단위조직명": org_name, "단위조직ID": int(org_id), "KPI명": kpi_name}
+        for _, r in grp.iterrows():
+            m = int(r["월"])
+            row[f"{m}월목표"] = r["월목표"]
+            row[f"{m}월실적"] = r["월실적"]
+            row[f"{m}월달성률"] = r["월 달성률"]
+            row[f"{m}월YTD목표"] = r["YTD목표"]
+            row[f"{m}월YTD실적"] = r["YTD실적"]
+            row[f"{m}월YTD달성률"] = r["YTD달성률"]
+            if m == latest_month:
+                row["YTD평가결과"] = r["YTD평가결과"]
+        rows.append(row)
+
+    cols = ["단위조직명", "단위조직ID", "KPI명"]
+    for m in range(1, 13):
+        cols.extend([f"{m}월목표", f"{m}월실적", f"{m}월달성률"])
+    for m in range(1, 13):
+        cols.extend([f"{m}월YTD목표", f"{m}월YTD실적", f"{m}월YTD달성률"])
+    cols.append("YTD평가결과")
+
+    result_df = pd.DataFrame(rows, columns=cols)
+    result_df.sort_values(["단위조직ID", "KPI명"], inplace=True)
+    result_df.reset_index(drop=True, inplace=True)
+    return result_df
+
+
+# ──────────────────────────────────────────
+# 테스트 데이터 (동률, 결측, 빠진 월)
+# ──────────────────────────────────────────
+
+def _raw_monthly(seed: int = 7) -> pd.DataFrame:
+    """원본 형식(달성률 "110.72%" 문자열)의 월별 실적"""
+    df = generate(n_orgs=30, kpis_per_org=6, latest_month=5, inactive_ratio=0.0,
+                  seed=seed)["monthly"]
+    rng = np.random.default_rng(seed)
+    orgs = df["조직ID"].unique()
+    kpis = df["KPI_ID"].unique()
+    ytd = df["YTD달성률"].astype(object)
+
+    # 동률: 일부 조직은 KPI 여러 개의 달성률을 같게 (상위/하위 2개 경계에 걸치도록)
+    for org in orgs[:8]:
+        rows = df.index[df["조직ID"] == org]
+        tied = rng.choice(rows, size=len(rows) // 2, replace=False)
+        ytd[tied] = rng.choice(["100.00%", "85.50%", "112.00%"])
+    # 추이 동률: 같은 전월 대비 변화폭
+    for org in orgs[8:12]:
+        for i, kpi in enumerate(df.loc[df["조직ID"] == org, "KPI_ID"].unique()):
+            for month in range(1, 6):
+                ytd[(df["KPI_ID"] == kpi) & (df["월"] == month)] = f"{80 + i + month * 2:.2f}%"
+
+    # 결측 달성률: 드문드문 + 한 조직은 최신 월 전체, 한 조직은 모든 월
+    ytd[rng.random(len(df)) < 0.05] = np.nan
+    ytd[(df["조직ID"] == orgs[12]) & (df["월"] == 5)] = np.nan
+    ytd[df["조직ID"] == orgs[13]] = np.nan
+    df["YTD달성률"] = ytd
+
+    # 빠진 월: 일부 KPI는 최신 월/중간 월이 없고, 한 조직은 1월만 있음
+    drop = ((df["KPI_ID"].isin(kpis[::7]) & (df["월"] == 5))
+            | (df["KPI_ID"].isin(kpis[3::11]) & (df["월"] == 3))
+            | ((df["조직ID"] == orgs[14]) & (df["월"] > 1)))
+    return df[~drop].reset_index(drop=True)
+
+
+def _assert_same(new: dict, old: dict, label: str):
+    """결측(NaN)끼리도 같다고 보는 딕셔너리 비교"""
+    assert new.keys() == old.keys(), f"{label}: 조직 목록 다름"
+    for org_id in old:
+        pd.testing.assert_series_equal(
+            pd.Series([new[org_id]], dtype=object), pd.Series([old[org_id]], dtype=object),
+            obj=f"{label} 조직 {org_id}")
+
+
+# ──────────────────────────────────────────
+# 비교
+# ──────────────────────────────────────────
+
+def test_analyze_all_orgs_matches_per_org():
+    raw = _raw_monthly()
+    latest = raw[raw["월"] == raw["월"].max()]
+    new = analyze_all_orgs(normalize_monthly(latest, 2026))
+    old = {int(org_id): _old_analyze_org_kpis(rows)
+           for org_id, rows in latest.groupby("조직ID", sort=False)}
+    _assert_same(new, old, "analyze_all_orgs")
+    # 데이터가 비교하려는 경우를 실제로 포함하는지 (상위/하위 2개 안의 동률, 달성률 전체 결측)
+    assert any(r["strong"][0]["rate"] == r["strong"][1]["rate"]
+               or r["risk"][0]["rate"] == r["risk"][1]["rate"]
+               for r in new.values() if r["total_count"] >= 2)
+    assert any(np.isnan(r["avg_rate"]) for r in new.values())
+
+
+def test_analyze_all_trends_matches_per_org():
+    raw = _raw_monthly()
+    monthly = normalize_monthly(raw, 2026)
+    new = _analyze_all_trends(monthly.dropna(subset=["YTD달성률"]))
+
+    old = {}
+    for org_id, org_data in raw.groupby("조직ID", sort=False):
+        org_data = org_data.assign(달성률=org_data["YTD달성률"].apply(_old_parse_rate_trend))
+        org_data = org_data.dropna(subset=["달성률"])
+        if not org_data.empty:
+            old[int(org_id)] = _old_analyze_trend(org_data)
+    _assert_same(new, old, "_analyze_all_trends")
+
+
+def test_pivot_monthly_matches_per_kpi():
+    raw = _raw_monthly()
+    monthly = normalize_monthly(raw, 2026)
+    # 기존 구현은 정규화된 값(float)을 그대로 옮겨 담음 (범주형은 원래 문자열로)
+    plain = monthly.astype({col: object for col in monthly.columns
+                            if isinstance(monthly[col].dtype, pd.CategoricalDtype)})
+    pd.testing.assert_frame_equal(_pivot_monthly(monthly), _old_pivot(plain), check_dtype=False)
+
+
+def main():
+    test_analyze_all_orgs_matches_per_org()
+    test_analyze_all_trends_matches_per_org()
+    test_pivot_monthly_matches_per_kpi()
+    print("\n통과: 일괄 분석/피벗 = 조직별 기존 구현 (동률, 결측, 빠진 월 포함)")
+
+
+if __name__ == "__main__":
+    main()
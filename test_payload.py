@@ -0,0 +1,94 @@
+"""
+페이로드 계측 테스트: 차트/표 바이트는 serialize가 켜졌을 때만, 객체마다 한 번만 직렬화하는지 확인
+- Streamlit 런타임 없이 실행 (st.plotly_chart/st.dataframe/st.markdown은 출력 없이 통과)
+- python test_payload.py 또는 pytest로 실행
+"""
+
+import gc
+import logging
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from streamlit import dataframe_util
+
+from utils import payload
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+_TO_JSON = pio.to_json
+
+
+def _figure() -> go.Figure:
+    return go.Figure(go.Scatter(x=[1, 2, 3], y=[90.0, 101.5, 99.2]))
+
+
+def _count_to_json() -> list:
+    """Figure 객체를 넘긴 pio.to_json 호출 기록
+
+    st.plotly_chart도 내부에서 pio.to_json을 부르지만 dict로 넘기므로 세지 않는다.
+    """
+    calls = []
+
+    def counting(fig, **kwargs):
+        if isinstance(fig, go.Figure):
+            calls.append(fig)
+        return _TO_JSON(fig, **kwargs)
+
+    payload.pio.to_json = counting
+    return calls
+
+
+def test_serialize_off_counts_elements_only():
+    calls = _count_to_json()
+    try:
+        with payload.measure("trend") as meter:
+            payload.plotly_chart(_figure())
+            payload.dataframe(pd.DataFrame({"a": [1, 2]}))
+            payload.markdown("<p>헤더</p>")
+        assert meter.summary() == {"bytes": len("<p>헤더</p>".encode("utf-8")), "elements": 3}
+        assert calls == []
+    finally:
+        payload.pio.to_json = _TO_JSON
+
+
+def test_chart_bytes_serialized_once_per_figure():
+    fig = _figure()
+    expected = len(_TO_JSON(fig, validate=False).encode("utf-8"))
+    calls = _count_to_json()
+    try:
+        for _ in range(3):  # 재실행 3번, 같은(캐시된) Figure
+            with payload.measure("trend", serialize=True) as meter:
+                payload.plotly_chart(fig)
+            assert meter.summary() == {"bytes": expected, "elements": 1}
+        assert len(calls) == 1
+    finally:
+        payload.pio.to_json = _TO_JSON
+
+    # Figure가 사라지면 크기 기록도 지워짐
+    key = id(fig)
+    calls.clear()
+    del fig
+    gc.collect()
+    assert key not in payload._spec_bytes
+
+
+def test_dataframe_bytes_match_arrow_payload():
+    df = pd.DataFrame({"조직": ["영업팀", "생산팀"], "실적": [1200.0, 980.5]})
+    expected = len(dataframe_util.convert_pandas_df_to_arrow_bytes(df))
+    for _ in range(2):
+        with payload.measure("data", serialize=True) as meter:
+            payload.dataframe(df, hide_index=True)
+        assert meter.summary() == {"bytes": expected, "elements": 1}
+    assert payload._spec_bytes[id(df)] == expected
+
+
+def main():
+    test_serialize_off_counts_elements_only()
+    test_chart_bytes_serialized_once_per_figure()
+    test_dataframe_bytes_match_arrow_payload()
+    print("\n통과: 페이로드 계측 (차트/표 바이트는 디버그 때만, 객체당 1회)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+구간 로그 테스트: configure_logging() 뒤 구간/재실행 기록이 key=value 한 줄씩 출력되는지 확인
+- python test_profiling.py 또는 pytest로 실행
+"""
+
+import io
+import logging
+
+from utils import profiling
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_span_is_logged_as_key_value_line():
+    stream = io.StringIO()
+    profiling.configure_logging("INFO", stream=stream)
+    records = _Records()
+    profiling.logger.addHandler(records)
+    try:
+        profile = profiling.begin()
+        with profiling.span("pivot", view="data", rows=12):
+            pass
+        profile.finish()
+    finally:
+        profiling.logger.removeHandler(records)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert "level=INFO logger=utils.profiling span name=pivot view=data ms=" in lines[0]
+    assert lines[0].endswith(" rows=12")
+    assert "rerun total_ms=" in lines[1] and lines[1].endswith(" spans=1")
+
+    # 구조화된 기록은 extra["span"]으로도 붙음
+    span = records.records[0].span
+    assert span["name"] == "pivot" and span["view"] == "data" and span["rows"] == 12
+    assert span == profile.spans[0]
+
+
+def test_configure_is_idempotent_and_level_applies():
+    for _ in range(3):
+        profiling.configure_logging("INFO", stream=io.StringIO())
+    ours = [h for h in profiling.logger.handlers if getattr(h, "_kpi_profiling", False)]
+    assert len(ours) == 1 and not profiling.logger.propagate
+
+    stream = io.StringIO()
+    profiling.configure_logging("WARNING", stream=stream)
+    with profiling.span("quiet"):
+        pass
+    assert stream.getvalue() == ""
+
+
+def main():
+    test_span_is_logged_as_key_value_line()
+    test_configure_is_idempotent_and_level_applies()
+    print("\n통과: 구간 로그 (key=value 한 줄, 핸들러 1개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+조직 집계 테스트: 세 가지 집계 방식(평균/가중 평균/목표 달성률)과 차이 갱신(updated) 확인
+- 전사(1) → 본부(10) → 팀(11, 12), 전사 직보 팀(20)의 작은 계층
+- 달성률이 빈 KPI는 평균에서 빠지고(KPI 해석과 같은 기준) 개수에만 포함
+- python test_rollup.py 또는 pytest로 실행
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from pages.llm_briefing import analyze_all_orgs
+from utils.org_tree import OrgHierarchy
+from utils.rollup import WEIGHT_COLUMN, RollupEngine, _with_weights
+
+ORG = pd.DataFrame({
+    "조직ID": [1, 10, 11, 12, 20],
+    "조직명": ["전사", "본부", "1팀", "2팀", "직보팀"],
+    "ParentID": [None, 1, 10, 10, 1],
+})
+
+# (조직ID, KPI_ID, YTD달성률, 등급)
+ROWS = [
+    (1, "K1", 100.0, "A"),
+    (11, "K2", 120.0, "S"), (11, "K3", 80.0, "C"), (11, "K4", np.nan, "-"),
+    (12, "K5", 90.0, "B"),
+    (20, "K6", 110.0, "A"), (20, "K7", np.nan, "-"),
+]
+
+
+def _latest(rows=ROWS) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["조직ID", "KPI_ID", "YTD달성률", "YTD평가결과"]).assign(
+        KPI명=lambda df: df["KPI_ID"])
+
+
+def _engine(latest=None) -> RollupEngine:
+    return RollupEngine(OrgHierarchy(ORG), _latest() if latest is None else latest)
+
+
+def test_mean_skips_missing_rates():
+    engine = _engine()
+    team = engine.summary(11, "mean")
+    assert team["total"] == 3 and team["achieved"] == 1
+    assert team["value"] == 100.0  # (120 + 80) / 2, 빈 달성률 제외
+    assert math.isclose(engine.summary(10, "mean")["value"], (120 + 80 + 90) / 3)
+    assert math.isclose(engine.summary(1, "mean")["value"], (100 + 120 + 80 + 90 + 110) / 5)
+    assert engine.summary(1, "mean")["total"] == 7
+
+    # 한 조직만 보면 KPI 해석의 평균 달성률과 같음
+    analysis = analyze_all_orgs(_latest().assign(YTD달성률=lambda df: df["YTD달성률"].map(
+        lambda r: "" if pd.isna(r) else f"{r}%")))
+    for org_id in (11, 12, 20):
+        assert round(engine.summary(org_id, "mean")["value"], 1) == analysis[org_id]["avg_rate"]
+
+
+def test_achieved_counts_every_kpi():
+    engine = _engine()
+    assert math.isclose(engine.summary(11, "achieved")["value"], 100 / 3)
+    assert math.isclose(engine.summary(1, "achieved")["value"], 3 / 7 * 100)  # K1, K2, K6
+    grades = engine.summary(1, "achieved")["grades"]
+    assert grades["S"] == 1 and grades["A"] == 2 and grades["기타"] == 2
+
+
+def test_unrated_subtree():
+    engine = _engine(_latest([(12, "K5", np.nan, "-")]))
+    assert engine.summary(12, "mean") is None
+    assert engine.summary(12, "achieved")["value"] == 0.0
+    assert engine.summary(11, "mean") is None  # KPI 없음
+
+
+def test_weighted_only_with_weight_column():
+    engine = _engine()
+    assert not engine.has_weights and engine.modes() == ["mean", "achieved"]
+    # 가중치가 없으면 가중 평균은 평균과 같음 (화면에서는 선택지에서 빠짐)
+    assert engine.summary(1, "weighted")["value"] == engine.summary(1, "mean")["value"]
+
+    kpi = pd.DataFrame({"KPI_ID": ["K2", "K3", "K4", "K5"], WEIGHT_COLUMN: [3, 1, 5, None]})
+    weighted = _engine(_with_weights(_latest(), kpi))
+    assert weighted.has_weights and weighted.modes() == ["mean", "weighted", "achieved"]
+    # 1팀: (120*3 + 80*1) / 4, 빈 달성률 K4의 가중치 5는 빠짐
+    assert weighted.summary(11, "weighted")["value"] == 110.0
+    # 본부: K5는 가중치가 없어 1
+    assert math.isclose(weighted.summary(10, "weighted")["value"], (120 * 3 + 80 + 90) / 5)
+
+
+def _assert_same(a: RollupEngine, b: RollupEngine):
+    np.testing.assert_allclose(a.totals, b.totals)
+    for org_id in ORG["조직ID"]:
+        for mode in ("mean", "weighted", "achieved"):
+            x, y = a.summary(org_id, mode), b.summary(org_id, mode)
+            assert (x is None) == (y is None), (org_id, mode)
+            if x is not None:
+                assert math.isclose(x["value"], y["value"]) and x["grades"] == y["grades"]
+
+
+def test_updated_matches_full_rebuild():
+    engine = _engine()
+    # 한 조직만 바뀜 (차이 갱신)
+    changed = _latest()
+    changed.loc[changed["KPI_ID"] == "K5", ["YTD달성률", "YTD평가결과"]] = [np.nan, "-"]
+    _assert_same(engine.updated(changed), _engine(changed))
+
+    # 대부분 바뀜 (전체 재집계)
+    most = _latest().assign(YTD달성률=lambda df: df["YTD달성률"] + 5)
+    _assert_same(engine.updated(most), _engine(most))
+
+    # 가중치 컬럼이 생기면 갱신된 엔진도 가중 평균을 제공
+    kpi = pd.DataFrame({"KPI_ID": ["K2"], WEIGHT_COLUMN: [2.0]})
+    updated = engine.updated(_with_weights(_latest(), kpi))
+    assert updated.has_weights and "weighted" in updated.modes()
+    _assert_same(updated, _engine(_with_weights(_latest(), kpi)))
+
+
+def main():
+    test_mean_skips_missing_rates()
+    test_achieved_counts_every_kpi()
+    test_unrated_subtree()
+    test_weighted_only_with_weight_column()
+    test_updated_matches_full_rebuild()
+    print("\n통과: 조직 집계 (평균/가중 평균/목표 달성률, 차이 갱신)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+공유 캐시 테스트: 파생 결과 저장 형식(Arrow/JSON)과 계열(연도)별 버전 폴더 정리 확인
+- python test_shared_cache.py 또는 pytest로 실행
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import VERSION_ATTR, data_version
+from utils.shared_cache import SharedCache, data_lineage
+
+
+def _cache(keep_versions: int = 2) -> SharedCache:
+    return SharedCache(Path(tempfile.mkdtemp()), keep_versions=keep_versions)
+
+
+def _data(year: int, value: float) -> dict[str, pd.DataFrame]:
+    data = {"monthly": pd.DataFrame({"연도": [year], "월": [1], "월실적": [value]})}
+    data_version(data)
+    return data
+
+
+def test_derived_values_round_trip_without_pickle():
+    shared = _cache()
+    analysis = (np.float64(48.5), 120.0,
+                {2001: {"summary": "개선", "alerts": [{"name": "KPI1", "latest": 87.4}]}})
+    pivot = pd.DataFrame({"조직": ["전사", "본부"], "1월": [101.2, np.nan]})
+
+    for name, value in (("analysis", analysis), ("pivot", pivot)):
+        assert shared.get_or_compute("v1", name, lambda v=value: v) is value
+        cached = shared.get_or_compute("v1", name, lambda: None)
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(cached, value)
+        else:
+            assert cached == value and isinstance(cached, tuple)
+    names = sorted(p.name for p in (shared.root / "v1" / "derived").iterdir())
+    assert names == ["analysis.json", "pivot.arrow"]
+    assert shared.hits == 2 and shared.misses == 2
+
+
+def test_unstorable_value_is_computed_not_cached():
+    shared = _cache()
+    value = {"f": object()}
+    assert shared.get_or_compute("v1", "odd", lambda: value) is value
+    assert shared.get_or_compute("v1", "odd", lambda: value) is value
+    assert shared.misses == 2
+
+
+def test_prune_counts_versions_per_lineage():
+    shared = _cache(keep_versions=2)
+    current = _data(2026, 1.0)
+    shared.publish(current, pd.Timestamp("2026-03-01").to_pydatetime())
+    current_version = current["monthly"].attrs[VERSION_ATTR]
+
+    # 지난 연도 화면의 파생 결과 폴더가 많이 생겨도 올해 버전은 남음
+    for i in range(5):
+        past = _data(2025, float(i))
+        shared.get_or_compute(data_version(past), "analysis", lambda: {}, data_lineage(past))
+        time.sleep(0.01)
+    older = _data(2026, 0.5)
+    shared.publish(older, pd.Timestamp("2026-02-01").to_pydatetime())
+
+    lineages = [(p / "LINEAGE").read_text(encoding="utf-8") for p in shared._versions()]
+    assert lineages.count("2026") == 2 and lineages.count("2025") == 2
+    assert shared.current()[0] == current_version
+    assert shared.load(current_version) is not None
+
+
+def main():
+    test_derived_values_round_trip_without_pickle()
+    test_unstorable_value_is_computed_not_cached()
+    test_prune_counts_versions_per_lineage()
+    print("\n통과: 공유 캐시 (Arrow/JSON 저장, 연도별 버전 정리)")
+
+
+if __name__ == "__main__":
+    main()
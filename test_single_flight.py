@@ -0,0 +1,92 @@
+"""
+single-flight 테스트: 같은 시트를 동시에 N번 요청해도 원본 요청은 1번만 나가는지 확인
+- 로컬 HTTP 스텁 서버가 gviz CSV export 흉내 (응답을 일부러 늦춰 요청이 겹치게 함)
+- python test_single_flight.py 또는 pytest로 실행
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.data_loader import load_all_data, load_sheet
+
+N_CLIENTS = 30
+RESPONSE_DELAY = 0.3  # 초
+
+_CSV = "조직ID,조직명,Level,ParentID\n1001,전사,1,\n2001,본부A,2,1001\n"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """모든 경로에 같은 CSV를 늦게 응답하고 요청 수를 셈"""
+
+    def do_GET(self):
+        with self.server.count_lock:
+            self.server.count += 1
+        time.sleep(RESPONSE_DELAY)
+        body = _CSV.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.count = 0
+    server.count_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _run_concurrently(fn, n: int) -> list:
+    """n개 스레드가 동시에 fn()을 호출한 결과 목록"""
+    barrier = threading.Barrier(n)
+
+    def call():
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return [f.result() for f in [pool.submit(call) for _ in range(n)]]
+
+
+def test_concurrent_sheet_loads_fetch_once():
+    server = _start_stub()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        results = _run_concurrently(
+            lambda: load_sheet("Org_Master", base_url=base_url), N_CLIENTS)
+        assert server.count == 1, f"원본 요청 {server.count}회 (기대: 1회)"
+        assert all(df is results[0] for df in results)
+        assert results[0]["조직ID"].tolist() == [1001, 2001]
+
+        # 진행 중인 요청이 끝난 뒤의 요청은 새로 받음 (결과를 저장하는 캐시가 아님)
+        load_sheet("Org_Master", base_url=base_url)
+        assert server.count == 2
+    finally:
+        server.shutdown()
+
+
+def test_concurrent_load_all_fetches_each_sheet_once():
+    server = _start_stub()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        results = _run_concurrently(lambda: load_all_data(base_url=base_url), N_CLIENTS)
+        assert server.count == len(results[0]), f"원본 요청 {server.count}회 (기대: 시트당 1회)"
+    finally:
+        server.shutdown()
+
+
+def main():
+    test_concurrent_sheet_loads_fetch_once()
+    test_concurrent_load_all_fetches_each_sheet_once()
+    print(f"\n통과: 동시 요청 {N_CLIENTS}건 → 시트당 원본 요청 1회")
+
+
+if __name__ == "__main__":
+    main()
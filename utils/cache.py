@@ -0,0 +1,187 @@
+"""
+데이터 버전 기반 캐시
+- 로드된 시트 딕셔너리의 내용 해시를 '데이터 버전'으로 사용
+- 파생 결과(활성 필터 등)를 버전별로 한 번만 계산하도록 메모이즈
+- 캐시는 프로세스 전체에서 공유되므로 반환값을 제자리 수정하면 안 됨
+- 캐시별 적중/실패 횟수는 cache_stats()로 조회
+- freeze()로 공유 시트의 값 배열을 읽기 전용으로 만들어 제자리 수정을 바로 드러냄
+- freeze()는 pandas Copy-on-Write가 켜져 있어야 함 (앱/내보내기/벤치마크/테스트 진입점에서 켬)
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# DataFrame.attrs에 기록하는 버전 키 (pickle/copy 후에도 유지됨)
+VERSION_ATTR = "data_version"
+
+
+def data_version(data: dict[str, pd.DataFrame]) -> str:
+    """시트 딕셔너리의 내용 해시(16자리 hex) 반환
+
+    처음 계산할 때 각 DataFrame.attrs에 기록해 두고, 이후에는 그 값을 재사용한다.
+    st.cache_data가 돌려주는 복사본에도 attrs가 함께 복원되므로,
+    캐시 함수 안에서 한 번 계산해 두면 재실행마다 해시하지 않는다.
+    """
+    versions = {df.attrs.get(VERSION_ATTR) for df in data.values()}
+    if len(versions) == 1 and None not in versions:
+        return versions.pop()
+
+    h = hashlib.blake2b(digest_size=8)
+    for key in sorted(data):
+        df = data[key]
+        h.update(key.encode())
+        h.update("\x1f".join(map(str, df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    version = h.hexdigest()
+    for df in data.values():
+        df.attrs[VERSION_ATTR] = version
+    return version
+
+
+def _readonly_column(column: pd.Series):
+    """컬럼 값의 읽기 전용 뷰 (numpy 컬럼, 범주형). 그 밖의 확장 배열은 그대로"""
+    if isinstance(column.dtype, np.dtype):
+        values = column.to_numpy(copy=False).view()
+        values.flags.writeable = False
+        return values
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # codes는 읽기 전용 뷰로 반환됨
+        return pd.Categorical.from_codes(column.array.codes, dtype=column.dtype, validate=False)
+    return column.array
+
+
+def freeze(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """값 배열이 읽기 전용인 시트 딕셔너리 반환 (값은 복사하지 않고 공유)
+
+    각 시트를 읽기 전용 컬럼 뷰로 다시 묶은 새 DataFrame이라 반환값을 써야 한다 (attrs 유지).
+    모든 세션이 같은 객체를 복사 없이 공유하므로, 값을 제자리에서 바꾸려 하면
+    ValueError("read-only")가 난다. 파생 컬럼은 assign() 등으로 새 DataFrame에 만든다.
+    (nullable 정수 등 numpy·범주형이 아닌 확장 배열은 건너뜀)
+
+    pandas Copy-on-Write가 켜져 있어야 한다. 꺼져 있으면 조각 연산이 읽기 전용 배열을
+    제자리에서 바꾸려 해 엉뚱한 곳에서 실패하므로 여기서 바로 RuntimeError를 낸다.
+    """
+    if not pd.get_option("mode.copy_on_write"):
+        raise RuntimeError('freeze()에는 pd.set_option("mode.copy_on_write", True)가 필요합니다')
+    frozen = {}
+    for key, df in data.items():
+        arrays = [_readonly_column(column) for _, column in df.items()]
+        if df.columns.is_unique:
+            result = pd.DataFrame(dict(zip(df.columns, arrays)), index=df.index, copy=False)
+        else:
+            result = pd.DataFrame(dict(enumerate(arrays)), index=df.index, copy=False)
+            result.columns = df.columns
+        result.attrs = dict(df.attrs)
+        frozen[key] = result
+    return frozen
+
+
+def content_key(*frames: pd.DataFrame) -> str:
+    """DataFrame 조각들의 내용 해시(16자리 hex)
+
+    컬럼 이름과 값만 보고 인덱스는 무시하므로, 원본 테이블에서 위치가
+    바뀌어도 내용이 같으면 같은 키가 나온다. 차트처럼 조각 단위로
+    재사용하는 결과의 캐시 키로 쓴다.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for df in frames:
+        h.update("\x1f".join(map(str, df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (적중/실패 횟수 집계)"""
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# 이름 → 캐시 (디버그 패널의 적중률 표시용)
+_registry: dict[str, LRUCache] = {}
+
+
+def register_cache(name: str, cache: LRUCache) -> LRUCache:
+    """캐시를 이름으로 등록 (같은 이름이면 교체)"""
+    _registry[name] = cache
+    return cache
+
+
+def cache_stats() -> dict[str, dict]:
+    """등록된 캐시별 stats() (이름 순)"""
+    return {name: _registry[name].stats() for name in sorted(_registry)}
+
+
+_missing = object()
+
+
+def cached_by_version(maxsize: int = 4) -> Callable:
+    """첫 인자(시트 딕셔너리)의 데이터 버전 + 나머지 인자로 결과를 메모이즈
+
+    데이터가 바뀌면 버전이 바뀌어 자동으로 새로 계산되고, 오래된 버전은
+    LRU로 밀려난다. 나머지 인자는 해시 가능해야 한다.
+    활성 조직/KPI 판정이 오늘 날짜에 따라 달라지므로 날짜도 키에 포함한다.
+
+        @cached_by_version()
+        def get_active_data(data): ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache = register_cache(f"{fn.__module__}.{fn.__qualname__}", LRUCache(maxsize))
+
+        @functools.wraps(fn)
+        def wrapper(data: dict[str, pd.DataFrame], *args, **kwargs):
+            key = (data_version(data), date.today(), args,
+                   tuple(sorted(kwargs.items())))
+            result = cache.get(key, _missing)
+            if result is _missing:
+                result = fn(data, *args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
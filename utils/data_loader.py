@@ -2,17 +2,34 @@
 Google Sheets 데이터 로더
 - Google Sheets CSV Export 방식 (인증 불필요)
 - 시트가 '링크가 있는 모든 사용자에게 공개'로 설정되어 있어야 함
+- 4개 시트를 스레드 풀에서 동시에 요청하고, keep-alive 세션 하나로 연결을 재사용
+- 같은 URL을 동시에 요청하면 요청 1번의 결과를 함께 사용 (single-flight)
 """
 
+import io
+import urllib.parse
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 import pandas as pd
-import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import profiling
+from utils.cache import cached_by_version
+from utils.singleflight import SingleFlight
 
 
 # Google Sheets ID (URL에서 추출)
 SHEET_ID = "1gL-Y0LHpJqlDaqJx0TS87LGOISSX1oER"
 
+# gviz CSV export 기본 주소 (테스트 시 로컬 HTTP 서버 주소로 교체 가능)
+GVIZ_BASE_URL = "https://docs.google.com/spreadsheets/d"
+
+# 시트별 요청 타임아웃 (연결, 읽기) 초
+SHEET_TIMEOUT = (5, 30)
+
 # 4개 시트 이름
 SHEET_NAMES = {
     "monthly": "KPI_Monthly_Data",
@@ -21,16 +38,50 @@ SHEET_NAMES = {
     "type_guide": "KPI_Type_Guide",
 }
 
+# 증분 로드 대상 시트와 기준(high-water mark) 컬럼
+# 최근 월만 갱신되는 시트라서, 캐시의 최근 몇 개월 이후 행만 다시 받아 병합
+# (시트에 연도 컬럼이 있으면 기준점은 (연도, 월) 순서쌍)
+INCREMENTAL_SHEETS = {"KPI_Monthly_Data": "월"}
+
+# 증분 로드 때 다시 받는 최근 개월 수 (마지막 월 + 직전 월)
+# 직전 월의 마감 후 수정·추가 입력까지 반영. 그보다 오래된 수정은 주기적 전체 로드가 반영
+INCREMENTAL_WINDOW = 2
+
+# 여러 해 이력을 담는 시트의 연도 컬럼 (없으면 한 해 분량으로 보고 로드한 해를 연도로 사용)
+YEAR_COLUMN = "연도"
+
+# 정규화 대상 컬럼 (KPI_Monthly_Data)
+# - 달성률: "110.72%" 문자열 → float(110.72) (계산에 쓰므로 읽을 수 없는 값은 결측, 개수 출력)
+# - 목표/실적: 숫자 문자열("1,200" 등) → float (표시 전용이라 "N/A" 같은 값이 있으면 원래 문자열 유지)
+# - 반복 문자열 → category, 월/조직ID → 작은 정수형
+RATE_COLUMNS = ["월 달성률", "YTD달성률"]
+VALUE_COLUMNS = ["월목표", "월실적", "YTD목표", "YTD실적"]
+CATEGORY_COLUMNS = ["조직명", "KPI명", "KPI유형", "YTD평가결과"]
+SMALL_INT_COLUMNS = ["연도", "월", "조직ID"]
+
+# 로드 결과 검증: 시트별 필수 컬럼 (화면에서 바로 참조하는 컬럼)
+REQUIRED_COLUMNS = {
+    "monthly": ["조직ID", "KPI_ID", "KPI명", "월", "YTD달성률"],
+    "org": ["조직ID", "조직명", "ParentID"],
+    "kpi": ["KPI_ID"],
+}
+
+# 새로 받은 월별 행 수가 직전 결과의 이 비율보다 적으면 (시트 편집 중 등) 거부
+MIN_ROW_RATIO = 0.5
+
+# 진행 중인 CSV 요청 (URL별). 여러 세션/스레드가 동시에 같은 시트를 요청하면 1번만 받음
+_csv_flight = SingleFlight()
+
 # gviz API가 헤더를 자동 감지할 때 데이터를 헤더에 합치는 시트 목록
 # 이 시트들은 headers=1 파라미터로 헤더 행을 명시해야 함
 _SHEETS_NEED_EXPLICIT_HEADER = {"Org_Master", "KPI_Master"}
 
 
-def _build_csv_url(sheet_name: str) -> str:
+def _build_csv_url(sheet_name: str, base_url: str = GVIZ_BASE_URL) -> str:
     """시트 이름으로 CSV export URL 생성"""
     encoded_name = urllib.parse.quote(sheet_name)
     url = (
-        f"https://docs.google.com/spreadsheets/d/{SHEET_ID}"
+        f"{base_url}/{SHEET_ID}"
         f"/gviz/tq?tqx=out:csv&sheet={encoded_name}"
     )
     if sheet_name in _SHEETS_NEED_EXPLICIT_HEADER:
@@ -38,11 +89,129 @@ def _build_csv_url(sheet_name: str) -> str:
     return url
 
 
-def load_sheet(sheet_name: str) -> pd.DataFrame:
-    """개별 시트를 DataFrame으로 로드"""
-    url = _build_csv_url(sheet_name)
+def _column_letter(index: int) -> str:
+    """0-based 컬럼 위치를 시트 컬럼 문자로 변환 (0 → A, 26 → AA)"""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def _build_query_url(sheet_name: str, query: str,
+                     base_url: str = GVIZ_BASE_URL) -> str:
+    """gviz 쿼리(tq)를 붙인 CSV export URL 생성
+
+    쿼리 결과는 헤더 자동 감지가 불안정하므로 headers=1을 항상 명시한다.
+    """
+    url = _build_csv_url(sheet_name, base_url)
+    if "&headers=1" not in url:
+        url += "&headers=1"
+    return url + "&tq=" + urllib.parse.quote(query)
+
+
+def high_water_mark(cached: pd.DataFrame, key_col: str,
+                    window: int = INCREMENTAL_WINDOW) -> dict[str, int]:
+    """증분 로드 기준점 {컬럼: 값}: 캐시의 마지막 월에서 window-1개월 앞
+
+    연도 컬럼이 있으면 마지막 연도 기준이며, 1월이면 전년 12월로 넘어간다.
+    """
+    back = window - 1
+    if YEAR_COLUMN in cached.columns:
+        year = int(cached[YEAR_COLUMN].max())
+        last = int(cached.loc[cached[YEAR_COLUMN] == year, key_col].max())
+        year, month = divmod(year * 12 + last - 1 - back, 12)
+        return {YEAR_COLUMN: year, key_col: month + 1}
+    return {key_col: max(int(cached[key_col].max()) - back, 1)}
+
+
+def high_water_condition(mark: dict[str, int], ref: Callable[[str], str]) -> str:
+    """기준점 이후(기준점 포함) 행을 고르는 조건식. ref는 컬럼 이름 → 쿼리 내 참조
+
+        high_water_condition({"연도": 2025, "월": 3}, str)
+        # "연도 > 2025 or (연도 = 2025 and 월 >= 3)"
+    """
+    *_, key_col = mark
+    condition = f"{ref(key_col)} >= {mark[key_col]}"
+    if YEAR_COLUMN in mark:
+        year = ref(YEAR_COLUMN)
+        condition = (f"{year} > {mark[YEAR_COLUMN]}"
+                     f" or ({year} = {mark[YEAR_COLUMN]} and {condition})")
+    return condition
+
+
+def before_high_water(df: pd.DataFrame, mark: dict[str, int]) -> pd.Series:
+    """기준점보다 앞선 행 마스크 (증분 결과와 병합할 때 캐시에서 남길 행)"""
+    *_, key_col = mark
+    before = df[key_col] < mark[key_col]
+    if YEAR_COLUMN in mark:
+        year = df[YEAR_COLUMN]
+        before = (year < mark[YEAR_COLUMN]) | ((year == mark[YEAR_COLUMN]) & before)
+    return before
+
+
+def _format_mark(mark: dict[str, int]) -> str:
+    return " ".join(f"{value}{'년' if col == YEAR_COLUMN else col}"
+                    for col, value in mark.items())
+
+
+def merge_incremental(sheet_name: str, cached: pd.DataFrame,
+                      fetch_since: Callable[[dict[str, int]], pd.DataFrame],
+                      fetch_all: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """캐시에 기준점 이후 구간만 다시 받아 병합 (소스 공통 증분 로드)
+
+    fetch_since(mark)는 기준점 이후(기준점 포함) 행을, fetch_all()은 시트 전체를 반환한다.
+    캐시에서 기준점 이후 구간을 지우고 받은 행으로 바꾸므로, 그 구간의
+    수정·추가·삭제가 모두 반영된다.
+
+    다음 경우에는 fetch_all()로 대체한다.
+    - 캐시가 비어 있거나 기준 컬럼이 없음
+    - 받은 구간이 비어 있음 (캐시에는 있던 구간이 사라짐 → 시트 초기화 가능성)
+    - 받은 구간의 컬럼 구성이 캐시와 다름 (시트 구조 변경)
+    """
+    key_col = INCREMENTAL_SHEETS[sheet_name]
+    if cached.empty or key_col not in cached.columns:
+        return fetch_all()
+
+    mark = high_water_mark(cached, key_col)
+    delta = fetch_since(mark)
+    if delta.empty or list(delta.columns) != list(cached.columns):
+        print(f"  [INFO] {sheet_name}: 증분 결과를 병합할 수 없어 전체 로드")
+        return fetch_all()
+
+    merged = pd.concat(
+        [cached[before_high_water(cached, mark)], delta], ignore_index=True,
+    )
+    print(
+        f"  [OK] {sheet_name}: {_format_mark(mark)} 이후 {delta.shape[0]}행 증분"
+        f" → {merged.shape[0]}행 x {merged.shape[1]}열"
+    )
+    return merged
+
+
+def new_session(pool_size: int = len(SHEET_NAMES)) -> requests.Session:
+    """시트 동시 요청용 keep-alive 세션 생성 (호스트당 pool_size개 연결 유지)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def load_sheet(sheet_name: str,
+               session: requests.Session | None = None,
+               timeout: float | tuple[float, float] = SHEET_TIMEOUT,
+               base_url: str = GVIZ_BASE_URL) -> pd.DataFrame:
+    """개별 시트를 DataFrame으로 로드
+
+    session을 넘기면 해당 세션의 연결 풀을 재사용하고,
+    없으면 요청 1회용 연결을 사용한다.
+    """
+    url = _build_csv_url(sheet_name, base_url)
     try:
-        df = pd.read_csv(url)
+        with profiling.span("fetch", sheet=sheet_name):
+            df = _fetch_csv(url, session, timeout)
         print(f"  [OK] {sheet_name}: {df.shape[0]}행 x {df.shape[1]}열")
         return df
     except Exception as e:
@@ -50,45 +219,238 @@ def load_sheet(sheet_name: str) -> pd.DataFrame:
         raise
 
 
-def load_all_data() -> dict[str, pd.DataFrame]:
-    """4개 시트를 한 번에 로드하여 딕셔너리로 반환"""
+def _fetch_csv(url: str, session: requests.Session | None,
+               timeout: float | tuple[float, float]) -> pd.DataFrame:
+    """URL의 CSV를 DataFrame으로 읽기. 응답 본문이 비어 있으면 빈 DataFrame
+
+    같은 URL의 요청이 이미 진행 중이면 새로 요청하지 않고 그 결과를 받는다
+    (반환된 DataFrame을 여러 호출자가 공유하므로 수정하지 말 것).
+    """
+    return _csv_flight.do(url, _download_csv, url, session, timeout)
+
+
+def _download_csv(url: str, session: requests.Session | None,
+                  timeout: float | tuple[float, float]) -> pd.DataFrame:
+    http = session if session is not None else requests
+    resp = http.get(url, timeout=timeout)
+    resp.raise_for_status()
+    # gviz CSV는 UTF-8 (헤더에 charset이 없으면 requests가 latin-1로 추정함)
+    resp.encoding = "utf-8"
+    if not resp.text.strip():
+        return pd.DataFrame()
+    return pd.read_csv(io.StringIO(resp.text))
+
+
+def load_sheet_incremental(sheet_name: str, cached: pd.DataFrame,
+                           session: requests.Session | None = None,
+                           timeout: float | tuple[float, float] = SHEET_TIMEOUT,
+                           base_url: str = GVIZ_BASE_URL) -> pd.DataFrame:
+    """캐시된 DataFrame에 최근 구간만 gviz 쿼리로 받아 병합 (merge_incremental)
+
+    최근 INCREMENTAL_WINDOW개월을 다시 받는다. 연도 컬럼이 있으면 (연도, 월) 기준으로 비교한다.
+    """
+    def fetch_since(mark: dict[str, int]) -> pd.DataFrame:
+        condition = high_water_condition(
+            mark, lambda col: _column_letter(cached.columns.get_loc(col)))
+        url = _build_query_url(sheet_name, f"select * where {condition}", base_url)
+        try:
+            with profiling.span("fetch", sheet=sheet_name, incremental=True):
+                return _fetch_csv(url, session, timeout)
+        except Exception as e:
+            print(f"  [ERROR] {sheet_name} 증분 로드 실패: {e}")
+            raise
+
+    return merge_incremental(
+        sheet_name, cached, fetch_since,
+        lambda: load_sheet(sheet_name, session, timeout, base_url))
+
+
+def load_all_data(session: requests.Session | None = None,
+                  timeout: float | tuple[float, float] = SHEET_TIMEOUT,
+                  base_url: str = GVIZ_BASE_URL,
+                  previous: dict[str, pd.DataFrame] | None = None,
+                  ) -> dict[str, pd.DataFrame]:
+    """4개 시트를 동시에 로드하여 딕셔너리로 반환
+
+    시트마다 스레드 1개씩 요청을 보내고 keep-alive 세션 하나를 공유한다.
+    타임아웃은 시트별로 적용되며, 하나라도 실패하면 예외를 그대로 전달한다.
+    previous(직전 로드 결과)를 넘기면 INCREMENTAL_SHEETS는 증분 로드한다.
+    """
     print("Google Sheets 데이터 로딩 시작...")
-    data = {}
-    for key, sheet_name in SHEET_NAMES.items():
-        data[key] = load_sheet(sheet_name)
+    own_session = session is None
+    if own_session:
+        session = new_session()
+    try:
+        with ThreadPoolExecutor(max_workers=len(SHEET_NAMES)) as pool:
+            futures = {}
+            for key, sheet_name in SHEET_NAMES.items():
+                if (previous is not None and key in previous
+                        and sheet_name in INCREMENTAL_SHEETS):
+                    futures[key] = profiling.submit(
+                        pool, load_sheet_incremental, sheet_name, previous[key],
+                        session, timeout, base_url,
+                    )
+                else:
+                    futures[key] = profiling.submit(
+                        pool, load_sheet, sheet_name, session, timeout, base_url,
+                    )
+            data = {key: future.result() for key, future in futures.items()}
+    finally:
+        if own_session:
+            session.close()
     print("데이터 로딩 완료!")
     return data
 
 
+def parse_rate(values: pd.Series) -> pd.Series:
+    """'110.72%' / '1,200' 같은 문자열 Series를 float Series로 변환 (벡터화)
+
+    이미 숫자형이면 그대로 float로 바꾸고, 변환할 수 없는 값은 NaN.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    cleaned = (
+        values.astype("string")
+        .str.replace("%", "", regex=False)
+        .str.replace(",", "", regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(cleaned, errors="coerce").astype("float64")
+
+
+def _parse_column(values: pd.Series, col: str, keep_text: bool) -> pd.Series:
+    """parse_rate() + 숫자로 읽을 수 없는 값 처리
+
+    keep_text면 그런 값이 하나라도 있을 때 컬럼을 원래 문자열 그대로 둔다 (표시 전용 컬럼).
+    아니면 결측으로 두고 개수를 출력한다 (계산에 쓰는 컬럼).
+    """
+    parsed = parse_rate(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return parsed
+    failed = parsed.isna() & values.notna() & (values.astype("string").str.strip() != "")
+    n_failed = int(failed.sum())
+    if not n_failed:
+        return parsed
+    example = values[failed].iloc[0]
+    if keep_text:
+        print(f"  [INFO] {col}: 숫자가 아닌 값 {n_failed}개 (예: {example!r}) → 원래 문자열로 표시")
+        return values.where(values.isna(), values.astype(str).str.strip())
+    print(f"  [WARN] {col}: 숫자로 읽을 수 없는 값 {n_failed}개 (예: {example!r}) → 결측 처리")
+    return parsed
+
+
+def _downcast_int(values: pd.Series) -> pd.Series:
+    """결측이 없는 정수 컬럼을 가장 작은 정수형으로 변환 (결측이 있으면 그대로)"""
+    if values.isna().any():
+        return values
+    return pd.to_numeric(values, downcast="integer")
+
+
+def normalize_monthly(monthly_df: pd.DataFrame, year: int | None = None) -> pd.DataFrame:
+    """KPI_Monthly_Data를 화면에서 바로 쓸 수 있는 타입으로 한 번에 변환
+
+    연도 컬럼이 없으면 year(기본: 올해)로 채운다.
+    이미 정규화된 DataFrame을 다시 넣어도 결과가 같다.
+    """
+    df = monthly_df.copy()
+    if YEAR_COLUMN not in df.columns:
+        df[YEAR_COLUMN] = year or date.today().year
+    for col in RATE_COLUMNS + VALUE_COLUMNS:
+        if col in df.columns:
+            df[col] = _parse_column(df[col], col, keep_text=col in VALUE_COLUMNS)
+    for col in SMALL_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = _downcast_int(df[col])
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            values = df[col]
+            if values.dtype == object:
+                values = values.str.strip()
+            df[col] = values.astype("category")
+    return df
+
+
+def normalize_data(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """로드 직후 정규화 단계: 시트별 타입 변환 결과를 새 딕셔너리로 반환
+
+    - monthly: normalize_monthly() 적용
+    - org: 조직ID/Level을 작은 정수형으로 (ParentID는 최상위 조직의 NaN 때문에 float 유지)
+    """
+    normalized = dict(data)
+    if "monthly" in data:
+        normalized["monthly"] = normalize_monthly(data["monthly"])
+    if "org" in data:
+        org = data["org"].copy()
+        for col in ["조직ID", "Level"]:
+            if col in org.columns:
+                org[col] = _downcast_int(org[col])
+        normalized["org"] = org
+    return normalized
+
+
+def _last_year(monthly: pd.DataFrame) -> int | None:
+    if YEAR_COLUMN not in monthly.columns or monthly.empty:
+        return None
+    return int(monthly[YEAR_COLUMN].max())
+
+
+def validate_data(data: dict[str, pd.DataFrame],
+                  previous: dict[str, pd.DataFrame] | None = None):
+    """새로 로드한 시트 딕셔너리가 화면에 쓸 수 있는지 검사 (문제가 있으면 ValueError)
+
+    - 모든 시트가 있고 필수 컬럼이 있음
+    - 월별 실적과 조직 마스터가 비어 있지 않음
+    - previous가 있으면 월별 행 수가 MIN_ROW_RATIO 이상 유지됨
+      (새해로 넘어간 경우는 행이 적은 것이 정상이므로 제외, 과거 연도로 돌아가면 거부)
+    """
+    missing = [key for key in SHEET_NAMES if key not in data]
+    if missing:
+        raise ValueError(f"시트 누락: {', '.join(missing)}")
+    for key, columns in REQUIRED_COLUMNS.items():
+        absent = [col for col in columns if col not in data[key].columns]
+        if absent:
+            raise ValueError(f"{SHEET_NAMES[key]} 필수 컬럼 누락: {', '.join(absent)}")
+    for key in ["monthly", "org"]:
+        if data[key].empty:
+            raise ValueError(f"{SHEET_NAMES[key]} 시트가 비어 있음")
+    if previous is not None and "monthly" in previous:
+        before_year, after_year = _last_year(previous["monthly"]), _last_year(data["monthly"])
+        if before_year is not None and after_year is not None and after_year < before_year:
+            raise ValueError(f"마지막 연도가 과거로 바뀜 ({before_year} → {after_year})")
+        if before_year != after_year:
+            return
+        before, after = len(previous["monthly"]), len(data["monthly"])
+        if after < before * MIN_ROW_RATIO:
+            raise ValueError(
+                f"{SHEET_NAMES['monthly']} 행 수 급감 ({before:,} → {after:,})")
+
+
+def _active_mask(df: pd.DataFrame, today: date | None = None) -> pd.Series:
+    """해지일 기준 활성 행 마스크 (벡터화, 해지일 컬럼을 한 번에 파싱)
+
+    해지일이 비어있거나(NaN/빈 문자열) 파싱에 실패하면 활성,
+    해지일이 오늘 이후(오늘 포함)이면 활성, 오늘보다 과거이면 폐지.
+    """
+    if "해지일" not in df.columns:
+        return pd.Series(True, index=df.index)
+    end_dates = pd.to_datetime(
+        df["해지일"].astype("string").str.strip(), format="mixed", errors="coerce",
+    )
+    return end_dates.isna() | (end_dates >= pd.Timestamp(today or date.today()))
+
+
 def get_active_org_ids(org_df: pd.DataFrame) -> set[int]:
     """폐지되지 않은 조직 ID 집합을 반환.
 
     해지일이 비어있거나(NaN) 해지일이 오늘 이후이면 활성 조직.
     해지일이 있고 오늘보다 과거이면 폐지된 조직으로 판단하여 제외.
     """
-    today = date.today()
-    active_ids: set[int] = set()
-    for _, row in org_df.iterrows():
-        end_date = row.get("해지일")
-        # NaN / None / 빈 문자열 → 활성
-        if pd.isna(end_date) or str(end_date).strip() == "":
-            active_ids.add(int(row["조직ID"]))
-            continue
-        # 날짜 파싱 후 비교
-        try:
-            parsed = pd.to_datetime(str(end_date)).date()
-            if parsed >= today:
-                active_ids.add(int(row["조직ID"]))
-        except (ValueError, TypeError):
-            # 파싱 실패 시 안전하게 활성 처리
-            active_ids.add(int(row["조직ID"]))
-    return active_ids
+    return set(org_df.loc[_active_mask(org_df), "조직ID"].astype(int))
 
 
 def filter_active_orgs(org_df: pd.DataFrame) -> pd.DataFrame:
     """폐지된 조직을 제외한 Org_Master DataFrame 반환"""
-    active_ids = get_active_org_ids(org_df)
-    return org_df[org_df["조직ID"].astype(int).isin(active_ids)].copy()
+    return org_df[_active_mask(org_df)]
 
 
 def get_active_kpi_ids(kpi_df: pd.DataFrame) -> set[str]:
@@ -97,17 +459,27 @@ def get_active_kpi_ids(kpi_df: pd.DataFrame) -> set[str]:
     해지일이 비어있거나(NaN) 해지일이 오늘 이후이면 활성 KPI.
     해지일이 있고 오늘보다 과거이면 폐지된 KPI로 판단하여 제외.
     """
+    return set(kpi_df.loc[_active_mask(kpi_df), "KPI_ID"].astype(str))
+
+
+@cached_by_version()
+@profiling.timed("active_filter")
+def get_active_data(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """폐지 조직/KPI를 제외한 시트 딕셔너리 (데이터 버전·날짜별 1회 계산)
+
+    org/kpi는 활성 행만, monthly는 활성 조직 + 활성 KPI 행만 남긴다.
+    결과는 모든 탭/세션이 공유하므로 제자리 수정하지 말 것.
+    """
     today = date.today()
-    active_ids: set[str] = set()
-    for _, row in kpi_df.iterrows():
-        end_date = row.get("해지일")
-        if pd.isna(end_date) or str(end_date).strip() == "":
-            active_ids.add(str(row["KPI_ID"]))
-            continue
-        try:
-            parsed = pd.to_datetime(str(end_date)).date()
-            if parsed >= today:
-                active_ids.add(str(row["KPI_ID"]))
-        except (ValueError, TypeError):
-            active_ids.add(str(row["KPI_ID"]))
-    return active_ids
+    org_mask = _active_mask(data["org"], today)
+    kpi_mask = _active_mask(data["kpi"], today)
+    active_ids = data["org"].loc[org_mask, "조직ID"].astype(int)
+    active_kpis = data["kpi"].loc[kpi_mask, "KPI_ID"].astype(str)
+    monthly = data["monthly"]
+    active = dict(data)
+    active["org"] = data["org"][org_mask]
+    active["kpi"] = data["kpi"][kpi_mask]
+    active["monthly"] = monthly[
+        monthly["조직ID"].isin(active_ids) & monthly["KPI_ID"].isin(active_kpis)
+    ]
+    return active
@@ -0,0 +1,88 @@
+"""
+탭 공용 KPI 데이터셋
+- 데이터 버전별로 한 번만 생성 (활성 필터 적용 + 조회 인덱스 + 조직 계층 구축)
+- 각 탭은 전체 테이블 마스킹 대신 인덱스로 조직/KPI 단위 조각을 바로 꺼내 씀
+- 월별 실적에 여러 연도가 있으면 마지막 연도만 사용 (다른 연도는 utils/history.py)
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils import profiling
+from utils.cache import cached_by_version, freeze
+from utils.data_loader import YEAR_COLUMN, get_active_data
+from utils.org_tree import OrgHierarchy
+
+
+class KpiDataset:
+    """활성 조직/KPI만 남긴 시트와 조회 인덱스 묶음
+
+    인덱스는 키 → 행 위치 배열(groupby().indices)이라 조회는 dict 조회 1번,
+    조각 생성은 해당 행 수만큼의 비용만 든다. 반환되는 조각은 새 DataFrame이다.
+    """
+
+    def __init__(self, data: dict[str, pd.DataFrame]):
+        active = get_active_data(data)
+        monthly = active["monthly"]
+        self.year: int | None = None
+        if YEAR_COLUMN in monthly.columns and not monthly.empty:
+            self.year = int(monthly[YEAR_COLUMN].max())
+            if monthly[YEAR_COLUMN].min() != self.year:
+                monthly = monthly[monthly[YEAR_COLUMN] == self.year]
+        # 활성 필터로 새로 만든 시트도 원본과 같이 읽기 전용 (모든 세션이 공유)
+        frozen = freeze({"org": active["org"], "kpi": active["kpi"], "monthly": monthly})
+        self.org: pd.DataFrame = frozen["org"]
+        self.kpi: pd.DataFrame = frozen["kpi"]
+        self.monthly: pd.DataFrame = frozen["monthly"]
+        self.hierarchy = OrgHierarchy(self.org)
+        self.latest_month: int | None = (
+            int(self.monthly["월"].max()) if not self.monthly.empty else None
+        )
+
+        monthly = self.monthly
+        self._by_month = monthly.groupby("월", sort=False).indices
+        self._by_org = monthly.groupby("조직ID", sort=False).indices
+        self._by_org_month = monthly.groupby(["조직ID", "월"], sort=False).indices
+        self._by_org_kpi = monthly.groupby(["조직ID", "KPI_ID"], sort=False).indices
+
+        # 조직별 KPI_ID 목록 (시트에 처음 나온 순서)
+        self._org_kpis: dict[int, list[str]] = {}
+        for org_id, kpi_id in self._by_org_kpi:
+            self._org_kpis.setdefault(org_id, []).append(kpi_id)
+
+    def _take(self, positions: np.ndarray | None) -> pd.DataFrame:
+        if positions is None:
+            return self.monthly.iloc[0:0]
+        return self.monthly.take(positions)
+
+    def month_rows(self, month: int | None = None) -> pd.DataFrame:
+        """전체 조직의 특정 월(기본: 최신 월) 행"""
+        if month is None:
+            month = self.latest_month
+        return self._take(self._by_month.get(month))
+
+    def org_rows(self, org_id: int) -> pd.DataFrame:
+        """조직의 전체 월별 행"""
+        return self._take(self._by_org.get(org_id))
+
+    def org_month(self, org_id: int, month: int | None = None) -> pd.DataFrame:
+        """조직의 특정 월(기본: 최신 월) 행"""
+        if month is None:
+            month = self.latest_month
+        return self._take(self._by_org_month.get((org_id, month)))
+
+    def org_kpi(self, org_id: int, kpi_id: str) -> pd.DataFrame:
+        """조직 × KPI 하나의 월별 행 (월 오름차순)"""
+        rows = self._take(self._by_org_kpi.get((org_id, kpi_id)))
+        return rows.sort_values("월")
+
+    def org_kpi_ids(self, org_id: int) -> list[str]:
+        """조직의 KPI_ID 목록"""
+        return self._org_kpis.get(org_id, [])
+
+
+@cached_by_version(maxsize=2)
+@profiling.timed("dataset_index")
+def get_dataset(data: dict[str, pd.DataFrame]) -> KpiDataset:
+    """데이터 버전별 KpiDataset (모든 탭/세션 공유, 날짜가 바뀌면 활성 필터 재적용)"""
+    return KpiDataset(data)
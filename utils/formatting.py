@@ -0,0 +1,24 @@
+"""
+화면 표시용 숫자 포맷
+- 정규화된 float 컬럼을 카드/표에 표시할 문자열로 변환
+"""
+
+import math
+
+
+def format_rate(value) -> str:
+    """달성률 float → '110.72%' (결측이면 '-')"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    return f"{value:.2f}%"
+
+
+def format_value(value) -> str:
+    """목표/실적 float → '1,200' / '12.5' (결측이면 '-', 숫자가 아닌 원래 문자열은 그대로)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    if isinstance(value, str):
+        return value
+    if float(value).is_integer():
+        return f"{value:,.0f}"
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
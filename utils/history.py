@@ -0,0 +1,59 @@
+"""
+연도별 KPI 이력
+- 화면은 기본으로 올해(마지막 연도) 월별 실적만 사용
+- 지난 연도는 스냅샷의 연도별 파일에서 요청할 때만 읽어, 올해 데이터와 같은
+  시트 딕셔너리 형태로 만들어 줌 (조직/KPI 마스터는 현재 것을 함께 사용)
+- 읽은 연도는 최근 몇 개만 메모리에 보관
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import VERSION_ATTR, cached_by_version, data_version, freeze
+from utils.data_loader import YEAR_COLUMN, normalize_monthly
+from utils.snapshot import SNAPSHOT_DIR, load_year, stored_years
+
+# 메모리에 보관할 연도별 데이터 수 (연도 선택 + 전년 비교)
+MAX_LOADED_YEARS = 3
+
+
+def current_year(data: dict[str, pd.DataFrame]) -> int | None:
+    """월별 실적의 마지막 연도 (연도 컬럼이 없거나 비어 있으면 None)"""
+    monthly = data.get("monthly")
+    if monthly is None or monthly.empty or YEAR_COLUMN not in monthly.columns:
+        return None
+    return int(monthly[YEAR_COLUMN].max())
+
+
+def available_years(data: dict[str, pd.DataFrame],
+                    snapshot_dir: Path = SNAPSHOT_DIR) -> list[int]:
+    """선택할 수 있는 연도 (최근 연도부터, 현재 데이터의 연도 포함)"""
+    year = current_year(data)
+    years = set(stored_years(snapshot_dir))
+    if year is not None:
+        years = {y for y in years if y <= year} | {year}
+    return sorted(years, reverse=True)
+
+
+@cached_by_version(maxsize=MAX_LOADED_YEARS)
+def year_data(data: dict[str, pd.DataFrame], year: int,
+              snapshot_dir: Path = SNAPSHOT_DIR) -> dict[str, pd.DataFrame] | None:
+    """year 연도의 시트 딕셔너리 (월별 실적만 그 해 것). 저장된 적 없는 연도면 None
+
+    현재 데이터의 연도면 data를 그대로 돌려준다. 지난 연도 결과에는
+    별도의 데이터 버전이 매겨지므로 탭의 버전별 캐시가 그대로 동작한다.
+    """
+    if year == current_year(data):
+        return data
+    monthly = load_year(year, snapshot_dir=snapshot_dir)
+    if monthly is None:
+        return None
+
+    # 마스터 시트는 얕은 복사본에 새 버전을 기록 (현재 데이터의 attrs는 건드리지 않음)
+    past = {key: df.copy(deep=False) for key, df in data.items()}
+    past["monthly"] = normalize_monthly(monthly, year)
+    for df in past.values():
+        df.attrs.pop(VERSION_ATTR, None)
+    data_version(past)
+    return freeze(past)
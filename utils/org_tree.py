@@ -0,0 +1,120 @@
+"""
+조직 계층 인덱스
+- Org_Master(조직ID, ParentID, Level)로 부모→자식 인접 목록을 한 번 구축
+- 반복 DFS로 전위 순회 순서와 서브트리 구간(tin/tout)을 미리 계산
+- 깊이 제한 없음, 조직 수에 선형 (형제 정렬을 위한 조직ID 정렬 1회 제외)
+"""
+
+from collections.abc import Iterable
+
+import pandas as pd
+
+# 이 이름이 들어간 조직은 (하위 조직이 없으면) 팀으로 본다
+TEAM_KEYWORD = "팀"
+
+
+class OrgHierarchy:
+    """조직 트리 인덱스
+
+    - children[id]: 자식 조직ID 목록 (조직ID 오름차순)
+    - order: 전체 전위 순회 순서 (루트부터, 형제는 조직ID 순)
+    - tin[id], tout[id]: order에서 id의 서브트리가 차지하는 구간 [tin, tout)
+    - depth[id]: 루트 = 1
+
+    부모가 목록에 없는 조직(해지된 상위 조직의 하위 등)은 트리에서 제외하고
+    orphans에 모아 둔다. ParentID가 비어 있는 조직이 루트다.
+    """
+
+    def __init__(self, org_df: pd.DataFrame):
+        org_df = org_df.sort_values("조직ID", kind="stable")
+        ids = [int(i) for i in org_df["조직ID"]]
+        parent_col = pd.to_numeric(org_df["ParentID"], errors="coerce")
+        parents = [None if pd.isna(p) else int(p) for p in parent_col]
+
+        self.names: dict[int, str] = dict(zip(ids, org_df["조직명"]))
+        self.parent: dict[int, int | None] = dict(zip(ids, parents))
+        self.children: dict[int, list[int]] = {oid: [] for oid in ids}
+        self.roots: list[int] = []
+        self.orphans: list[int] = []
+        for oid, pid in zip(ids, parents):
+            if pid is None:
+                self.roots.append(oid)
+            elif pid in self.children:
+                self.children[pid].append(oid)
+            else:
+                self.orphans.append(oid)
+
+        # 반복 DFS (전위 순회 + 서브트리 구간). 순환이 있어도 각 조직은 한 번만 방문
+        self.order: list[int] = []
+        self.tin: dict[int, int] = {}
+        self.tout: dict[int, int] = {}
+        self.depth: dict[int, int] = {}
+        for root in self.roots:
+            stack = [(root, 1, False)]
+            while stack:
+                oid, depth, exiting = stack.pop()
+                if exiting:
+                    self.tout[oid] = len(self.order)
+                    continue
+                if oid in self.tin:
+                    continue
+                self.tin[oid] = len(self.order)
+                self.depth[oid] = depth
+                self.order.append(oid)
+                stack.append((oid, depth, True))
+                stack.extend((child, depth + 1, False)
+                             for child in reversed(self.children[oid]))
+
+    def __contains__(self, org_id: int) -> bool:
+        return org_id in self.tin
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def subtree(self, org_id: int) -> list[int]:
+        """org_id와 모든 하위 조직 (전위 순회 순서)"""
+        return self.order[self.tin[org_id]:self.tout[org_id]]
+
+    def descendants(self, org_id: int) -> list[int]:
+        """org_id를 제외한 모든 하위 조직 (전위 순회 순서)"""
+        return self.order[self.tin[org_id] + 1:self.tout[org_id]]
+
+    def is_ancestor(self, ancestor: int, org_id: int) -> bool:
+        """ancestor가 org_id 자신이거나 상위 조직이면 True (O(1))"""
+        return self.tin[ancestor] <= self.tin[org_id] < self.tout[ancestor]
+
+    def ancestors(self, org_id: int) -> list[int]:
+        """상위 조직 목록 (가까운 순, 자신 제외)"""
+        result = []
+        pid = self.parent.get(org_id)
+        while pid is not None and pid in self.tin and len(result) < len(self.order):
+            result.append(pid)
+            pid = self.parent.get(pid)
+        return result
+
+    def is_division(self, org_id: int) -> bool:
+        """본부형 조직 여부: 하위 조직이 있거나 이름이 팀이 아닌 조직"""
+        return bool(self.children[org_id]) or TEAM_KEYWORD not in self.names[org_id]
+
+    def divisions(self) -> list[int]:
+        """루트 바로 아래의 본부형 조직 (조직ID 순)"""
+        return [c for r in self.roots for c in self.children[r] if self.is_division(c)]
+
+    def direct_reports(self) -> list[int]:
+        """루트 바로 아래의 팀 (CEO 직보, 조직ID 순)"""
+        return [c for r in self.roots for c in self.children[r] if not self.is_division(c)]
+
+    def entries(self, org_ids: Iterable[int]) -> list[tuple[str, int, int]]:
+        """조직ID 목록을 (조직명, 조직ID, 깊이) 목록으로 변환"""
+        return [(self.names[oid], oid, self.depth[oid]) for oid in org_ids]
+
+    def report_order(self) -> list[tuple[str, int, int]]:
+        """KPI 추진현황/추이 탭의 조직 나열 순서 (조직명, 조직ID, 깊이)
+
+        전사 → 본부 전체 → 본부별 하위 조직(전위 순회) → CEO 직보 팀
+        """
+        ids = list(self.roots) + self.divisions()
+        for division in self.divisions():
+            ids.extend(self.descendants(division))
+        ids.extend(self.direct_reports())
+        return self.entries(ids)
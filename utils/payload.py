@@ -0,0 +1,124 @@
+"""
+렌더링 페이로드 계측
+- 화면(탭)이 브라우저로 보내는 HTML/차트 스펙의 바이트 수와 요소(델타) 수를 집계
+- 화면 렌더링을 measure()로 감싸고, 그 안에서 markdown()/plotly_chart()/dataframe()으로 출력
+- 결과는 로그(logging)로 남기고 호출한 쪽(app.py)에서 session_state에 보관
+- 차트 스펙/표(Arrow) 바이트 수는 직렬화가 한 번 더 필요하므로 serialize=True(디버그 모드)일 때만,
+  객체별로 한 번만 계산 (캐시된 Figure/DataFrame은 재실행 사이에도 다시 직렬화하지 않음)
+"""
+
+import contextvars
+import logging
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from streamlit import dataframe_util
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadMeter:
+    """한 화면의 렌더링 1회분 페이로드 집계"""
+
+    def __init__(self, view: str, serialize: bool = False):
+        self.view = view
+        self.serialize = serialize
+        self.bytes = 0
+        self.elements = 0
+
+    def add(self, nbytes: int, elements: int = 1):
+        self.bytes += nbytes
+        self.elements += elements
+
+    def summary(self) -> dict:
+        return {"bytes": self.bytes, "elements": self.elements}
+
+
+# 현재 렌더링 중인 화면의 계측기 (Streamlit은 세션마다 별도 스레드에서 스크립트를 실행)
+_current: contextvars.ContextVar[PayloadMeter | None] = contextvars.ContextVar(
+    "payload_meter", default=None
+)
+
+
+# 객체(id)별 직렬화 바이트 수. 객체가 사라지면 항목도 지움 (Figure/DataFrame은 해시 불가)
+_spec_bytes: dict[int, int] = {}
+_spec_lock = threading.Lock()
+
+
+def _serialized_bytes(obj, serialize) -> int:
+    """serialize(obj)의 바이트 수 (같은 객체는 한 번만 직렬화)"""
+    key = id(obj)
+    with _spec_lock:
+        nbytes = _spec_bytes.get(key)
+    if nbytes is None:
+        nbytes = len(serialize(obj))
+        with _spec_lock:
+            if key not in _spec_bytes:
+                _spec_bytes[key] = nbytes
+                weakref.finalize(obj, _spec_bytes.pop, key, None)
+    return nbytes
+
+
+def spec_bytes(fig: go.Figure) -> int:
+    """Figure를 JSON으로 직렬화한 크기 (같은 Figure 객체는 한 번만 직렬화)"""
+    return _serialized_bytes(fig, lambda f: pio.to_json(f, validate=False).encode("utf-8"))
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """st.dataframe이 보내는 Arrow 직렬화 크기 (같은 DataFrame 객체는 한 번만 직렬화)"""
+    return _serialized_bytes(df, dataframe_util.convert_pandas_df_to_arrow_bytes)
+
+
+@contextmanager
+def measure(view: str, serialize: bool = False) -> Iterator[PayloadMeter]:
+    """블록 안에서 출력된 페이로드를 view 이름으로 집계
+
+    serialize가 False면 차트/표는 요소 수만 세고 직렬화 바이트는 세지 않는다.
+
+        with measure("kpi") as meter:
+            kpi_view.render(data)
+        meter.summary()  # {"bytes": ..., "elements": ...}
+    """
+    meter = PayloadMeter(view, serialize)
+    token = _current.set(meter)
+    try:
+        yield meter
+    finally:
+        _current.reset(token)
+        logger.info("payload view=%s bytes=%d elements=%d serialize=%s",
+                    view, meter.bytes, meter.elements, "on" if serialize else "off")
+
+
+def record(nbytes: int, elements: int = 1):
+    """현재 계측기에 페이로드 추가 (measure() 밖이면 무시)"""
+    meter = _current.get()
+    if meter is not None:
+        meter.add(nbytes, elements)
+
+
+def markdown(html: str):
+    """st.markdown(unsafe_allow_html=True) + 페이로드 기록"""
+    st.markdown(html, unsafe_allow_html=True)
+    record(len(html.encode("utf-8")))
+
+
+def plotly_chart(fig: go.Figure, **kwargs):
+    """st.plotly_chart + 페이로드 기록 (스펙 바이트는 계측기의 serialize가 켜졌을 때만)"""
+    st.plotly_chart(fig, **kwargs)
+    meter = _current.get()
+    if meter is not None:
+        meter.add(spec_bytes(fig) if meter.serialize else 0)
+
+
+def dataframe(df: pd.DataFrame, **kwargs):
+    """st.dataframe + 페이로드 기록 (Arrow 바이트는 계측기의 serialize가 켜졌을 때만)"""
+    st.dataframe(df, **kwargs)
+    meter = _current.get()
+    if meter is not None:
+        meter.add(frame_bytes(df) if meter.serialize else 0)
@@ -0,0 +1,147 @@
+"""
+구간 시간 계측 (재실행 1회 단위)
+- span()/timed()로 감싼 구간(시트 로드, 활성 필터, 피벗, 분석, 차트, HTML)의 소요 시간을 기록
+- 각 구간은 logging으로 key=value 한 줄씩 남기고, extra["span"]에 같은 내용을 dict로 붙임
+- begin()으로 시작한 Profile이 있으면 같은 재실행의 구간을 모아 화면별/단계별로 집계
+- 캐시된 함수에 timed()를 붙이면 캐시 실패(실제 계산) 때만 기록된다
+- 실행 진입점(app.py, export.py, benchmark.py)에서 configure_logging()으로 출력 핸들러를 붙임
+"""
+
+import contextvars
+import functools
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from utils.cache import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# 구간 로그 레벨 (환경변수로 변경 가능, 예: KPI_PROFILE_LOG=WARNING이면 구간 로그 끔)
+LOG_LEVEL = os.environ.get("KPI_PROFILE_LOG", "INFO")
+
+LOG_FORMAT = "%(asctime)s level=%(levelname)s logger=%(name)s %(message)s"
+
+
+def configure_logging(level: str | int | None = None, stream=None) -> logging.Handler:
+    """구간/재실행 로그를 key=value 한 줄씩 stream(기본 stderr)에 출력하도록 설정
+
+    Streamlit은 재실행마다 app.py를 다시 실행하므로 여러 번 불러도 핸들러는 하나만 둔다
+    (이전에 붙인 핸들러를 바꿔 끼움). 루트 로거로는 전파하지 않아 중복 출력이 없다.
+    """
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler._kpi_profiling = True
+    for old in [h for h in logger.handlers if getattr(h, "_kpi_profiling", False)]:
+        logger.removeHandler(old)
+    logger.addHandler(handler)
+    logger.setLevel(level if level is not None else LOG_LEVEL)
+    logger.propagate = False
+    return handler
+
+
+class Profile:
+    """재실행 1회의 구간 기록과 캐시 적중 변화량"""
+
+    def __init__(self):
+        self.spans: list[dict] = []
+        self.total_ms: float | None = None
+        self._start = time.perf_counter()
+        self._cache_before = cache_stats()
+        self.cache: dict[str, dict] = {}
+
+    def add(self, record: dict):
+        self.spans.append(record)
+
+    def finish(self) -> "Profile":
+        """전체 소요 시간과 재실행 동안의 캐시 적중/실패 수 확정
+
+        캐시는 프로세스 전체가 공유하므로, 동시에 다른 세션이 재실행 중이면
+        그 세션의 조회도 함께 집계된다.
+        """
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+        for name, after in cache_stats().items():
+            before = self._cache_before.get(name, {"hits": 0, "misses": 0})
+            self.cache[name] = {
+                **after,
+                "rerun_hits": max(after["hits"] - before["hits"], 0),
+                "rerun_misses": max(after["misses"] - before["misses"], 0),
+            }
+        logger.info("rerun total_ms=%.2f spans=%d", self.total_ms, len(self.spans))
+        return self
+
+    def breakdown(self) -> list[dict]:
+        """(화면, 구간)별 호출 수와 합계 시간 (오래 걸린 순)"""
+        groups: dict[tuple[str, str], dict] = {}
+        for span in self.spans:
+            key = (span["view"], span["name"])
+            row = groups.setdefault(key, {"view": key[0], "name": key[1],
+                                          "count": 0, "ms": 0.0})
+            row["count"] += 1
+            row["ms"] += span["ms"]
+        return sorted(groups.values(), key=lambda row: row["ms"], reverse=True)
+
+
+# 현재 재실행의 Profile과 렌더링 중인 화면 (Streamlit은 세션마다 별도 스레드에서 실행)
+_profile: contextvars.ContextVar[Profile | None] = contextvars.ContextVar(
+    "profile", default=None
+)
+_view: contextvars.ContextVar[str] = contextvars.ContextVar("profile_view", default="-")
+
+
+def begin() -> Profile:
+    """현재 스레드(컨텍스트)에서 새 재실행 기록 시작"""
+    profile = Profile()
+    _profile.set(profile)
+    return profile
+
+
+@contextmanager
+def span(name: str, view: str | None = None, **fields) -> Iterator[None]:
+    """블록의 소요 시간을 name 구간으로 기록
+
+    view를 주면 블록 안에서 기록되는 구간도 그 화면 소속이 된다.
+
+        with span("fetch", sheet="Org_Master"):
+            df = load(...)
+    """
+    token = _view.set(view) if view is not None else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        record = {"name": name, "view": _view.get(), "ms": ms, **fields}
+        if token is not None:
+            _view.reset(token)
+        profile = _profile.get()
+        if profile is not None:
+            profile.add(record)
+        detail = "".join(f" {key}={value}" for key, value in fields.items())
+        logger.info("span name=%s view=%s ms=%.2f%s", name, record["view"], ms, detail,
+                    extra={"span": record})
+
+
+def timed(name: str) -> Callable:
+    """함수 호출 전체를 name 구간으로 기록하는 데코레이터
+
+        @cached_by_version()
+        @timed("pivot")
+        def _prepare(data): ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def submit(pool, fn: Callable, *args, **kwargs):
+    """pool.submit과 같지만 현재 Profile/화면을 작업 스레드에 이어 줌"""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -0,0 +1,254 @@
+"""
+백그라운드 데이터 갱신
+- 프로세스당 스레드 1개가 주기적으로 원본을 다시 읽고(증분 로드), 검증을 통과한 결과만 교체
+- 화면 재실행은 current()로 메모리의 최신 데이터만 읽으므로 요청 경로에 네트워크 호출이 없음
+- 시작할 때 스냅샷이 있으면 그것으로 바로 시작하고, 없을 때만 첫 로드를 기다림
+- 시작 후 첫 갱신과 이후 FULL_RELOAD_INTERVAL마다는 전체 로드 (증분 로드 구간보다
+  오래된 월의 수정, 스냅샷 이후 바뀐 내용을 반영)
+- 상태(마지막 성공 시각, 마지막 오류, 갱신 소요 시간)는 status()로 조회
+- 공유 캐시(utils/shared_cache.py)를 주면 여러 워커 중 1곳만 원본을 읽어 publish하고,
+  나머지 워커는 CURRENT 버전을 가져다 씀 (공유 캐시가 최신이면 원본 조회를 건너뜀)
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from utils import profiling
+from utils.cache import data_version, freeze
+from utils.data_loader import normalize_data, validate_data
+from utils.shared_cache import SharedCache
+from utils.snapshot import (
+    MAX_AGE,
+    SNAPSHOT_DIR,
+    earlier_years,
+    latest_year_only,
+    load_snapshot,
+    save_snapshot,
+)
+
+# 갱신 주기(초). 실패하면 이 주기만큼 기다린 뒤 다시 시도
+REFRESH_INTERVAL = MAX_AGE
+
+# 전체 로드 주기(초). 그 사이 갱신은 증분 로드 (최근 INCREMENTAL_WINDOW개월만 다시 받음)
+FULL_RELOAD_INTERVAL = 24 * 60 * 60
+
+# 공유 캐시를 쓸 때 다른 워커가 올린 새 버전을 확인하는 주기(초)
+SHARED_POLL_INTERVAL = 15
+
+
+class Refresher:
+    """원본 데이터 주기 갱신 + 원자적 교체
+
+    current()가 돌려주는 딕셔너리는 교체될 뿐 수정되지 않으므로, 한 번 받은
+    참조는 재실행이 끝날 때까지 일관된 데이터다.
+
+        refresher = Refresher(get_source().load_all).start()
+        data = refresher.current()
+    """
+
+    def __init__(self, loader: Callable[..., dict[str, pd.DataFrame]],
+                 interval: float = REFRESH_INTERVAL,
+                 snapshot_dir: Path = SNAPSHOT_DIR,
+                 shared: SharedCache | None = None,
+                 full_interval: float = FULL_RELOAD_INTERVAL):
+        self.loader = loader
+        self.interval = interval
+        self.full_interval = full_interval
+        self.snapshot_dir = snapshot_dir
+        self.shared = shared
+
+        self._data: dict[str, pd.DataFrame] | None = None  # 화면용 (정규화, 마지막 연도)
+        self._raw: dict[str, pd.DataFrame] | None = None   # 증분 로드 기준 (원본 형식)
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.fetched_at: datetime | None = None
+        self.last_success: datetime | None = None
+        self.last_full: datetime | None = None  # 이 프로세스의 마지막 전체 로드 시각
+        self.last_error: str | None = None
+        self.last_duration: float | None = None
+        self.refreshing = False
+        self.adopted = 0  # 공유 캐시에서 가져온 횟수
+
+    def start(self) -> "Refresher":
+        """공유 캐시 → 스냅샷 → 원본 동기 로드 순으로 첫 데이터를 준비하고 갱신 스레드 시작
+
+        어느 것도 없고 첫 로드도 실패하면 예외를 그대로 전달한다.
+        """
+        if self.shared is not None:
+            self._adopt_shared()
+        if self._data is None:
+            snapshot = load_snapshot(self.snapshot_dir)
+            if snapshot is not None:
+                raw, meta = snapshot
+                self._update(raw, datetime.fromisoformat(meta["fetched_at"]))
+            else:
+                # 다른 워커가 첫 로드 중이면 그 결과가 공유 캐시에 올라올 때까지 기다림
+                while not self.refresh(raise_errors=True):
+                    time.sleep(1)
+
+        self._thread = threading.Thread(target=self._run, name="data-refresher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def current(self) -> dict[str, pd.DataFrame]:
+        """현재 데이터 (정규화 완료, 데이터 버전 기록됨). 공유 객체라 값 배열은 읽기 전용"""
+        return self._data
+
+    def refresh(self, raise_errors: bool = False) -> bool:
+        """지금 한 번 갱신하고 성공 여부 반환
+
+        이미 다른 갱신이 진행 중이면 기다리지 않고 False.
+        공유 캐시를 쓰면 다른 워커가 올린 최신 버전이 있는지 먼저 보고,
+        다른 워커가 원본을 읽는 중이면 그 결과를 다음 확인 때 가져온다 (False).
+        실패하면 현재 데이터를 그대로 두고 last_error에 기록한다.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        self.refreshing = True
+        start = time.perf_counter()
+        try:
+            with profiling.span("refresh"):
+                if self.shared is None:
+                    self._fetch()
+                elif not self._adopt_shared():
+                    with self.shared.refresh_lock() as acquired:
+                        if not acquired:
+                            return False
+                        # 잠금을 기다리는 사이 다른 워커가 publish했을 수 있음
+                        if not self._adopt_shared():
+                            self._fetch()
+            self.last_success = self.fetched_at
+            self.last_error = None
+            return True
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"  [WARN] 데이터 갱신 실패: {self.last_error}")
+            if raise_errors:
+                raise
+            return False
+        finally:
+            self.last_duration = time.perf_counter() - start
+            self.refreshing = False
+            self._refresh_lock.release()
+
+    def _fetch(self):
+        """원본 로드 후 교체. 시작 후 첫 로드와 full_interval이 지난 뒤에는 전체 로드"""
+        full = (self._raw is None or self.last_full is None
+                or (datetime.now() - self.last_full).total_seconds() >= self.full_interval)
+        raw = self.loader() if full else self.loader(previous=self._raw)
+        self._update(raw, full=full)
+        if full:
+            self.last_full = self.fetched_at
+
+    def _adopt_shared(self) -> bool:
+        """공유 캐시의 CURRENT가 현재 데이터보다 새것이면 교체
+
+        Returns:
+            (교체 여부와 관계없이) 현재 데이터가 갱신 주기 안의 최신 데이터인지
+        """
+        current = self.shared.current()
+        if current is not None:
+            version, fetched_at = current
+            if self.fetched_at is None or fetched_at > self.fetched_at:
+                data = self.shared.load(version)
+                if data is not None:
+                    # 공유 캐시에는 검증을 통과한 데이터만 올라가므로 다시 검증하지 않음
+                    self._data = freeze(data)
+                    self.fetched_at = fetched_at
+                    self.adopted += 1
+        return self._age() < self.interval
+
+    def _update(self, raw: dict[str, pd.DataFrame], fetched_at: datetime | None = None,
+                full: bool = True):
+        """원본 → 정규화·검증 → (새로 받은 것이면 스냅샷 저장) → 교체
+
+        검증에 실패하면 ValueError가 나고 현재 데이터는 바뀌지 않는다.
+        증분 로드(full=False)는 마지막 연도만 전부 가지고 있으므로, 이전 연도는
+        스냅샷의 연도 파일에 병합한다 (1월의 재조회 구간이 전년 12월에 걸치는 경우).
+        """
+        data = normalize_data(latest_year_only(raw))
+        validate_data(data, self._data)
+        data_version(data)
+        data = freeze(data)
+
+        if fetched_at is None:
+            fetched_at = datetime.now()
+            try:
+                save_snapshot(raw, self.snapshot_dir,
+                              partial_years=() if full else earlier_years(raw))
+            except Exception as e:
+                print(f"  [WARN] 스냅샷 저장 실패: {e}")
+        if self.shared is not None:
+            try:
+                self.shared.publish(data, fetched_at)
+            except Exception as e:
+                print(f"  [WARN] 공유 캐시 저장 실패: {e}")
+
+        self._raw = latest_year_only(raw)
+        # 참조 한 번 대입으로 교체 (읽는 쪽은 교체 전 또는 후 데이터 중 하나만 봄)
+        self._data = data
+        self.fetched_at = fetched_at
+
+    def _age(self) -> float:
+        if self.fetched_at is None:
+            return float("inf")
+        return (datetime.now() - self.fetched_at).total_seconds()
+
+    def _next_delay(self) -> float:
+        """다음 갱신까지 기다릴 시간 (오래된 스냅샷으로 시작했으면 바로 갱신)"""
+        if self.last_error is not None or self.fetched_at is None:
+            return self.interval
+        return max(self.interval - self._age(), 0.0)
+
+    def _run(self):
+        poll = self.interval if self.shared is None else SHARED_POLL_INTERVAL
+        due = time.monotonic() + self._next_delay()
+        while not self._stop.wait(max(min(due - time.monotonic(), poll), 0.0)):
+            if time.monotonic() < due:
+                # 갱신 주기 전: 다른 워커가 올린 새 버전만 확인
+                fetched_at = self.fetched_at
+                with self._refresh_lock:
+                    self._adopt_shared()
+                if self.fetched_at == fetched_at:
+                    continue
+            else:
+                self.refresh()
+            due = time.monotonic() + self._next_delay()
+
+    def status(self) -> dict:
+        """화면/디버그 표시용 갱신 상태
+
+        Returns:
+            {
+                "fetched_at": 현재 데이터를 원본에서 받은 시각 (datetime),
+                "age_seconds": 경과 시간(초),
+                "last_success": 이 프로세스에서 마지막으로 갱신에 성공한 시각 (없으면 None),
+                "last_full": 이 프로세스에서 마지막으로 전체 로드한 시각 (없으면 None),
+                "last_error": 마지막 갱신 실패 메시지 (성공 시 None),
+                "last_duration": 마지막 갱신 소요 시간(초),
+                "refreshing": 갱신 진행 여부,
+                "version": 현재 데이터 버전,
+                "adopted": 공유 캐시에서 가져온 횟수,
+            }
+        """
+        return {
+            "fetched_at": self.fetched_at,
+            "age_seconds": self._age(),
+            "last_success": self.last_success,
+            "last_full": self.last_full,
+            "last_error": self.last_error,
+            "last_duration": self.last_duration,
+            "refreshing": self.refreshing,
+            "version": data_version(self._data),
+            "adopted": self.adopted,
+        }
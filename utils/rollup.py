@@ -0,0 +1,224 @@
+"""
+조직 계층 KPI 집계 (팀 → 본부 → 전사)
+- 조직별 최신 월 KPI를 합산 가능한 통계(개수, 달성률 합, 가중 합, 달성 수, 등급 분포)로 요약
+  (달성률이 빈 KPI는 평균에서 빼고 개수에만 포함, KPI 해석(analyze_all_orgs)과 같은 기준)
+- 조직 계층을 후위 순서로 한 번 훑으며 하위 조직 통계를 상위로 누적
+- 일부 조직의 데이터만 바뀌면 그 조직과 상위 조직만 차이만큼 갱신
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import profiling
+from utils.cache import cached_by_version
+from utils.dataset import get_dataset
+from utils.org_tree import OrgHierarchy
+
+# 집계 방식
+ROLLUP_MODES = {
+    "mean": "평균 달성률",      # 하위 전체 KPI의 단순 평균
+    "weighted": "가중 평균",    # 가중치 컬럼 기준 (컬럼이 있을 때만 선택 가능)
+    "achieved": "목표 달성률",  # 달성(100% 이상) KPI 수 / 전체 KPI 수
+}
+
+# 가중 평균에 쓰는 컬럼 (KPI_Monthly_Data 또는 KPI_Master에 있으면 사용)
+WEIGHT_COLUMN = "가중치"
+
+GRADES = ["S", "A", "B", "C", "D"]
+
+# 통계 행렬 컬럼: 개수, 달성률 있는 개수, 달성률 합, 가중치 합, 가중 달성률 합, 달성 수,
+# 등급별 개수(+기타)
+_STATS = ["count", "rated", "rate_sum", "weight_sum", "weighted_sum", "achieved",
+          *(f"grade_{g}" for g in GRADES), "grade_other"]
+_COL = {name: i for i, name in enumerate(_STATS)}
+
+# 바뀐 조직이 이 비율을 넘으면 차이 갱신 대신 전체 재집계
+_FULL_REBUILD_RATIO = 0.5
+
+
+def _own_stats(hierarchy: OrgHierarchy, latest: pd.DataFrame) -> np.ndarray:
+    """조직별 자기 KPI 통계 행렬 (행 = hierarchy.order 순서)"""
+    stats = np.zeros((len(hierarchy), len(_STATS)))
+    if latest.empty:
+        return stats
+
+    rate = pd.to_numeric(latest["YTD달성률"], errors="coerce")
+    rated = rate.notna()
+    if WEIGHT_COLUMN in latest.columns:
+        weight = pd.to_numeric(latest[WEIGHT_COLUMN], errors="coerce").fillna(1.0)
+    else:
+        weight = pd.Series(1.0, index=latest.index)
+    # 달성률이 빈 KPI는 합과 가중치에서 빠짐
+    weight = weight.where(rated, 0.0)
+    rate = rate.fillna(0.0)
+    grade = latest["YTD평가결과"].astype(str).str.strip()
+
+    parts = pd.DataFrame({
+        "count": 1.0,
+        "rated": rated.astype(float),
+        "rate_sum": rate,
+        "weight_sum": weight,
+        "weighted_sum": rate * weight,
+        "achieved": (rate >= 100).astype(float),
+        **{f"grade_{g}": (grade == g).astype(float) for g in GRADES},
+        "grade_other": (~grade.isin(GRADES)).astype(float),
+    })
+    sums = parts.groupby(latest["조직ID"].to_numpy()).sum()
+
+    positions = sums.index.map(hierarchy.tin)
+    known = positions.notna()
+    stats[positions[known].astype(int)] = sums.to_numpy()[known]
+    return stats
+
+
+def _has_weights(latest: pd.DataFrame) -> bool:
+    """가중치 컬럼이 있고 값이 하나라도 있는지"""
+    return (WEIGHT_COLUMN in latest.columns
+            and pd.to_numeric(latest[WEIGHT_COLUMN], errors="coerce").notna().any())
+
+
+def _with_weights(latest: pd.DataFrame, kpi_df: pd.DataFrame) -> pd.DataFrame:
+    """월별 데이터에 가중치가 없고 KPI_Master에 있으면 붙여서 반환"""
+    if WEIGHT_COLUMN in latest.columns or WEIGHT_COLUMN not in kpi_df.columns:
+        return latest
+    weights = kpi_df.drop_duplicates("KPI_ID").set_index("KPI_ID")[WEIGHT_COLUMN]
+    return latest.assign(**{WEIGHT_COLUMN: latest["KPI_ID"].map(weights)})
+
+
+class RollupEngine:
+    """조직별 하위 포함 KPI 집계
+
+    totals[i]는 hierarchy.order[i] 조직과 모든 하위 조직의 통계 합이다.
+    생성 후에는 읽기 전용이며, 데이터가 바뀌면 updated()로 새 엔진을 만든다.
+    """
+
+    def __init__(self, hierarchy: OrgHierarchy, latest: pd.DataFrame):
+        self.hierarchy = hierarchy
+        self.has_weights = _has_weights(latest)
+        self._parent_pos = np.array([
+            hierarchy.tin.get(hierarchy.parent[oid], -1)
+            if hierarchy.parent[oid] is not None else -1
+            for oid in hierarchy.order
+        ], dtype=np.int64)
+        self.own = _own_stats(hierarchy, latest)
+        self.totals = self._accumulate(self.own)
+
+    def _accumulate(self, own: np.ndarray) -> np.ndarray:
+        """후위 순서 1회로 하위 통계를 상위에 누적
+
+        전위 순서를 거꾸로 돌면 자식이 항상 부모보다 먼저 나온다.
+        """
+        totals = own.copy()
+        for pos in range(len(totals) - 1, 0, -1):
+            parent = self._parent_pos[pos]
+            if parent >= 0:
+                totals[parent] += totals[pos]
+        return totals
+
+    def _ancestor_positions(self, pos: int) -> list[int]:
+        chain = []
+        while pos >= 0:
+            chain.append(pos)
+            pos = self._parent_pos[pos]
+        return chain
+
+    def updated(self, latest: pd.DataFrame) -> "RollupEngine":
+        """새 최신 월 데이터로 갱신한 엔진 반환 (바뀐 조직과 그 상위 조직만 재계산)"""
+        engine = object.__new__(RollupEngine)
+        engine.hierarchy = self.hierarchy
+        engine.has_weights = _has_weights(latest)
+        engine._parent_pos = self._parent_pos
+        engine.own = _own_stats(self.hierarchy, latest)
+
+        changed = np.flatnonzero((engine.own != self.own).any(axis=1))
+        if len(changed) > len(self.own) * _FULL_REBUILD_RATIO:
+            engine.totals = engine._accumulate(engine.own)
+            return engine
+
+        engine.totals = self.totals.copy()
+        for pos in changed:
+            delta = engine.own[pos] - self.own[pos]
+            engine.totals[self._ancestor_positions(pos)] += delta
+        return engine
+
+    def modes(self) -> list[str]:
+        """선택할 수 있는 집계 방식 (가중치 컬럼이 없으면 가중 평균 제외)"""
+        return [mode for mode in ROLLUP_MODES if mode != "weighted" or self.has_weights]
+
+    def summary(self, org_id: int, mode: str = "mean") -> dict | None:
+        """조직의 하위 포함 집계 결과
+
+        계층에 없거나 KPI가 없으면 None. 평균/가중 평균은 달성률이 있는 KPI가 없어도 None.
+
+        Returns:
+            {
+                "value": 집계 방식에 따른 달성률(%),
+                "total": 하위 포함 KPI 수,
+                "achieved": 달성 KPI 수,
+                "grades": {"S": n, ..., "기타": n},
+                "org_count": 집계에 포함된 조직 수 (자신 포함, KPI 유무 무관),
+            }
+        """
+        pos = self.hierarchy.tin.get(org_id)
+        if pos is None:
+            return None
+        row = self.totals[pos]
+        count = row[_COL["count"]]
+        if count == 0:
+            return None
+
+        if mode == "achieved":
+            value = row[_COL["achieved"]] / count * 100
+        elif row[_COL["rated"]] == 0:
+            return None
+        elif mode == "weighted" and row[_COL["weight_sum"]] > 0:
+            value = row[_COL["weighted_sum"]] / row[_COL["weight_sum"]]
+        else:
+            value = row[_COL["rate_sum"]] / row[_COL["rated"]]
+
+        grades = {g: int(row[_COL[f"grade_{g}"]]) for g in GRADES}
+        grades["기타"] = int(row[_COL["grade_other"]])
+        return {
+            "value": float(value),
+            "total": int(count),
+            "achieved": int(row[_COL["achieved"]]),
+            "grades": grades,
+            "org_count": self.hierarchy.tout[org_id] - pos,
+        }
+
+
+# 연도별 직전 데이터 버전의 엔진 (같은 조직 계층이면 차이만 갱신)
+# 지난 연도 화면과 올해 화면을 오가도 서로 다른 해의 엔진끼리 비교하지 않음
+_last_engines: dict[int | None, RollupEngine] = {}
+_last_lock = threading.Lock()
+
+
+def _same_tree(a: OrgHierarchy, b: OrgHierarchy) -> bool:
+    return a is b or (a.order == b.order and a.parent == b.parent)
+
+
+@cached_by_version(maxsize=2)
+@profiling.timed("rollup")
+def get_rollup(data: dict[str, pd.DataFrame]) -> RollupEngine:
+    """데이터 버전별 조직 집계 엔진 (모든 탭/세션 공유)
+
+    같은 연도의 직전 버전과 조직 계층이 같으면 바뀐 조직의 상위 경로만 갱신한다.
+    """
+    dataset = get_dataset(data)
+    latest = _with_weights(dataset.month_rows(), dataset.kpi)
+    with _last_lock:
+        previous = _last_engines.get(dataset.year)
+        if previous is not None and _same_tree(previous.hierarchy, dataset.hierarchy):
+            engine = previous.updated(latest)
+            engine.hierarchy = dataset.hierarchy
+        else:
+            engine = RollupEngine(dataset.hierarchy, latest)
+        _last_engines[dataset.year] = engine
+    return engine
+
+
+def format_grades(grades: dict[str, int]) -> str:
+    """등급 분포 표시 문자열 (예: "S 2 · A 5 · B 1")"""
+    return " · ".join(f"{g} {n}" for g, n in grades.items() if n)
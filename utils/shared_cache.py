@@ -0,0 +1,336 @@
+"""
+프로세스 간 공유 캐시 (여러 Streamlit 워커를 띄우는 배포용)
+- 공유 디렉터리에 데이터 버전별 폴더를 두고, 시트와 파생 결과(피벗, 분석)를 파일로 저장
+  <dir>/<버전>/sheet-<시트>.arrow, <dir>/<버전>/derived/<이름>.arrow|.json
+- DataFrame은 Arrow IPC 파일로 저장하고 memory map으로 읽으므로, 숫자 컬럼은 워커끼리
+  같은 페이지 캐시를 공유 (워커 수가 늘어도 프로세스당 메모리가 거의 늘지 않음)
+- 그 밖의 파생 결과(분석 딕셔너리 등)는 JSON으로 저장 (실행 가능한 형식은 읽지 않음)
+- 오래된 버전 폴더는 계열(월별 실적의 연도)별로 정리하므로, 지난 연도 화면의 파생 결과가
+  올해 버전 폴더를 밀어내지 않음
+- CURRENT 파일이 최신 버전을 가리키며, 한 워커가 갱신해 publish()하면 나머지 워커는
+  원본을 다시 읽지 않고 그 버전을 가져다 씀 (utils/refresher.py)
+- 모든 파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로 읽는 쪽이 쓰다 만 파일을 보지 않음
+- 환경변수 KPI_SHARED_CACHE_DIR를 지정했을 때만 사용 (없으면 프로세스별 캐시만 사용)
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from utils import profiling
+from utils.cache import VERSION_ATTR, data_version, register_cache
+from utils.data_loader import YEAR_COLUMN
+
+try:
+    import fcntl
+except ImportError:  # Windows: 워커 간 갱신 잠금 없이 동작 (갱신이 겹칠 수 있을 뿐 결과는 같음)
+    fcntl = None
+
+# 공유 디렉터리 (지정하지 않으면 공유 캐시를 쓰지 않음)
+SHARED_CACHE_DIR = os.environ.get("KPI_SHARED_CACHE_DIR")
+
+# 계열(연도)별로 보관할 데이터 버전 폴더 수 (CURRENT가 가리키는 버전은 항상 보관)
+KEEP_VERSIONS = 3
+
+_CURRENT_FILE = "CURRENT"
+_META_FILE = "meta.json"
+_LOCK_FILE = "refresh.lock"
+_LINEAGE_FILE = "LINEAGE"
+
+# JSON에 그대로 담을 수 없는 구조의 표시 (튜플, 문자열이 아닌 키의 딕셔너리)
+_TUPLE_TAG = "__shared_tuple__"
+_ITEMS_TAG = "__shared_items__"
+
+
+def _atomic_write(path: Path, write: Callable[[Path], None]):
+    """같은 폴더의 임시 파일에 쓴 뒤 교체 (워커·스레드별 임시 파일 이름)"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_frame(df: pd.DataFrame, path: Path):
+    table = pa.Table.from_pandas(df)
+
+    def write(tmp: Path):
+        with ipc.new_file(tmp, table.schema) as writer:
+            writer.write_table(table)
+
+    _atomic_write(path, write)
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    """memory map으로 읽기 (결측 없는 숫자 컬럼은 복사 없이 읽기 전용 배열로 연결)"""
+    table = ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def _to_json(value):
+    """JSON으로 옮길 형태 (튜플·정수 키 딕셔너리는 표시를 붙여 읽을 때 되살림)"""
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_to_json(v) for v in value]}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _to_json(v) for key, v in value.items()}
+        return {_ITEMS_TAG: [[_to_json(key), _to_json(v)] for key, v in value.items()]}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _from_json(obj: dict):
+    if obj.keys() == {_TUPLE_TAG}:
+        return tuple(obj[_TUPLE_TAG])
+    if obj.keys() == {_ITEMS_TAG}:
+        return {key: v for key, v in obj[_ITEMS_TAG]}
+    return obj
+
+
+def _write_value(value, base: Path):
+    """DataFrame은 Arrow, 나머지(분석 딕셔너리, 튜플)는 JSON
+
+    Arrow로 바꿀 수 없는 DataFrame(혼합 타입 컬럼)이나 JSON에 담을 수 없는 값이면
+    TypeError/ArrowException (저장하지 않고 호출한 쪽에서 다시 계산)
+    """
+    if isinstance(value, pd.DataFrame):
+        _write_frame(value, base.with_name(f"{base.name}.arrow"))
+        return
+    text = json.dumps(_to_json(value), ensure_ascii=False)
+    _atomic_write(base.with_name(f"{base.name}.json"),
+                  lambda tmp: tmp.write_text(text, encoding="utf-8"))
+
+
+_missing = object()
+
+
+def _read_value(base: Path):
+    arrow = base.with_name(f"{base.name}.arrow")
+    if arrow.exists():
+        return _read_frame(arrow)
+    try:
+        text = base.with_name(f"{base.name}.json").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return _missing
+    return json.loads(text, object_hook=_from_json)
+
+
+def data_lineage(data: dict[str, pd.DataFrame]) -> str:
+    """버전 폴더 정리 단위: 월별 실적의 (마지막) 연도"""
+    monthly = data.get("monthly")
+    if monthly is None or monthly.empty or YEAR_COLUMN not in monthly.columns:
+        return "-"
+    return str(int(monthly[YEAR_COLUMN].max()))
+
+
+class SharedCache:
+    """공유 디렉터리 1개 (워커마다 하나씩 만들어 써도 같은 파일을 봄)
+
+        shared = SharedCache(Path("/srv/kpi-cache"))
+        version = shared.publish(data, fetched_at)      # 갱신한 워커
+        version, fetched_at = shared.current()          # 다른 워커
+        data = shared.load(version)
+    """
+
+    def __init__(self, root: Path, keep_versions: int = KEEP_VERSIONS):
+        self.root = Path(root)
+        self.keep_versions = keep_versions
+        self.hits = 0
+        self.misses = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ── 시트 ──
+
+    def current(self) -> tuple[str, datetime] | None:
+        """CURRENT가 가리키는 (버전, 원본 조회 시각). 아직 없으면 None"""
+        try:
+            pointer = json.loads((self.root / _CURRENT_FILE).read_text(encoding="utf-8"))
+            return pointer["version"], datetime.fromisoformat(pointer["fetched_at"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def publish(self, data: dict[str, pd.DataFrame], fetched_at: datetime) -> str:
+        """시트를 버전 폴더에 저장하고, 현재 것보다 새 데이터면 CURRENT를 이 버전으로 변경
+
+        같은 버전이 이미 저장돼 있으면 파일은 다시 쓰지 않는다.
+        """
+        version = data_version(data)
+        version_dir = self._version_dir(version, data_lineage(data))
+        if not (version_dir / _META_FILE).exists():
+            for key, df in data.items():
+                _write_frame(df, version_dir / f"sheet-{key}.arrow")
+            meta = {"sheets": list(data), "fetched_at": fetched_at.isoformat()}
+            _atomic_write(version_dir / _META_FILE, lambda tmp: tmp.write_text(
+                json.dumps(meta, ensure_ascii=False), encoding="utf-8"))
+
+        current = self.current()
+        if current is None or current[1] <= fetched_at:
+            pointer = {"version": version, "fetched_at": fetched_at.isoformat()}
+            _atomic_write(self.root / _CURRENT_FILE,
+                          lambda tmp: tmp.write_text(json.dumps(pointer), encoding="utf-8"))
+        self._prune()
+        return version
+
+    def load(self, version: str) -> dict[str, pd.DataFrame] | None:
+        """버전 폴더의 시트 딕셔너리 (정리돼 없어진 버전이면 None)"""
+        version_dir = self.root / version
+        try:
+            meta = json.loads((version_dir / _META_FILE).read_text(encoding="utf-8"))
+            with profiling.span("shared_load", version=version):
+                data = {key: _read_frame(version_dir / f"sheet-{key}.arrow")
+                        for key in meta["sheets"]}
+        except (OSError, ValueError, KeyError):
+            return None
+        for df in data.values():
+            df.attrs[VERSION_ATTR] = version
+        return data
+
+    # ── 파생 결과 ──
+
+    def get_or_compute(self, version: str, name: str, compute: Callable,
+                       lineage: str = "-"):
+        """버전 폴더에 저장된 name 결과를 읽고, 없으면 compute()로 계산해 저장
+
+        lineage는 버전 폴더를 처음 만들 때 기록할 계열 (data_lineage())
+        """
+        base = self.root / version / "derived" / name
+        try:
+            value = _read_value(base)
+        except (OSError, ValueError, pa.ArrowInvalid):
+            value = _missing
+        if value is not _missing:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        try:
+            (self._version_dir(version, lineage) / "derived").mkdir(exist_ok=True)
+            _write_value(value, base)
+        except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+            print(f"  [WARN] 공유 캐시 저장 실패 ({name}): {e}")
+        return value
+
+    # ── 갱신 잠금, 정리 ──
+
+    @contextmanager
+    def refresh_lock(self) -> Iterator[bool]:
+        """워커 간 갱신 잠금 (기다리지 않음). 다른 워커가 갱신 중이면 False"""
+        if fcntl is None:
+            yield True
+            return
+        with open(self.root / _LOCK_FILE, "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _version_dir(self, version: str, lineage: str) -> Path:
+        """버전 폴더 (처음 만들 때 계열 기록)"""
+        version_dir = self.root / version
+        if not (version_dir / _LINEAGE_FILE).exists():
+            version_dir.mkdir(exist_ok=True)
+            _atomic_write(version_dir / _LINEAGE_FILE,
+                          lambda tmp: tmp.write_text(lineage, encoding="utf-8"))
+        return version_dir
+
+    def _versions(self) -> list[Path]:
+        """버전 폴더 (최근 수정 순)"""
+        dirs = [p for p in self.root.iterdir() if p.is_dir()]
+        return sorted(dirs, key=lambda p: p.stat().st_mtime, reverse=True)
+
+    def _prune(self):
+        """계열별로 최근 keep_versions개와 CURRENT 버전을 뺀 버전 폴더 삭제
+
+        지난 연도 화면의 파생 결과 폴더는 같은 연도 폴더끼리만 개수를 센다.
+        이미 memory map으로 열린 파일은 삭제돼도 닫을 때까지 읽을 수 있다.
+        """
+        current = self.current()
+        keep = {current[0]} if current else set()
+        counts: dict[str, int] = {}
+        for path in self._versions():
+            try:
+                line = (path / _LINEAGE_FILE).read_text(encoding="utf-8")
+            except OSError:
+                line = "-"
+            counts[line] = counts.get(line, 0) + 1
+            if counts[line] > self.keep_versions and path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._versions()),
+            "maxsize": self.keep_versions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_shared: SharedCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache | None:
+    """KPI_SHARED_CACHE_DIR의 공유 캐시 (지정하지 않았으면 None)"""
+    global _shared
+    if SHARED_CACHE_DIR is None:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = register_cache("shared_cache", SharedCache(Path(SHARED_CACHE_DIR)))
+        return _shared
+
+
+def shared_by_version(name: str) -> Callable:
+    """첫 인자(시트 딕셔너리)의 데이터 버전 + 나머지 인자로 결과를 공유 캐시에 저장
+
+    cached_by_version 아래에 붙여, 프로세스 캐시에 없을 때 다른 워커가
+    계산해 둔 결과를 먼저 찾는다. 공유 캐시를 쓰지 않으면 그대로 계산한다.
+    오늘 날짜도 키에 포함한다 (활성 조직/KPI 판정이 날짜에 따라 달라짐).
+
+        @cached_by_version()
+        @shared_by_version("kpi_view.analysis")
+        @profiling.timed("analysis")
+        def _prepare(data): ...
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(data: dict[str, pd.DataFrame], *args, **kwargs):
+            shared = get_shared_cache()
+            if shared is None:
+                return fn(data, *args, **kwargs)
+            key = name
+            if args or kwargs:
+                digest = hashlib.blake2b(repr((args, sorted(kwargs.items()))).encode(),
+                                         digest_size=4).hexdigest()
+                key = f"{name}-{digest}"
+            return shared.get_or_compute(
+                data_version(data), f"{key}-{date.today():%Y%m%d}",
+                lambda: fn(data, *args, **kwargs), data_lineage(data))
+
+        return wrapper
+
+    return decorator
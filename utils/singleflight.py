@@ -0,0 +1,65 @@
+"""
+동시 호출 합치기 (single-flight)
+- 같은 키로 동시에 들어온 호출은 먼저 온 1건만 실제로 실행하고, 나머지는 그 결과를 기다려 공유
+- 캐시가 만료된 순간 여러 세션이 같은 시트를 동시에 요청해도 원본 요청은 1번만 나감
+- 실행이 끝나면 키를 지우므로 결과를 저장하지는 않음 (캐시가 아님)
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """키별 진행 중 호출 목록 (스레드 안전)
+
+        flight = SingleFlight()
+        df = flight.do(("gviz", "Org_Master"), fetch, url)
+
+    대기한 호출도 같은 결과 객체(또는 같은 예외)를 받으므로 결과를 수정하면 안 된다.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0  # 실제로 실행한 호출 수
+        self.shared = 0    # 다른 호출의 결과를 기다려 받은 호출 수
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """key로 진행 중인 호출이 있으면 그 결과를, 없으면 fn(*args, **kwargs)를 실행해 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {"executed": self.executed, "shared": self.shared,
+                "in_flight": len(self._calls)}
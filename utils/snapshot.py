@@ -0,0 +1,176 @@
+"""
+로컬 스냅샷 캐시
+- 로드에 성공한 시트를 Parquet 파일로 저장 (시트별 1파일 + 메타데이터)
+- 월별 실적은 연도별 파일(monthly/<연도>.parquet)로 나눠 저장하고, 평소에는 마지막 연도만 읽음
+  (지난 연도는 load_year()로 필요할 때만 읽으므로 이력이 쌓여도 로드 시간·메모리가 일정)
+- 재시작 시 갱신 스레드(utils/refresher.py)가 마지막 스냅샷으로 바로 시작하고,
+  오래된 스냅샷이면 곧바로 원본을 다시 읽어 교체
+"""
+
+import json
+import os
+from collections.abc import Collection
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from utils.data_loader import YEAR_COLUMN
+
+# 스냅샷 저장 위치 (환경변수로 변경 가능)
+SNAPSHOT_DIR = Path(
+    os.environ.get(
+        "KPI_SNAPSHOT_DIR",
+        Path(__file__).resolve().parent.parent / ".snapshots",
+    )
+)
+
+# 이 시간(초)보다 오래된 스냅샷으로 시작하면 곧바로 갱신 (갱신 스레드의 갱신 주기)
+MAX_AGE = 300
+
+_META_FILE = "meta.json"
+
+# 연도별로 나눠 저장하는 시트 (연도 컬럼이 없으면 로드한 해의 파일에 저장)
+PARTITIONED_SHEETS = {"monthly"}
+
+
+def _sheet_path(snapshot_dir: Path, key: str) -> Path:
+    return snapshot_dir / f"{key}.parquet"
+
+
+def _partition_path(snapshot_dir: Path, key: str, year: int) -> Path:
+    return snapshot_dir / key / f"{year}.parquet"
+
+
+def _write_parquet(df: pd.DataFrame, path: Path):
+    tmp = path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _merge_partition(path: Path, part: pd.DataFrame) -> pd.DataFrame:
+    """기존 연도 파일에 일부 월만 받은 행을 병합 (받은 첫 월부터는 받은 행으로 교체)"""
+    try:
+        existing = pd.read_parquet(path)
+    except (OSError, ValueError):
+        return part
+    if "월" not in existing.columns or "월" not in part.columns or part.empty:
+        return part
+    first = pd.to_numeric(part["월"], errors="coerce").min()
+    kept = existing[pd.to_numeric(existing["월"], errors="coerce") < first]
+    return pd.concat([kept, part], ignore_index=True)
+
+
+def split_years(df: pd.DataFrame, default_year: int) -> dict[int, pd.DataFrame]:
+    """연도별 조각 {연도: DataFrame} (연도 컬럼이 없거나 비어 있으면 default_year)"""
+    if YEAR_COLUMN not in df.columns or df.empty:
+        return {default_year: df}
+    years = pd.to_numeric(df[YEAR_COLUMN], errors="coerce").fillna(default_year).astype(int)
+    return {int(year): part for year, part in df.groupby(years.to_numpy(), sort=True)}
+
+
+def latest_year_only(data: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """연도별 저장 시트를 마지막 연도 행만 남긴 딕셔너리"""
+    trimmed = dict(data)
+    for key in PARTITIONED_SHEETS & data.keys():
+        parts = split_years(data[key], date.today().year)
+        if len(parts) > 1:
+            trimmed[key] = parts[max(parts)].reset_index(drop=True)
+    return trimmed
+
+
+def earlier_years(data: dict[str, pd.DataFrame]) -> set[int]:
+    """연도별 저장 시트에 있는 연도 중 마지막 연도를 뺀 나머지"""
+    years: set[int] = set()
+    for key in PARTITIONED_SHEETS & data.keys():
+        parts = split_years(data[key], date.today().year)
+        years |= set(parts) - {max(parts)}
+    return years
+
+
+def stored_years(snapshot_dir: Path = SNAPSHOT_DIR, key: str = "monthly") -> list[int]:
+    """스냅샷에 저장된 연도 목록 (오름차순)"""
+    return sorted(int(p.stem) for p in (snapshot_dir / key).glob("*.parquet")
+                  if p.stem.isdigit())
+
+
+def save_snapshot(data: dict[str, pd.DataFrame],
+                  snapshot_dir: Path = SNAPSHOT_DIR,
+                  partial_years: Collection[int] = ()) -> dict:
+    """시트 딕셔너리를 Parquet 스냅샷으로 저장하고 메타데이터 반환
+
+    임시 파일에 쓴 뒤 os.replace로 교체하므로, 읽는 쪽이
+    반쯤 쓰인 파일을 보는 일은 없다. 메타 파일은 마지막에 교체한다.
+    연도별 저장 시트는 data에 있는 연도의 파일만 교체하고 다른 연도는 그대로 둔다.
+    partial_years의 연도는 일부 월만 받은 것이므로(증분 로드의 재조회 구간이 전년도에
+    걸친 경우) 파일을 통째로 바꾸지 않고, 받은 첫 월 이전 행은 기존 파일에서 유지한다.
+    """
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    fetched_at = datetime.now()
+    partitions = {}
+    for key, df in data.items():
+        if key in PARTITIONED_SHEETS:
+            (snapshot_dir / key).mkdir(exist_ok=True)
+            for year, part in split_years(df, fetched_at.year).items():
+                path = _partition_path(snapshot_dir, key, year)
+                if year in partial_years:
+                    part = _merge_partition(path, part)
+                _write_parquet(part, path)
+            partitions[key] = stored_years(snapshot_dir, key)
+        else:
+            _write_parquet(df, _sheet_path(snapshot_dir, key))
+
+    meta = {
+        "fetched_at": fetched_at.isoformat(timespec="seconds"),
+        "sheets": {key: list(df.shape) for key, df in data.items()},
+        "partitions": partitions,
+    }
+    meta_path = snapshot_dir / _META_FILE
+    tmp = meta_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, meta_path)
+    return meta
+
+
+def _read_meta(snapshot_dir: Path) -> dict | None:
+    try:
+        return json.loads((snapshot_dir / _META_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def load_snapshot(snapshot_dir: Path = SNAPSHOT_DIR
+                  ) -> tuple[dict[str, pd.DataFrame], dict] | None:
+    """저장된 스냅샷을 (시트 딕셔너리, 메타데이터)로 반환. 없거나 깨졌으면 None
+
+    연도별 저장 시트는 마지막 연도만 읽는다 (이전 형식의 단일 파일이면 그 파일).
+    """
+    meta = _read_meta(snapshot_dir)
+    if meta is None:
+        return None
+    partitions = meta.get("partitions", {})
+    try:
+        data = {
+            key: pd.read_parquet(
+                _partition_path(snapshot_dir, key, partitions[key][-1])
+                if partitions.get(key) else _sheet_path(snapshot_dir, key)
+            )
+            for key in meta["sheets"]
+        }
+    except (OSError, ValueError, KeyError) as e:
+        print(f"  [WARN] 스냅샷 읽기 실패: {e}")
+        return None
+    return data, meta
+
+
+def load_year(year: int, key: str = "monthly",
+              snapshot_dir: Path = SNAPSHOT_DIR) -> pd.DataFrame | None:
+    """연도별 저장 시트의 한 해 분량 (원본 형식 그대로). 없으면 None"""
+    path = _partition_path(snapshot_dir, key, year)
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError) as e:
+        if path.exists():
+            print(f"  [WARN] {year}년 스냅샷 읽기 실패: {e}")
+        return None
+
@@ -0,0 +1,194 @@
+"""
+데이터 소스 백엔드
+- gviz: 공개 Google Sheets CSV export (기본값)
+- local: 시트별 CSV/Parquet 파일이 있는 로컬 디렉터리
+- sqlite: 시트별 테이블이 있는 SQLite 파일
+
+선택 방법 (앞쪽이 우선)
+1. 환경변수 KPI_DATA_SOURCE (예: "gviz", "local:/data/kpi", "sqlite:/data/kpi.db")
+2. .streamlit/secrets.toml 의 [data_source] 섹션
+       [data_source]
+       type = "local"
+       path = "/data/kpi"
+   (config.toml에 모르는 섹션을 넣으면 Streamlit이 실행마다 경고를 출력하므로 secrets.toml 사용)
+"""
+
+import os
+import sqlite3
+import tomllib
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import pandas as pd
+
+from utils import profiling
+from utils.data_loader import (
+    GVIZ_BASE_URL,
+    INCREMENTAL_SHEETS,
+    SHEET_NAMES,
+    high_water_condition,
+    load_all_data,
+    load_sheet,
+    merge_incremental,
+)
+
+_SECRETS_PATH = Path(__file__).resolve().parent.parent / ".streamlit" / "secrets.toml"
+
+
+class DataSource(ABC):
+    """데이터 소스 공통 인터페이스
+
+    하위 클래스는 load_sheet()만 구현하면 되고, 필요하면 load_all()을
+    재정의하여 동시 로드/증분 로드를 지원한다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def load_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """시트 1개 전체"""
+
+    def load_all(self, previous: dict[str, pd.DataFrame] | None = None
+                 ) -> dict[str, pd.DataFrame]:
+        """SHEET_NAMES의 모든 시트를 {키: DataFrame}으로 반환"""
+        return {key: self.load_sheet(sheet_name)
+                for key, sheet_name in SHEET_NAMES.items()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class GvizSource(DataSource):
+    """공개 Google Sheets (gviz CSV export, 동시 로드 + 증분 로드)"""
+
+    name = "gviz"
+
+    def __init__(self, base_url: str = GVIZ_BASE_URL):
+        self.base_url = base_url
+
+    def load_sheet(self, sheet_name: str) -> pd.DataFrame:
+        return load_sheet(sheet_name, base_url=self.base_url)
+
+    def load_all(self, previous: dict[str, pd.DataFrame] | None = None
+                 ) -> dict[str, pd.DataFrame]:
+        return load_all_data(base_url=self.base_url, previous=previous)
+
+
+class LocalDirSource(DataSource):
+    """로컬 디렉터리의 <시트명>.parquet 또는 <시트명>.csv (Parquet 우선)"""
+
+    name = "local"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load_sheet(self, sheet_name: str) -> pd.DataFrame:
+        parquet = self.path / f"{sheet_name}.parquet"
+        csv = self.path / f"{sheet_name}.csv"
+        with profiling.span("fetch", sheet=sheet_name):
+            if parquet.exists():
+                return pd.read_parquet(parquet)
+            if csv.exists():
+                return pd.read_csv(csv)
+        raise FileNotFoundError(f"{self.path}에 {sheet_name}.parquet/.csv 파일이 없습니다")
+
+    def save(self, data: dict[str, pd.DataFrame], fmt: str = "parquet"):
+        """시트 딕셔너리를 이 디렉터리에 저장 (fmt: parquet | csv)"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        for key, df in data.items():
+            target = self.path / f"{SHEET_NAMES[key]}.{fmt}"
+            if fmt == "parquet":
+                df.to_parquet(target, index=False)
+            else:
+                df.to_csv(target, index=False)
+
+    def __repr__(self) -> str:
+        return f"LocalDirSource({str(self.path)!r})"
+
+
+class SqliteSource(DataSource):
+    """SQLite 파일 (시트명 = 테이블명, 증분 로드 지원)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self.path.exists():
+            raise FileNotFoundError(f"SQLite 파일이 없습니다: {self.path}")
+        return sqlite3.connect(self.path)
+
+    def _query(self, conn: sqlite3.Connection, sheet_name: str, where: str = "",
+               incremental: bool = False) -> pd.DataFrame:
+        with profiling.span("fetch", sheet=sheet_name, incremental=incremental):
+            return pd.read_sql_query(f'SELECT * FROM "{sheet_name}" {where}', conn)
+
+    def load_sheet(self, sheet_name: str) -> pd.DataFrame:
+        with self._connect() as conn:
+            return self._query(conn, sheet_name)
+
+    def load_all(self, previous: dict[str, pd.DataFrame] | None = None
+                 ) -> dict[str, pd.DataFrame]:
+        """모든 시트 (previous가 있으면 증분 대상 시트는 merge_incremental로 병합)"""
+        data = {}
+        with self._connect() as conn:
+            for key, sheet_name in SHEET_NAMES.items():
+                cached = previous.get(key) if previous is not None else None
+                if cached is None or sheet_name not in INCREMENTAL_SHEETS:
+                    data[key] = self._query(conn, sheet_name)
+                    continue
+
+                def fetch_since(mark, sheet_name=sheet_name):
+                    condition = high_water_condition(mark, lambda col: f'"{col}"')
+                    return self._query(conn, sheet_name, f"WHERE {condition}", incremental=True)
+
+                data[key] = merge_incremental(
+                    sheet_name, cached, fetch_since,
+                    lambda sheet_name=sheet_name: self._query(conn, sheet_name))
+        return data
+
+    def save(self, data: dict[str, pd.DataFrame]):
+        """시트 딕셔너리를 테이블로 저장 (기존 테이블은 교체)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.path) as conn:
+            for key, df in data.items():
+                df.to_sql(SHEET_NAMES[key], conn, if_exists="replace", index=False)
+
+    def __repr__(self) -> str:
+        return f"SqliteSource({str(self.path)!r})"
+
+
+def _read_config() -> str | None:
+    """환경변수 또는 secrets.toml에서 소스 지정 문자열 읽기"""
+    spec = os.environ.get("KPI_DATA_SOURCE")
+    if spec:
+        return spec
+    try:
+        with open(_SECRETS_PATH, "rb") as f:
+            section = tomllib.load(f).get("data_source", {})
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+    if not section.get("type"):
+        return None
+    path = section.get("path")
+    return f"{section['type']}:{path}" if path else section["type"]
+
+
+def get_source(spec: str | None = None) -> DataSource:
+    """지정 문자열("종류" 또는 "종류:경로")로 데이터 소스 생성
+
+    spec이 없으면 환경변수/secrets.toml 설정을 쓰고, 그것도 없으면 gviz.
+    """
+    if spec is None:
+        spec = _read_config() or "gviz"
+    kind, _, arg = spec.partition(":")
+    kind = kind.strip().lower()
+
+    if kind == "gviz":
+        return GvizSource(arg or GVIZ_BASE_URL)
+    if kind == "local":
+        return LocalDirSource(arg or "data")
+    if kind == "sqlite":
+        return SqliteSource(arg or "data/kpi.db")
+    raise ValueError(f"알 수 없는 데이터 소스: {spec!r} (gviz | local:<경로> | sqlite:<경로>)")
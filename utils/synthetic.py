@@ -0,0 +1,167 @@
+"""
+합성 KPI 데이터 생성기 (벤치마크/오프라인 테스트용)
+- Google Sheets의 4개 시트와 같은 컬럼·표기("110.72%" 등)로 생성
+- 규모(조직 수, 조직당 KPI 수, 연도 수)를 지정 가능. 같은 seed면 같은 데이터
+- 여러 해를 만들면 KPI_Monthly_Data에 연도 컬럼이 추가됨
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# 미리 정의한 규모 (현재 운영 규모 → 대규모)
+SCALES = {
+    "current": {"n_orgs": 11, "kpis_per_org": 5, "years": 1},
+    "medium": {"n_orgs": 200, "kpis_per_org": 10, "years": 1},
+    "large": {"n_orgs": 2000, "kpis_per_org": 25, "years": 3},
+}
+
+_KPI_TYPES = np.array(["정량", "정성"])
+_UNITS = np.array(["건", "%", "억원", "점"])
+
+
+def _grade(rates: np.ndarray) -> np.ndarray:
+    """YTD 달성률 → 평가등급 (S ≥110, A ≥100, B ≥90, C ≥80, D)"""
+    return np.select(
+        [rates >= 110, rates >= 100, rates >= 90, rates >= 80],
+        ["S", "A", "B", "C"], default="D",
+    )
+
+
+def _percent(values: np.ndarray) -> np.ndarray:
+    """float 배열 → "110.72%" 문자열 배열"""
+    return np.char.add(np.char.mod("%.2f", values), "%")
+
+
+def _org_master(n_orgs: int, inactive_ratio: float,
+                rng: np.random.Generator) -> pd.DataFrame:
+    """전사 1개 → 본부 √n개 → 나머지는 본부 소속 팀 (일부는 CEO 직보 팀)"""
+    n_div = max(1, int(round(np.sqrt(max(n_orgs - 1, 1)))))
+    n_div = min(n_div, max(n_orgs - 1, 0))
+    n_team = max(n_orgs - 1 - n_div, 0)
+
+    ids = [1001]
+    names = ["전사"]
+    levels = [1]
+    parents: list[float] = [np.nan]
+    for i in range(n_div):
+        ids.append(2001 + i)
+        names.append(f"본부{i + 1:03d}")
+        levels.append(2)
+        parents.append(1001)
+
+    # 팀의 약 5%는 CEO 직보 (전사 바로 아래)
+    direct = rng.random(n_team) < 0.05
+    for i in range(n_team):
+        ids.append(3001 + i)
+        names.append(f"팀{i + 1:04d}")
+        if direct[i] or n_div == 0:
+            levels.append(2)
+            parents.append(1001)
+        else:
+            levels.append(3)
+            parents.append(2001 + i % n_div)
+
+    end_dates = np.full(len(ids), None, dtype=object)
+    if n_team:
+        closed = rng.random(len(ids)) < inactive_ratio
+        closed[: 1 + n_div] = False  # 전사/본부는 유지
+        end_dates[closed] = "2020-01-31"
+
+    return pd.DataFrame({
+        "조직ID": ids,
+        "조직명": names,
+        "Level": levels,
+        "ParentID": parents,
+        "해지일": end_dates,
+    })
+
+
+def generate(n_orgs: int = 11, kpis_per_org: int = 5, years: int = 1,
+             latest_month: int = 12, end_year: int | None = None,
+             inactive_ratio: float = 0.02, seed: int = 0
+             ) -> dict[str, pd.DataFrame]:
+    """합성 시트 딕셔너리 생성 (load_all_data와 같은 키/컬럼)
+
+    Args:
+        n_orgs: 조직 수 (전사 포함)
+        kpis_per_org: 조직당 KPI 수
+        years: 연도 수 (2 이상이면 연도 컬럼 추가, 과거 연도는 12개월 전체)
+        latest_month: 마지막 연도의 마지막 월
+        end_year: 마지막 연도 (기본: 올해)
+        inactive_ratio: 해지일이 지난 조직/KPI 비율
+        seed: 난수 시드
+    """
+    rng = np.random.default_rng(seed)
+    end_year = end_year or date.today().year
+
+    org = _org_master(n_orgs, inactive_ratio, rng)
+    n_kpi = len(org) * kpis_per_org
+
+    # KPI_Master
+    kpi_org = np.repeat(org["조직ID"].to_numpy(), kpis_per_org)
+    kpi_org_name = np.repeat(org["조직명"].to_numpy().astype(str), kpis_per_org)
+    kpi_no = np.tile(np.arange(1, kpis_per_org + 1), len(org))
+    kpi_ids = np.char.add("K", np.char.zfill(np.arange(1, n_kpi + 1).astype(str), 6))
+    kpi_names = np.char.add(np.char.add(kpi_org_name, " KPI"), kpi_no.astype(str))
+    base_target = rng.choice([50, 100, 200, 500, 1000], size=n_kpi).astype(float)
+    kpi_end = np.full(n_kpi, None, dtype=object)
+    kpi_end[rng.random(n_kpi) < inactive_ratio] = "2020-06-30"
+    kpi = pd.DataFrame({
+        "KPI_ID": kpi_ids,
+        "KPI명": kpi_names,
+        "목표값": base_target,
+        "해지일": kpi_end,
+    })
+
+    kpi_types = _KPI_TYPES[kpi_no % 2]
+    units = _UNITS[rng.integers(0, len(_UNITS), n_kpi)]
+    skill = rng.normal(1.0, 0.08, n_kpi)  # KPI별 평균 달성 수준
+
+    # KPI_Monthly_Data (연도별로 KPI × 월 격자를 만들어 이어 붙임)
+    frames = []
+    for y in range(end_year - years + 1, end_year + 1):
+        n_month = latest_month if y == end_year else 12
+        target = base_target[:, None] * rng.uniform(0.9, 1.1, (n_kpi, n_month))
+        actual = target * np.clip(skill[:, None] + rng.normal(0, 0.12, (n_kpi, n_month)), 0.3, None)
+        target = target.round()
+        actual = actual.round()
+        ytd_target = target.cumsum(axis=1)
+        ytd_actual = actual.cumsum(axis=1)
+        month_rate = actual / target * 100
+        ytd_rate = ytd_actual / ytd_target * 100
+
+        frame = pd.DataFrame({
+            "조직ID": np.repeat(kpi_org, n_month),
+            "조직명": np.repeat(kpi_org_name, n_month),
+            "KPI_ID": np.repeat(kpi_ids, n_month),
+            "KPI명": np.repeat(kpi_names, n_month),
+            "KPI유형": np.repeat(kpi_types, n_month),
+            "월": np.tile(np.arange(1, n_month + 1), n_kpi),
+            "월목표": target.ravel(),
+            "월실적": actual.ravel(),
+            "월 달성률": _percent(month_rate.ravel()),
+            "YTD목표": ytd_target.ravel(),
+            "YTD실적": ytd_actual.ravel(),
+            "YTD달성률": _percent(ytd_rate.ravel()),
+            "YTD평가결과": _grade(np.round(ytd_rate.ravel(), 2)),
+            "단위": np.repeat(units, n_month),
+        })
+        if years > 1:
+            frame.insert(0, "연도", y)
+        frames.append(frame)
+
+    monthly = pd.concat(frames, ignore_index=True)
+    type_guide = pd.DataFrame({
+        "KPI유형": _KPI_TYPES,
+        "설명": ["수치로 측정하는 KPI", "평가로 측정하는 KPI"],
+    })
+    return {"monthly": monthly, "org": org, "kpi": kpi, "type_guide": type_guide}
+
+
+def generate_scale(scale: str, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """SCALES에 정의된 이름으로 생성"""
+    if scale not in SCALES:
+        raise ValueError(f"알 수 없는 규모: {scale!r} ({' | '.join(SCALES)})")
+    return generate(**SCALES[scale], seed=seed)